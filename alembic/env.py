@@ -8,6 +8,8 @@ from alembic import context
 from database.db import Base
 from database.models.user import Students
 from database.models.courses import Course, CourseType
+from database.models.broadcast import Broadcast
+from database.models.fsm import FSMRecord
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
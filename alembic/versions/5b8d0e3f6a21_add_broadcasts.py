@@ -0,0 +1,49 @@
+"""Add broadcasts table
+
+Revision ID: 5b8d0e3f6a21
+Revises: c41f2e9a7d10
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b8d0e3f6a21'
+down_revision: Union[str, None] = 'c41f2e9a7d10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'broadcasts',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('created_by', sa.BigInteger(), nullable=False),
+        sa.Column('segment', sa.String(length=16), nullable=False),
+        sa.Column('from_chat_id', sa.BigInteger(), nullable=False),
+        sa.Column('message_id', sa.BigInteger(), nullable=False),
+        sa.Column(
+            'status',
+            sa.Enum('RUNNING', 'PAUSED', 'COMPLETED', 'CANCELLED', name='broadcaststatus'),
+            nullable=False
+        ),
+        sa.Column('last_student_id', sa.Integer(), nullable=False),
+        sa.Column('total_count', sa.Integer(), nullable=False),
+        sa.Column('sent_count', sa.Integer(), nullable=False),
+        sa.Column('blocked_count', sa.Integer(), nullable=False),
+        sa.Column('failed_count', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.BigInteger(), nullable=False),
+        sa.Column('finished_at', sa.BigInteger(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_broadcasts_status', 'broadcasts', ['status'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_broadcasts_status', table_name='broadcasts')
+    op.drop_table('broadcasts')
+    sa.Enum(name='broadcaststatus').drop(op.get_bind(), checkfirst=True)
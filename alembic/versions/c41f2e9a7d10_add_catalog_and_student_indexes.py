@@ -0,0 +1,62 @@
+"""Add catalog and student filter indexes
+
+Revision ID: c41f2e9a7d10
+Revises: 229774e93428
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41f2e9a7d10'
+down_revision: Union[str, None] = '229774e93428'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Course catalog: filters on course_type_id (+ difficulty_level) among active courses,
+    # ordered by order_index
+    op.create_index(
+        'ix_courses_active_type_difficulty_order',
+        'courses',
+        ['course_type_id', 'difficulty_level', 'order_index'],
+        postgresql_where=sa.text('is_active'),
+        sqlite_where=sa.text('is_active = 1')
+    )
+    op.create_index(
+        'ix_courses_active_type_order',
+        'courses',
+        ['course_type_id', 'order_index'],
+        postgresql_where=sa.text('is_active'),
+        sqlite_where=sa.text('is_active = 1')
+    )
+    op.create_index(
+        'ix_course_types_active',
+        'course_types',
+        ['id'],
+        postgresql_where=sa.text('is_active'),
+        sqlite_where=sa.text('is_active = 1')
+    )
+
+    # Students: paid/unpaid filters with keyset pagination on id, and admin lookups
+    op.create_index('ix_students_is_paid_id', 'students', ['is_paid', 'id'])
+    op.create_index(
+        'ix_students_admins',
+        'students',
+        ['id'],
+        postgresql_where=sa.text('is_admin'),
+        sqlite_where=sa.text('is_admin = 1')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_students_admins', table_name='students')
+    op.drop_index('ix_students_is_paid_id', table_name='students')
+    op.drop_index('ix_course_types_active', table_name='course_types')
+    op.drop_index('ix_courses_active_type_order', table_name='courses')
+    op.drop_index('ix_courses_active_type_difficulty_order', table_name='courses')
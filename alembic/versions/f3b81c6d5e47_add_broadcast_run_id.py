@@ -0,0 +1,26 @@
+"""Add broadcasts.run_id
+
+Revision ID: f3b81c6d5e47
+Revises: e7a4c2d9b813
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b81c6d5e47'
+down_revision: Union[str, None] = 'e7a4c2d9b813'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('broadcasts', sa.Column('run_id', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('broadcasts', 'run_id')
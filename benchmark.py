@@ -0,0 +1,427 @@
+"""
+End-to-end throughput benchmark.
+
+Feeds synthetic update streams through the real Dispatcher (every middleware
+and router, built by main.create_dispatcher like main.main() does) with a fake
+bot session that records API calls instead of sending them. Reports updates/s,
+latency percentiles, SQL statements and API calls per update.
+
+    python benchmark.py --scenario mixed --users 200 --concurrency 50
+    python benchmark.py --scenario browse --record browse.jsonl
+    python benchmark.py --replay browse.jsonl
+
+Runs on a fresh SQLite file by default. Pass --database-url to use a scratch
+Postgres database: its tables are created if missing, seed rows are added
+once, and nothing is dropped unless --reset is given.
+"""
+import argparse
+import asyncio
+import datetime
+import itertools
+import json
+import math
+import os
+import random
+import time
+import typing
+from collections import defaultdict
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+DEFAULT_DATABASE_URL = "sqlite+aiosqlite:///benchmark.sqlite"
+ADMIN_ID_BASE = 1_000
+STUDENT_ID_BASE = 10_000_000
+NEW_USER_ID_BASE = 20_000_000
+COURSE_TYPES = 3
+COURSES_PER_TYPE = 12
+
+# A step is (name, update); a session is the steps of one user, fed in order
+Step = Tuple[str, "Update"]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Feed synthetic updates through the bot and measure it")
+    parser.add_argument("--scenario", choices=("browse", "admin", "start", "mixed"), default="mixed")
+    parser.add_argument("--users", type=int, default=100, help="Simulated users (admins are a tenth of them in 'mixed')")
+    parser.add_argument("--rounds", type=int, default=3, help="Times each user repeats its script")
+    parser.add_argument("--concurrency", type=int, default=20, help="Users active at the same time")
+    parser.add_argument("--api-latency", type=float, default=0.0, help="Milliseconds each fake Bot API call takes")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed, so a stream can be generated again")
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument("--reset", action="store_true", help="Drop and recreate the tables first (always done for SQLite)")
+    parser.add_argument("--record", metavar="FILE", help="Also write the generated stream to FILE (JSON lines)")
+    parser.add_argument("--replay", metavar="FILE", help="Feed a recorded stream instead of generating one")
+    parser.add_argument("--fsm-storage", choices=("database", "redis", "memory"), help="FSM_STORAGE to run with (default: the environment's, else database)")
+    parser.add_argument("--redis-stand-in", action="store_true", help="Serve FSM_REDIS_URL from an in-process fakeredis server (pip install fakeredis)")
+    return parser.parse_args()
+
+
+@dataclass
+class StepStats:
+    latencies: List[float] = field(default_factory=list)
+    statements: int = 0
+    api_calls: int = 0
+    errors: int = 0
+
+
+@dataclass(slots=True)
+class UpdateCounters:
+    statements: int = 0
+    api_calls: int = 0
+
+
+# Counters of the update being fed in the current task
+_counters: ContextVar[Optional[UpdateCounters]] = ContextVar("benchmark_counters", default=None)
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(math.ceil(fraction * len(sorted_values)) - 1, 0)]
+
+
+def build_session_class():
+    from aiogram.client.session.base import BaseSession
+    from aiogram.types import Chat, Message
+
+    class RecordingSession(BaseSession):
+        """Answers every Bot API call locally with a minimal valid result"""
+
+        def __init__(self, latency: float):
+            super().__init__()
+            self.latency = latency
+            self.calls: Dict[str, int] = defaultdict(int)
+            self._message_ids = itertools.count(1)
+
+        async def close(self):
+            pass
+
+        async def stream_content(self, *args, **kwargs):
+            yield b""
+
+        def _message(self, method) -> Message:
+            chat_id = getattr(method, "chat_id", None)
+            return Message(
+                message_id=next(self._message_ids),
+                date=datetime.datetime.now(),
+                chat=Chat(id=chat_id if isinstance(chat_id, int) else 1, type="private")
+            )
+
+        async def make_request(self, bot, method, timeout=None):
+            self.calls[type(method).__name__] += 1
+            counters = _counters.get()
+            if counters is not None:
+                counters.api_calls += 1
+            if self.latency:
+                await asyncio.sleep(self.latency)
+
+            returning = method.__returning__
+            origin = typing.get_origin(returning)
+            if returning is bool:
+                return True
+            if returning is Message or (origin is typing.Union and Message in typing.get_args(returning)):
+                return self._message(method)
+            if origin is list:
+                return [self._message(method)]
+            try:
+                return returning()
+            except Exception:
+                return True
+
+    return RecordingSession
+
+
+class UpdateFactory:
+    def __init__(self):
+        self._ids = itertools.count(1)
+
+    def message(self, user_id: int, text: str):
+        from aiogram.types import Update
+        return Update(update_id=next(self._ids), message={
+            "message_id": next(self._ids),
+            "date": 0,
+            "chat": {"id": user_id, "type": "private"},
+            "from": {"id": user_id, "is_bot": False, "first_name": f"User{user_id}", "username": f"user{user_id}"},
+            "text": text
+        })
+
+    def callback(self, user_id: int, data):
+        from aiogram.types import Update
+        return Update(update_id=next(self._ids), callback_query={
+            "id": str(next(self._ids)),
+            "chat_instance": "benchmark",
+            "from": {"id": user_id, "is_bot": False, "first_name": f"User{user_id}"},
+            "data": data if isinstance(data, str) else data.pack(),
+            "message": {"message_id": 1, "date": 0, "chat": {"id": user_id, "type": "private"}, "text": "-"}
+        })
+
+
+def browse_session(updates: UpdateFactory, rng: random.Random, user_id: int, rounds: int) -> Iterator[Step]:
+    """A paid student opening courses, their content and practice images"""
+    from database.catalog import get_catalog
+    from keyboards.callback_data import (
+        BackToCoursesCallback, ContentKind, CourseCallback, CourseContentCallback,
+        CourseTypeCallback, DifficultyCallback, PracticeCallback
+    )
+    from utils.i18n import get_text
+
+    catalog = get_catalog()
+    for _ in range(rounds):
+        course_type = rng.choice(catalog.course_types)
+        course = rng.choice(catalog.get_courses(course_type.id))
+        yield "courses menu", updates.message(user_id, get_text("buttons.courses"))
+        yield "course type", updates.callback(user_id, CourseTypeCallback(course_type_id=course_type.id))
+        yield "course list", updates.callback(user_id, DifficultyCallback(course_type_id=course_type.id, level=rng.choice((course.difficulty_level, None))))
+        yield "course card", updates.callback(user_id, CourseCallback(course_id=course.id))
+        yield "course content", updates.callback(user_id, CourseContentCallback(course_id=course.id, kind=rng.choice(list(ContentKind))))
+        yield "practice open", updates.callback(user_id, PracticeCallback(course_id=course.id))
+        yield "practice next", updates.callback(user_id, PracticeCallback(course_id=course.id, index=1, edit=True))
+        yield "back to courses", updates.callback(user_id, BackToCoursesCallback(course_type_id=course_type.id))
+
+
+def admin_session(updates: UpdateFactory, rng: random.Random, user_id: int, rounds: int, students: int) -> Iterator[Step]:
+    """An admin paging through students, toggling payment and renaming a course"""
+    from database.catalog import get_catalog
+    from keyboards.callback_data import (
+        CourseAction, CourseAdminCallback, CourseListAdminCallback, CourseTypeAction, CourseTypeAdminCallback,
+        PaymentStatusCallback, StudentCallback, StudentListCallback
+    )
+    from utils.i18n import get_text
+
+    catalog = get_catalog()
+    for round_index in range(rounds):
+        student_id = STUDENT_ID_BASE + rng.randrange(students)
+        yield "students menu", updates.message(user_id, get_text("student.management"))
+        yield "students list", updates.callback(user_id, StudentListCallback(category=rng.choice(("all", "paid", "unpaid"))))
+        yield "student card", updates.callback(user_id, StudentCallback(user_id=student_id))
+        yield "payment toggle", updates.callback(user_id, PaymentStatusCallback(user_id=student_id, is_paid=bool(round_index % 2)))
+
+        course_type = rng.choice(catalog.course_types)
+        course = rng.choice(catalog.get_courses(course_type.id))
+        yield "courses admin menu", updates.message(user_id, get_text("admin.course_management"))
+        yield "courses admin types", updates.callback(user_id, "manage_courses")
+        yield "courses admin type", updates.callback(user_id, CourseTypeAdminCallback(action=CourseTypeAction.MANAGE, course_type_id=course_type.id))
+        yield "courses admin list", updates.callback(user_id, CourseListAdminCallback(course_type_id=course_type.id))
+        yield "course admin card", updates.callback(user_id, CourseAdminCallback(action=CourseAction.MANAGE, course_id=course.id))
+        yield "course edit menu", updates.callback(user_id, CourseAdminCallback(action=CourseAction.EDIT, course_id=course.id))
+        yield "course edit title", updates.callback(user_id, CourseAdminCallback(action=CourseAction.EDIT_TITLE, course_id=course.id))
+        yield "course save title", updates.message(user_id, f"Course {course.id} rev {round_index}")
+        # The title prompt stays open until the admin goes back
+        yield "course edit menu", updates.callback(user_id, CourseAdminCallback(action=CourseAction.EDIT, course_id=course.id))
+
+
+def start_session(updates: UpdateFactory, user_id: int, rounds: int) -> Iterator[Step]:
+    """A new user registering, then coming back"""
+    yield "start new", updates.message(user_id, "/start")
+    for _ in range(rounds - 1):
+        yield "start again", updates.message(user_id, "/start")
+
+
+def generate_sessions(args: argparse.Namespace, updates: UpdateFactory) -> List[List[Step]]:
+    rng = random.Random(args.seed)
+    # Registrations need ids that are not in the database yet
+    new_user_ids = itertools.count(NEW_USER_ID_BASE + int(time.time()) % 1_000_000 * 100)
+    sessions = []
+    if args.scenario == "browse":
+        sessions = [list(browse_session(updates, rng, STUDENT_ID_BASE + i, args.rounds)) for i in range(args.users)]
+    elif args.scenario == "admin":
+        sessions = [list(admin_session(updates, rng, ADMIN_ID_BASE + i, args.rounds, args.users)) for i in range(args.users)]
+    elif args.scenario == "start":
+        sessions = [list(start_session(updates, next(new_user_ids), args.rounds)) for _ in range(args.users)]
+    else:
+        admins = max(args.users // 10, 1)
+        sessions += [list(browse_session(updates, rng, STUDENT_ID_BASE + i, args.rounds)) for i in range(args.users)]
+        sessions += [list(admin_session(updates, rng, ADMIN_ID_BASE + i, args.rounds, args.users)) for i in range(admins)]
+        sessions += [list(start_session(updates, next(new_user_ids), args.rounds)) for _ in range(args.users // 4)]
+        rng.shuffle(sessions)
+    return sessions
+
+
+def record_sessions(path: str, sessions: List[List[Step]]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for session_index, steps in enumerate(sessions):
+            for name, update in steps:
+                f.write(json.dumps({
+                    "session": session_index,
+                    "step": name,
+                    "update": update.model_dump(mode="json", exclude_none=True)
+                }, ensure_ascii=False) + "\n")
+
+
+def load_sessions(path: str) -> List[List[Step]]:
+    from aiogram.types import Update
+    sessions: Dict[int, List[Step]] = defaultdict(list)
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                sessions[entry["session"]].append((entry["step"], Update.model_validate(entry["update"])))
+    return list(sessions.values())
+
+
+async def prepare_database(args: argparse.Namespace) -> None:
+    from sqlalchemy import func, select
+    from database.db import Base, engine, async_session
+    from database.models.courses import Course, CourseType, DifficultyLevel
+    from database.models.user import Students
+    import database.models.broadcast  # noqa: F401, creates the tables
+    import database.models.fsm  # noqa: F401
+
+    async with engine.begin() as conn:
+        if args.reset or engine.dialect.name == "sqlite":
+            await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    now = int(time.time())
+    admins = args.users if args.scenario == "admin" else max(args.users // 10, 1)
+    async with async_session() as session:
+        if not (await session.execute(select(func.count(CourseType.id)))).scalar():
+            levels = list(DifficultyLevel)
+            for type_index in range(COURSE_TYPES):
+                course_type = CourseType(name=f"Course type {type_index + 1}", description="Benchmark", created_at=now)
+                session.add(course_type)
+                await session.flush()
+                for course_index in range(COURSES_PER_TYPE):
+                    session.add(Course(
+                        course_type_id=course_type.id,
+                        title=f"Course {type_index + 1}.{course_index + 1}",
+                        description="Benchmark course",
+                        difficulty_level=levels[course_index % len(levels)],
+                        order_index=course_index + 1,
+                        banner_file_id="banner",
+                        video_file_id="video",
+                        voice_file_id="voice",
+                        practice_images=json.dumps([f"image{i}" for i in range(5)]),
+                        text_explanation="Text",
+                        created_at=now
+                    ))
+
+        # Students and admins the scripts act as; all paid so nothing is blocked by the payment check
+        wanted = {STUDENT_ID_BASE + i: False for i in range(args.users)}
+        wanted.update({ADMIN_ID_BASE + i: True for i in range(admins)})
+        existing = set((await session.execute(select(Students.user_id).where(Students.user_id.in_(wanted)))).scalars())
+        for user_id, is_admin in wanted.items():
+            if user_id not in existing:
+                session.add(Students(user_id=user_id, username=f"user{user_id}", first_name=f"User{user_id}", is_admin=is_admin, is_paid=True))
+        await session.commit()
+
+
+async def run(args: argparse.Namespace) -> None:
+    from aiogram import Bot
+    from sqlalchemy import event
+    from database import db
+    from database.catalog import reload_catalog
+    from main import create_dispatcher
+
+    await prepare_database(args)
+    async with db.async_session() as session:
+        await reload_catalog(session)
+
+    @event.listens_for(db.engine.sync_engine, "after_cursor_execute")
+    def count_statement(*_):
+        counters = _counters.get()
+        if counters is not None:
+            counters.statements += 1
+
+    dp = create_dispatcher()
+    bot = Bot(token=os.environ["BOT_TOKEN"], session=build_session_class()(args.api_latency / 1000))
+
+    if args.replay:
+        sessions = load_sessions(args.replay)
+    else:
+        sessions = generate_sessions(args, UpdateFactory())
+        if args.record:
+            record_sessions(args.record, sessions)
+
+    stats: Dict[str, StepStats] = defaultdict(StepStats)
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def play(steps: List[Step]) -> None:
+        # One user's updates go in order, like Telegram delivers them
+        async with semaphore:
+            for name, update in steps:
+                counters = UpdateCounters()
+                token = _counters.set(counters)
+                step = stats[name]
+                started = time.perf_counter()
+                try:
+                    await dp.feed_update(bot, update)
+                except Exception:
+                    step.errors += 1
+                finally:
+                    step.latencies.append(time.perf_counter() - started)
+                    _counters.reset(token)
+                step.statements += counters.statements
+                step.api_calls += counters.api_calls
+
+    started = time.perf_counter()
+    await asyncio.gather(*(play(steps) for steps in sessions))
+    elapsed = time.perf_counter() - started
+
+    await bot.session.close()
+    await db.engine.dispose()
+    report(args, stats, len(sessions), elapsed)
+
+
+def report(args: argparse.Namespace, stats: Dict[str, StepStats], sessions: int, elapsed: float) -> None:
+    total = StepStats()
+    for step in stats.values():
+        total.latencies.extend(step.latencies)
+        total.statements += step.statements
+        total.api_calls += step.api_calls
+        total.errors += step.errors
+
+    count = len(total.latencies)
+    source = f"replay of {args.replay}" if args.replay else f"scenario {args.scenario}"
+    print(f"{source}: {count} updates from {sessions} users in {elapsed:.2f}s -> {count / elapsed:.1f} updates/s")
+    print(f"{'step':<22}{'count':>7}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'SQL/upd':>9}{'API/upd':>9}{'errors':>8}")
+    for name, step in sorted(stats.items()) + [("total", total)]:
+        latencies = sorted(step.latencies)
+        n = len(latencies) or 1
+        print(
+            f"{name:<22}{len(latencies):>7}"
+            f"{percentile(latencies, 0.50) * 1000:>9.2f}"
+            f"{percentile(latencies, 0.95) * 1000:>9.2f}"
+            f"{percentile(latencies, 0.99) * 1000:>9.2f}"
+            f"{step.statements / n:>9.2f}"
+            f"{step.api_calls / n:>9.2f}"
+            f"{step.errors:>8}"
+        )
+
+
+def start_redis_stand_in() -> str:
+    """Serve the Redis protocol from fakeredis on a free local port, return its URL"""
+    import threading
+    from fakeredis import TcpFakeServer
+
+    server = TcpFakeServer(("127.0.0.1", 0))
+    # Connection threads must not keep the process alive once the run is over
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+    return f"redis://{host}:{port}/0"
+
+
+def main() -> None:
+    args = parse_args()
+    # Locales are loaded relative to the working directory
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    # Settings read the environment on import, so set it before importing the bot
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ.setdefault("BOT_TOKEN", "42:BENCHMARK")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    os.environ.setdefault("LOCALES_RELOAD_INTERVAL", "0")
+    os.environ.setdefault("DB_ECHO", "false")
+    # Synthetic users press buttons far faster than people; measure handling, not rejections
+    os.environ.setdefault("THROTTLE_MEDIA_RATE", "0")
+    os.environ.setdefault("THROTTLE_NAVIGATION_RATE", "0")
+    if args.fsm_storage:
+        os.environ["FSM_STORAGE"] = args.fsm_storage
+    if args.redis_stand_in:
+        os.environ["FSM_REDIS_URL"] = start_redis_stand_in()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import os
+import sys
+import json
+import asyncio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from database.models.courses import DifficultyLevel
+from database.crud.courses import get_active_course_types, get_courses_by_type, get_courses_by_type_and_difficulty
+from database.crud.user import count_students, get_admin_students, get_recipients_batch, get_students_page
+
+# Hot CRUD calls and the index the planner should pick for the statement each one executes
+CHECKS = [
+    ("ix_courses_active_type_difficulty_order", get_courses_by_type_and_difficulty, (1, DifficultyLevel.BEGINNER)),
+    ("ix_courses_active_type_order", get_courses_by_type, (1,)),
+    ("ix_course_types_active", get_active_course_types, ()),
+    ("ix_students_is_paid_id", get_students_page, ("paid", 0)),
+    ("ix_students_is_paid_id", get_students_page, ("unpaid", None, 100)),
+    ("ix_students_is_paid_id", count_students, ()),
+    ("ix_students_is_paid_id", get_recipients_batch, ("paid", 0, 200)),
+    ("ix_students_admins", get_admin_students, ()),
+]
+
+
+class _Captured(Exception):
+    pass
+
+
+class StatementRecorder:
+    """Stands in for AsyncSession: keeps the first statement a CRUD function executes and stops it there"""
+
+    def __init__(self):
+        self.statement = None
+
+    async def execute(self, statement, *args, **kwargs):
+        self.statement = statement
+        raise _Captured
+
+
+async def capture_statement(crud_function, args):
+    recorder = StatementRecorder()
+    try:
+        await crud_function(recorder, *args)
+    except _Captured:
+        return recorder.statement
+    raise RuntimeError(f"{crud_function.__name__} executed no statement")
+
+
+def _plan_text(dialect_name: str, rows) -> str:
+    if dialect_name == "postgresql":
+        return json.dumps(rows[0][0])
+    return "\n".join(str(row[-1]) for row in rows)
+
+
+async def check_indexes() -> bool:
+    db_url = os.environ.get('DATABASE_URL')
+    if not db_url:
+        print("DATABASE_URL environment variable is not set.")
+        return False
+
+    engine = create_async_engine(db_url)
+    ok = True
+    try:
+        async with engine.connect() as conn:
+            dialect_name = conn.dialect.name
+            if dialect_name == "postgresql":
+                # Test databases are tiny, so make sequential scans unattractive;
+                # what we check is that each query shape *can* use its index
+                await conn.execute(text("SET enable_seqscan = off"))
+                explain = "EXPLAIN (FORMAT JSON) "
+            else:
+                explain = "EXPLAIN QUERY PLAN "
+
+            for index_name, crud_function, args in CHECKS:
+                query = await capture_statement(crud_function, args)
+                sql = str(query.compile(conn.sync_connection, compile_kwargs={"literal_binds": True}))
+                rows = (await conn.execute(text(explain + sql))).all()
+                plan = _plan_text(dialect_name, rows)
+                used = index_name in plan
+                ok = ok and used
+                print(f"{'OK  ' if used else 'FAIL'} {index_name} ({crud_function.__name__}): {' '.join(sql.split())[:120]}")
+                if not used:
+                    print(plan)
+    finally:
+        await engine.dispose()
+    return ok
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(check_indexes()) else 1)
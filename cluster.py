@@ -0,0 +1,188 @@
+"""Run the bot as one receiver process and WORKERS worker processes.
+
+The receiver takes updates from Telegram (polling or webhook, as in the single
+process mode) and puts each one on the queue of the worker that owns its user
+(user_id % WORKERS), so one user's updates are always handled by the same
+worker, in order. Every worker runs the full dispatcher with its own caches;
+cache changes are published through utils.invalidation and the receiver
+forwards them to the other workers. If a worker dies, the receiver stops
+with an error so that the process manager restarts the whole bot.
+
+Started by main.py when WORKERS > 1.
+"""
+import asyncio
+import multiprocessing
+import queue as queue_module
+import signal
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from aiogram import BaseMiddleware, Bot, Dispatcher # type: ignore
+from aiogram.client.default import DefaultBotProperties # type: ignore
+from aiogram.enums import ParseMode # type: ignore
+from aiogram.types import Update # type: ignore
+
+from config import settings
+from logging_config import logger
+from utils import invalidation
+
+# "spawn" starts workers from a clean interpreter instead of copying the receiver's event loop and engine
+START_METHOD = "spawn"
+# Seconds a worker waits on its queue before checking that the receiver is still alive
+POLL_TIMEOUT = 1.0
+# Seconds between the receiver's checks that every worker is still alive
+SUPERVISE_INTERVAL = 1.0
+
+
+class ForwardingMiddleware(BaseMiddleware):
+    """Receiver side: send each update to the worker that owns its user instead of handling it"""
+
+    def __init__(self, queues: List[multiprocessing.Queue]):
+        self.queues = queues
+
+    async def __call__(
+        self,
+        handler: Callable[[Update, Dict[str, Any]], Awaitable[Any]],
+        event: Update,
+        data: Dict[str, Any]
+    ) -> Any:
+        # Set by aiogram's own outer middleware, which runs before this one
+        user = data.get("event_from_user")
+        chat = data.get("event_chat")
+        key = user.id if user else chat.id if chat else event.update_id
+        # Unbounded queue, put() hands the item to a feeder thread and returns
+        self.queues[key % len(self.queues)].put(("update", event.model_dump_json(exclude_unset=True)))
+
+
+def _next_item(queue: multiprocessing.Queue) -> Optional[tuple]:
+    """Blocking read for a worker; None once the receiver asks to stop or is gone"""
+    parent = multiprocessing.parent_process()
+    while True:
+        try:
+            return queue.get(timeout=POLL_TIMEOUT)
+        except queue_module.Empty:
+            if parent is not None and not parent.is_alive():
+                logger.error("Receiver process is gone, stopping worker")
+                return None
+
+
+async def run_worker(index: int, queue: multiprocessing.Queue, control: multiprocessing.Queue) -> None:
+    from main import bot_services, create_dispatcher
+
+    bot = Bot(token=settings.BOT_TOKEN, default=DefaultBotProperties(parse_mode=ParseMode.HTML))
+    dp = create_dispatcher()
+    loop = asyncio.get_running_loop()
+    reader = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"worker-{index}-queue")
+    tasks: Set[asyncio.Task] = set()
+
+    metrics_port = settings.METRICS_PORT + index if settings.METRICS_PORT else 0
+    async with bot_services(bot, dp, metrics_port=metrics_port, primary=index == 0):
+        # Set after the startup catalog load, which the other workers do themselves
+        invalidation.set_publisher(lambda kind, key: control.put((index, kind, key)))
+        logger.info(f"Worker {index} started")
+        try:
+            while True:
+                item = await loop.run_in_executor(reader, _next_item, queue)
+                if item is None:
+                    break
+                if item[0] == "update":
+                    update = Update.model_validate_json(item[1], context={"bot": bot})
+                    # As in polling: one task per update, UpdateSchedulerMiddleware keeps each user's order
+                    task = asyncio.create_task(dp.feed_update(bot, update))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                else:
+                    # Applied before the updates queued after it are started
+                    await invalidation.apply(item[1], item[2])
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            invalidation.set_publisher(None)
+            reader.shutdown(wait=False)
+            await dp.fsm.storage.close()
+            await bot.session.close()
+    logger.info(f"Worker {index} stopped")
+
+
+def worker_main(index: int, queue: multiprocessing.Queue, control: multiprocessing.Queue) -> None:
+    # The receiver stops the workers once it has stopped taking updates
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    asyncio.run(run_worker(index, queue, control))
+
+
+def _fan_out(control: multiprocessing.Queue, queues: List[multiprocessing.Queue]) -> None:
+    """Receiver thread: forward each worker's invalidations to all other workers"""
+    while True:
+        message = control.get()
+        if message is None:
+            return
+        origin, kind, key = message
+        for index, queue in enumerate(queues):
+            if index != origin:
+                queue.put(("invalidate", kind, key))
+
+
+async def _watch_workers(processes: List[multiprocessing.Process]) -> int:
+    """Return the index of the first worker that exits; workers only stop on their own when they crash"""
+    while True:
+        await asyncio.sleep(SUPERVISE_INTERVAL)
+        for index, process in enumerate(processes):
+            if not process.is_alive():
+                return index
+
+
+async def run_cluster(workers: int) -> None:
+    from main import create_dispatcher, run_polling, run_webhook
+
+    logger.info(f"Starting bot with {workers} workers...")
+    context = multiprocessing.get_context(START_METHOD)
+    queues = [context.Queue() for _ in range(workers)]
+    control = context.Queue()
+    processes = [
+        context.Process(target=worker_main, args=(index, queues[index], control), name=f"bot-worker-{index}")
+        for index in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    fan_out = ThreadPoolExecutor(max_workers=1, thread_name_prefix="invalidation")
+    fan_out.submit(_fan_out, control, queues)
+
+    bot = Bot(token=settings.BOT_TOKEN, default=DefaultBotProperties(parse_mode=ParseMode.HTML))
+    # Subscribe to the update types the workers' handlers use
+    allowed_updates = create_dispatcher().resolve_used_update_types()
+    receiver = Dispatcher(disable_fsm=True)
+    receiver.update.outer_middleware(ForwardingMiddleware(queues))
+
+    if settings.DELIVERY_MODE == "webhook":
+        serving = asyncio.create_task(run_webhook(bot, receiver, allowed_updates))
+    else:
+        serving = asyncio.create_task(run_polling(bot, receiver, allowed_updates))
+    watcher = asyncio.create_task(_watch_workers(processes))
+
+    try:
+        await asyncio.wait((serving, watcher), return_when=asyncio.FIRST_COMPLETED)
+        if watcher.done():
+            # Its users would get no replies while their queue grows; stop so the failure is noticed
+            index = watcher.result()
+            logger.error(f"Worker {index} exited with code {processes[index].exitcode}, stopping the bot")
+            serving.cancel()
+            await asyncio.gather(serving, return_exceptions=True)
+            raise RuntimeError(f"Worker {index} exited with code {processes[index].exitcode}")
+        serving.result()
+    finally:
+        watcher.cancel()
+        serving.cancel()
+        # Workers handle what is already queued, then exit
+        for process, queue in zip(processes, queues):
+            if not process.is_alive():
+                # Nobody reads it any more, do not wait for its items to be flushed on exit
+                queue.cancel_join_thread()
+            queue.put(None)
+        loop = asyncio.get_running_loop()
+        for process in processes:
+            await loop.run_in_executor(None, process.join)
+        control.put(None)
+        fan_out.shutdown()
+        await bot.session.close()
+        logger.info("All workers stopped")
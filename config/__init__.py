@@ -7,5 +7,72 @@ class Settings:
     BOT_TOKEN = os.getenv("BOT_TOKEN")
     DATABASE_URL = os.getenv("DATABASE_URL")
     ADMIN_IDS = os.getenv("ADMIN_IDS")
+    DEBUG = os.getenv("DEBUG", "false").lower() in ("1", "true", "yes")
+
+    # Logging: "rich" (pretty, synchronous; development) or "json" (queued, written by a background thread)
+    LOG_MODE = os.getenv("LOG_MODE", "rich" if DEBUG else "json").lower()
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+    LOG_SAMPLING = os.getenv("LOG_SAMPLING", "")  # Share of INFO/DEBUG records kept, e.g. "sqlalchemy.engine=0.01,aiogram.event=0.1"
+
+    # Update delivery: "polling" or "webhook"
+    DELIVERY_MODE = os.getenv("DELIVERY_MODE", "polling").lower()
+    WEBHOOK_BASE_URL = os.getenv("WEBHOOK_BASE_URL")  # Public https URL, e.g. of the reverse proxy
+    WEBHOOK_PATH = os.getenv("WEBHOOK_PATH", "/webhook")
+    WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET")  # Sent by Telegram in X-Telegram-Bot-Api-Secret-Token
+    WEBAPP_HOST = os.getenv("WEBAPP_HOST", "127.0.0.1")  # Address the webhook server listens on
+    WEBAPP_PORT = int(os.getenv("WEBAPP_PORT", "8080"))
+
+    # Prometheus metrics on http://METRICS_HOST:METRICS_PORT/metrics (not authenticated); port 0 disables
+    METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+    METRICS_PORT = int(os.getenv("METRICS_PORT", "9101"))
+
+    # Database engine; keep DB_POOL_SIZE + DB_MAX_OVERFLOW (per bot process) below Postgres max_connections
+    DB_ECHO = os.getenv("DB_ECHO", str(DEBUG)).lower() in ("1", "true", "yes")  # Log every SQL statement (see LOG_SAMPLING)
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))  # Seconds to wait for a free connection
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # Seconds
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+    DB_PREPARED_STATEMENT_CACHE_SIZE = int(os.getenv("DB_PREPARED_STATEMENT_CACHE_SIZE", "100"))  # asyncpg; 0 behind PgBouncer
+    DB_STATEMENT_TIMEOUT = int(os.getenv("DB_STATEMENT_TIMEOUT", "15000"))  # Milliseconds, 0 disables
+
+    # Seconds between checks of locales/*/translations.json for changes, 0 disables reloading
+    LOCALES_RELOAD_INTERVAL = float(os.getenv("LOCALES_RELOAD_INTERVAL", "5"))
+
+    # Worker processes; above 1 a receiver process spreads updates over them by user, see cluster.py
+    WORKERS = int(os.getenv("WORKERS", "1"))
+
+    # Updates processed at once across all users, per process (each user's updates always run one at a time)
+    MAX_CONCURRENT_UPDATES = int(os.getenv("MAX_CONCURRENT_UPDATES", "64"))
+
+    # Per-user limits on button presses: sustained presses per second and burst size; rate 0 disables
+    THROTTLE_MEDIA_RATE = float(os.getenv("THROTTLE_MEDIA_RATE", "0.5"))  # Lesson video/voice/text, opening the practice gallery or album
+    THROTTLE_MEDIA_BURST = float(os.getenv("THROTTLE_MEDIA_BURST", "3"))
+    THROTTLE_NAVIGATION_RATE = float(os.getenv("THROTTLE_NAVIGATION_RATE", "3"))  # Every other button
+    THROTTLE_NAVIGATION_BURST = float(os.getenv("THROTTLE_NAVIGATION_BURST", "10"))
+
+    # Where conversation (FSM) states live: "database" (fsm_states table), "redis" or "memory" (lost on restart)
+    FSM_STORAGE = os.getenv("FSM_STORAGE", "database")
+    FSM_REDIS_URL = os.getenv("FSM_REDIS_URL", "redis://localhost:6379/0")
+    FSM_TTL = int(os.getenv("FSM_TTL", str(7 * 24 * 3600)))  # Seconds without changes before a state is dropped, 0 keeps them
+    # States also kept in memory between updates, 0 disables; only with a single bot instance on the storage
+    FSM_CACHE_SIZE = int(os.getenv("FSM_CACHE_SIZE", "0"))
+    FSM_CACHE_TTL = float(os.getenv("FSM_CACHE_TTL", "30"))  # Seconds
+    FSM_CLEANUP_INTERVAL = float(os.getenv("FSM_CLEANUP_INTERVAL", "3600"))  # Seconds, database storage only
+
+    # Student profile cache
+    USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
+    USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", "300"))  # Seconds
+
+    # Built keyboard markups, reused until translations or the catalog change
+    KEYBOARD_CACHE_SIZE = int(os.getenv("KEYBOARD_CACHE_SIZE", "2048"))
+
+    # Admin dashboard student counters
+    STUDENT_COUNTS_TTL = int(os.getenv("STUDENT_COUNTS_TTL", "30"))  # Seconds
+
+    # Broadcasts; Telegram allows about 30 messages per second across all chats
+    BROADCAST_RATE = float(os.getenv("BROADCAST_RATE", "25"))  # Messages per second
+    BROADCAST_CHAT_INTERVAL = float(os.getenv("BROADCAST_CHAT_INTERVAL", "1"))  # Seconds between messages to one chat, 0 disables
+    BROADCAST_BATCH_SIZE = int(os.getenv("BROADCAST_BATCH_SIZE", "200"))  # Recipients loaded per query
 
 settings = Settings()
\ No newline at end of file
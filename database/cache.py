@@ -0,0 +1,105 @@
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+MISSING = object()
+
+
+class TTLCache:
+    """In-memory LRU cache whose entries also expire after `ttl` seconds"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        # Keys being loaded by get_or_load() -> number of loads in flight
+        self._loading: Dict[Hashable, int] = {}
+        # Keys being loaded -> times they were set or invalidated since the first load started
+        self._changes: Dict[Hashable, int] = {}
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value or MISSING"""
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return MISSING
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            return MISSING
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def peek(self, key: Hashable) -> Any:
+        """Like get() but leaves the counters and the LRU order alone, for lookups that are not cache traffic"""
+        entry = self._data.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            return MISSING
+        return entry[1]
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        get(), or on a miss the result of `loader()`. The result is not cached if
+        the key was set or invalidated while it loaded: it may predate that change.
+        """
+        value = self.get(key)
+        if value is not MISSING:
+            return value
+
+        generation = self._changes.get(key, 0)
+        self._loading[key] = self._loading.get(key, 0) + 1
+        try:
+            value = await loader()
+        finally:
+            changed = self._changes.get(key, 0) != generation
+            left = self._loading[key] - 1
+            if left:
+                self._loading[key] = left
+            else:
+                del self._loading[key]
+                self._changes.pop(key, None)
+        if not changed:
+            self.set(key, value)
+        return value
+
+    def _changed(self, key: Hashable) -> None:
+        if key in self._loading:
+            self._changes[key] = self._changes.get(key, 0) + 1
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._changed(key)
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        self._changed(key)
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        for key in self._loading:
+            self._changed(key)
+        self._data.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Counters used to size the cache"""
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
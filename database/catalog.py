@@ -0,0 +1,160 @@
+import asyncio
+import json
+from dataclasses import dataclass, field
+from typing import Dict, Mapping, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.db import async_session
+from database.models.courses import Course, CourseType, DifficultyLevel
+from utils.invalidation import on_invalidate, publish
+
+
+@dataclass(frozen=True, slots=True)
+class CourseTypeSnapshot:
+    id: int
+    name: str
+    description: Optional[str]
+
+    @classmethod
+    def from_course_type(cls, course_type: CourseType) -> "CourseTypeSnapshot":
+        return cls(id=course_type.id, name=course_type.name, description=course_type.description)
+
+
+@dataclass(frozen=True, slots=True)
+class CourseSnapshot:
+    id: int
+    course_type_id: int
+    title: str
+    description: Optional[str]
+    difficulty_level: DifficultyLevel
+    order_index: int
+    is_active: bool
+    banner_file_id: Optional[str]
+    video_file_id: Optional[str]
+    voice_file_id: Optional[str]
+    practice_images: Tuple[str, ...]
+    text_explanation: Optional[str]
+
+    @classmethod
+    def from_course(cls, course: Course) -> "CourseSnapshot":
+        # Practice images are stored as a JSON list; parse them once here
+        try:
+            practice_images = tuple(json.loads(course.practice_images)) if course.practice_images else ()
+        except (json.JSONDecodeError, TypeError):
+            practice_images = ()
+
+        return cls(
+            id=course.id,
+            course_type_id=course.course_type_id,
+            title=course.title,
+            description=course.description,
+            difficulty_level=course.difficulty_level,
+            order_index=course.order_index,
+            is_active=bool(course.is_active),
+            banner_file_id=course.banner_file_id,
+            video_file_id=course.video_file_id,
+            voice_file_id=course.voice_file_id,
+            practice_images=practice_images,
+            text_explanation=course.text_explanation
+        )
+
+
+@dataclass(frozen=True)
+class Catalog:
+    """Immutable view of the course catalog served to students"""
+    version: int = 0
+    # Active course types, in database order
+    course_types: Tuple[CourseTypeSnapshot, ...] = ()
+    # Every course by id
+    courses: Mapping[int, CourseSnapshot] = field(default_factory=dict)
+    # Active courses by type and difficulty (None = all levels), ordered by order_index
+    listings: Mapping[Tuple[int, Optional[DifficultyLevel]], Tuple[CourseSnapshot, ...]] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, version: int, course_types, courses) -> "Catalog":
+        return cls.from_snapshots(
+            version,
+            tuple(CourseTypeSnapshot.from_course_type(course_type) for course_type in course_types),
+            [CourseSnapshot.from_course(course) for course in courses]
+        )
+
+    @classmethod
+    def from_snapshots(cls, version: int, course_types: Tuple[CourseTypeSnapshot, ...], courses) -> "Catalog":
+        snapshots = sorted(courses, key=lambda course: (course.order_index, course.id))
+
+        listings: Dict[Tuple[int, Optional[DifficultyLevel]], list] = {}
+        for course in snapshots:
+            if not course.is_active:
+                continue
+            listings.setdefault((course.course_type_id, None), []).append(course)
+            listings.setdefault((course.course_type_id, course.difficulty_level), []).append(course)
+
+        return cls(
+            version=version,
+            course_types=course_types,
+            courses={course.id: course for course in snapshots},
+            listings={key: tuple(value) for key, value in listings.items()}
+        )
+
+    def with_course(self, version: int, course: CourseSnapshot) -> "Catalog":
+        """Copy of this catalog with one course added or replaced"""
+        courses = dict(self.courses)
+        courses[course.id] = course
+        return Catalog.from_snapshots(version, self.course_types, courses.values())
+
+    def get_course(self, course_id: int) -> Optional[CourseSnapshot]:
+        return self.courses.get(course_id)
+
+    def get_courses(self, course_type_id: int, difficulty_level: Optional[DifficultyLevel] = None) -> Tuple[CourseSnapshot, ...]:
+        """Active courses of a type (optionally one difficulty level), ordered by order_index"""
+        return self.listings.get((course_type_id, difficulty_level), ())
+
+
+_catalog = Catalog()
+# One rebuild at a time, so a rebuild that read the database earlier never replaces a later one
+_rebuild_lock = asyncio.Lock()
+
+
+def get_catalog() -> Catalog:
+    """Current catalog snapshot; callers should grab it once per handler"""
+    return _catalog
+
+
+async def _rebuild_catalog(db: AsyncSession) -> Catalog:
+    global _catalog
+    async with _rebuild_lock:
+        while True:
+            current = _catalog
+            # populate_existing: rows the session already holds are refreshed, not returned as loaded before
+            course_types = (await db.execute(
+                select(CourseType).filter(CourseType.is_active == True).execution_options(populate_existing=True)
+            )).scalars().all()
+            courses = (await db.execute(select(Course).execution_options(populate_existing=True))).scalars().all()
+            # put_catalog_course() swapped in a course committed after our read may have started; read again
+            if _catalog is current:
+                break
+        _catalog = Catalog.build(_catalog.version + 1, course_types, courses)
+        return _catalog
+
+
+async def reload_catalog(db: AsyncSession) -> Catalog:
+    """Rebuild the catalog from the database and swap it in atomically"""
+    catalog = await _rebuild_catalog(db)
+    publish("catalog")
+    return catalog
+
+
+def put_catalog_course(course) -> Catalog:
+    """Swap in a catalog with one changed course, e.g. a row returned by UPDATE ... RETURNING"""
+    global _catalog
+    _catalog = _catalog.with_course(_catalog.version + 1, CourseSnapshot.from_course(course))
+    publish("catalog")
+    return _catalog
+
+
+@on_invalidate("catalog")
+async def _reload_changed_catalog(_key) -> None:
+    # Another worker changed courses; the change is committed, so read it back
+    async with async_session() as db:
+        await _rebuild_catalog(db)
@@ -1,3 +1,35 @@
+from typing import Any, Dict
+from sqlalchemy.engine import make_url
 from config import settings
 
-DATABASE_URL = settings.DATABASE_URL
\ No newline at end of file
+DATABASE_URL = settings.DATABASE_URL
+
+
+def get_engine_options(database_url: str = DATABASE_URL) -> Dict[str, Any]:
+    """Keyword arguments for create_async_engine, built from Settings"""
+    url = make_url(database_url)
+    # DB_ECHO is applied in logging_config, so SQL logs go through the configured handlers
+    options: Dict[str, Any] = {"url": url}
+
+    # SQLite (local runs) uses its own pool that takes none of the sizing options
+    if url.get_backend_name() == "sqlite":
+        return options
+
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING
+    )
+
+    if url.get_driver_name() == "asyncpg":
+        options["url"] = url.update_query_dict(
+            {"prepared_statement_cache_size": str(settings.DB_PREPARED_STATEMENT_CACHE_SIZE)}
+        )
+        if settings.DB_STATEMENT_TIMEOUT:
+            options["connect_args"] = {
+                "server_settings": {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT)}
+            }
+
+    return options
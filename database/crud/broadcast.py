@@ -0,0 +1,118 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update
+from typing import Optional, List
+import time
+
+from database.crud.user import count_recipients
+from database.models.broadcast import Broadcast, BroadcastStatus
+
+
+# Counter incremented for each delivery outcome
+DELIVERY_COUNTERS = {
+    "sent": Broadcast.sent_count,
+    "blocked": Broadcast.blocked_count,
+    "failed": Broadcast.failed_count
+}
+
+
+async def create_broadcast(
+    db: AsyncSession,
+    created_by: int,
+    segment: str,
+    from_chat_id: int,
+    message_id: int
+) -> Broadcast:
+    broadcast = Broadcast(
+        created_by=created_by,
+        segment=segment,
+        from_chat_id=from_chat_id,
+        message_id=message_id,
+        status=BroadcastStatus.RUNNING,
+        last_student_id=0,
+        total_count=await count_recipients(db, segment),
+        sent_count=0,
+        blocked_count=0,
+        failed_count=0,
+        run_id=0,
+        created_at=int(time.time())
+    )
+    db.add(broadcast)
+    await db.commit()
+    await db.refresh(broadcast)
+    return broadcast
+
+async def get_broadcast(db: AsyncSession, broadcast_id: int) -> Optional[Broadcast]:
+    result = await db.execute(select(Broadcast).filter(Broadcast.id == broadcast_id))
+    return result.scalar_one_or_none()
+
+async def get_broadcasts_by_status(db: AsyncSession, *statuses: BroadcastStatus) -> List[Broadcast]:
+    result = await db.execute(
+        select(Broadcast).filter(Broadcast.status.in_(statuses)).order_by(Broadcast.id)
+    )
+    return result.scalars().all()
+
+async def set_broadcast_status(
+    db: AsyncSession,
+    broadcast_id: int,
+    status: BroadcastStatus,
+    run_id: Optional[int] = None
+) -> Optional[Broadcast]:
+    """Change the status of an unfinished broadcast (only while `run_id` owns it, if given)"""
+    values = {"status": status}
+    if status in (BroadcastStatus.COMPLETED, BroadcastStatus.CANCELLED):
+        values["finished_at"] = int(time.time())
+
+    conditions = [Broadcast.id == broadcast_id, Broadcast.status.in_((BroadcastStatus.RUNNING, BroadcastStatus.PAUSED))]
+    if run_id is not None:
+        conditions.append(Broadcast.run_id == run_id)
+    result = await db.execute(
+        update(Broadcast)
+        .where(*conditions)
+        .values(**values)
+        .returning(Broadcast)
+        .execution_options(synchronize_session=False)
+    )
+    broadcast = result.scalar_one_or_none()
+    await db.commit()
+    return broadcast
+
+async def claim_broadcast(db: AsyncSession, broadcast_id: int) -> Optional[Broadcast]:
+    """Take a RUNNING broadcast over for a new runner; a runner started earlier (in any process) stops at its next recipient"""
+    result = await db.execute(
+        update(Broadcast)
+        .where(Broadcast.id == broadcast_id, Broadcast.status == BroadcastStatus.RUNNING)
+        .values(run_id=Broadcast.run_id + 1)
+        .returning(Broadcast)
+        .execution_options(synchronize_session=False)
+    )
+    broadcast = result.scalar_one_or_none()
+    await db.commit()
+    return broadcast
+
+async def claim_recipient(db: AsyncSession, broadcast_id: int, run_id: int, student_id: int) -> bool:
+    """Advance the cursor past a student before sending to them.
+
+    False if the broadcast was paused or cancelled, or taken over by another
+    runner, since `run_id` claimed it: the runner must stop without sending.
+    """
+    result = await db.execute(
+        update(Broadcast)
+        .where(
+            Broadcast.id == broadcast_id,
+            Broadcast.run_id == run_id,
+            Broadcast.status == BroadcastStatus.RUNNING
+        )
+        .values(last_student_id=student_id)
+    )
+    await db.commit()
+    return result.rowcount == 1
+
+async def record_delivery(db: AsyncSession, broadcast_id: int, outcome: str) -> None:
+    """Count the outcome of one delivery"""
+    counter = DELIVERY_COUNTERS[outcome]
+    await db.execute(
+        update(Broadcast)
+        .where(Broadcast.id == broadcast_id)
+        .values({counter: counter + 1})
+    )
+    await db.commit()
@@ -1,11 +1,20 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import and_, select
-from typing import Optional, List
+from sqlalchemy import and_, select, update
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, List
 import time
 
+from database.catalog import CourseSnapshot, reload_catalog, put_catalog_course
 from database.models.courses import Course, CourseType, DifficultyLevel
 
 
+@dataclass(frozen=True, slots=True)
+class CourseEdit:
+    """Outcome of update_course"""
+    old: Dict[str, Any]  # Previous values of the changed columns, plus the previous title
+    course: CourseSnapshot  # The course after the update
+
+
 # Course Type operations
 async def create_course_type(db: AsyncSession, name: str, description: Optional[str] = None) -> CourseType:
     course_type = CourseType(
@@ -16,6 +25,7 @@ async def create_course_type(db: AsyncSession, name: str, description: Optional[
     db.add(course_type)
     await db.commit()
     await db.refresh(course_type)
+    await reload_catalog(db)
     return course_type
 
 async def get_course_type(db: AsyncSession, course_type_id: int) -> Optional[CourseType]:
@@ -58,6 +68,7 @@ async def create_course(
     db.add(course)
     await db.commit()
     await db.refresh(course)
+    await reload_catalog(db)
     return course
 
 async def get_course(db: AsyncSession, course_id: int) -> Optional[Course]:
@@ -102,18 +113,39 @@ async def update_course(
     db: AsyncSession,
     course_id: int,
     **kwargs
-) -> Optional[Course]:
-    course = await get_course(db, course_id)
-    if not course:
-        return None
-    
-    for key, value in kwargs.items():
-        setattr(course, key, value)
-    
-    course.updated_at = int(time.time())
+) -> Optional[CourseEdit]:
+    """Update course columns in one UPDATE ... RETURNING that also yields the old values"""
+    courses = Course.__table__
+    old_columns = set(kwargs) | {"title"}
+    query = update(courses).values(**kwargs, updated_at=int(time.time()))
+
+    if db.bind.dialect.name == "postgresql":
+        # The locked sub-select still sees the row as it was before this UPDATE
+        old = (
+            select(courses.c.id, *(courses.c[name] for name in old_columns))
+            .where(courses.c.id == course_id)
+            .with_for_update()
+            .subquery("old")
+        )
+        query = query.where(courses.c.id == old.c.id).returning(
+            *courses.c, *(old.c[name].label(f"old_{name}") for name in old_columns)
+        )
+        row = (await db.execute(query)).one_or_none()
+        old_values = {name: getattr(row, f"old_{name}") for name in old_columns} if row else {}
+    else:
+        # SQLite (local runs) cannot return sub-select columns, so read the old values first
+        old_row = (await db.execute(
+            select(*(courses.c[name] for name in old_columns)).where(courses.c.id == course_id)
+        )).one_or_none()
+        row = (await db.execute(query.where(courses.c.id == course_id).returning(*courses.c))).one_or_none()
+        old_values = dict(old_row._mapping) if old_row else {}
+
     await db.commit()
-    await db.refresh(course)
-    return course
+    if row is None:
+        return None
+
+    put_catalog_course(row)
+    return CourseEdit(old=old_values, course=CourseSnapshot.from_course(row))
 
 async def delete_course(db: AsyncSession, course_id: int) -> bool:
     course = await get_course(db, course_id)
@@ -122,4 +154,5 @@ async def delete_course(db: AsyncSession, course_id: int) -> bool:
     
     await db.delete(course)
     await db.commit()
+    await reload_catalog(db)
     return True 
\ No newline at end of file
@@ -1,7 +1,77 @@
+from dataclasses import dataclass
+from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, or_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Row
 from sqlalchemy.future import select
+from config import settings
+from database.cache import TTLCache
 from database.models.user import Students
 from utils.i18n import LanguageCode
+from utils.invalidation import on_invalidate, publish
+
+
+@dataclass(frozen=True, slots=True)
+class StudentProfile:
+    """Immutable copy of the Students fields needed on every update"""
+    language: str
+    is_paid: bool
+    is_admin: bool
+    is_blocked: bool
+
+    @classmethod
+    def from_student(cls, student: Students) -> "StudentProfile":
+        return cls(
+            language=student.language,
+            is_paid=bool(student.is_paid),
+            is_admin=bool(student.is_admin),
+            is_blocked=bool(student.is_blocked)
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class StudentCounts:
+    """Number of students in each admin dashboard category"""
+    total: int
+    paid: int
+    unpaid: int
+
+
+@dataclass(frozen=True, slots=True)
+class StudentPage:
+    """One page of a keyset-paginated student listing"""
+    students: List[Students]
+    has_prev: bool
+    has_next: bool
+
+
+# Filters for the student listing categories
+STUDENT_CATEGORIES = {
+    "all": None,
+    "paid": Students.is_paid == True,
+    "unpaid": Students.is_paid == False
+}
+
+# Profiles keyed by Telegram user_id; None means "not registered"
+user_cache = TTLCache(maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL)
+
+# Single-entry snapshot of the dashboard counters
+student_counts_cache = TTLCache(maxsize=1, ttl=settings.STUDENT_COUNTS_TTL)
+
+
+def cache_student(user_id: int, student: Optional[Students]) -> None:
+    """Write a fresh profile through to the cache after a change"""
+    user_cache.set(user_id, StudentProfile.from_student(student) if student else None)
+    publish("student", user_id)
+
+
+@on_invalidate("student")
+async def _forget_student(user_id: int) -> None:
+    # Changed by another worker: reload on next use, and recount
+    user_cache.invalidate(user_id)
+    student_counts_cache.clear()
+
 
 async def add_user(session: AsyncSession, user_id: int, username: str, first_name: str, last_name: str | None, language: str = "ru"):
     user = Students(
@@ -13,16 +83,68 @@ async def add_user(session: AsyncSession, user_id: int, username: str, first_nam
     )
     session.add(user)
     await session.commit()
+    cache_student(user_id, user)
+    student_counts_cache.clear()
+
+async def upsert_student(session: AsyncSession, user_id: int, username: str | None, first_name: str, last_name: str | None) -> Optional[Row]:
+    """Register a student or refresh their Telegram names in one statement.
+
+    Returns the stored row when it was inserted or changed, and None when the
+    profile was already up to date (nothing is written in that case).
+    """
+    insert = postgresql.insert if session.bind.dialect.name == "postgresql" else sqlite.insert
+    query = insert(Students).values(
+        user_id=user_id,
+        username=username,
+        first_name=first_name,
+        last_name=last_name,
+        is_admin=False,
+        is_blocked=False,
+        is_paid=False
+    )
+    query = query.on_conflict_do_update(
+        index_elements=[Students.user_id],
+        set_={
+            "username": query.excluded.username,
+            "first_name": query.excluded.first_name,
+            "last_name": query.excluded.last_name,
+            # Sending /start means the student has unblocked the bot
+            "is_blocked": False
+        },
+        # Only rewrite the row when something actually changed
+        where=or_(
+            Students.username.is_distinct_from(query.excluded.username),
+            Students.first_name.is_distinct_from(query.excluded.first_name),
+            Students.last_name.is_distinct_from(query.excluded.last_name),
+            Students.is_blocked == True
+        )
+    ).returning(*Students.__table__.c)
+
+    student = (await session.execute(query)).one_or_none()
+    if student is not None:
+        await session.commit()
+        cache_student(user_id, student)
+    return student
 
 async def get_user(session: AsyncSession, user_id: int):
     result = await session.execute(select(Students).where(Students.user_id == user_id))
     return result.scalars().first()
 
+async def get_user_profile(session: AsyncSession, user_id: int) -> Optional[StudentProfile]:
+    """Get the cached profile of a student, loading it on a cache miss"""
+    async def load() -> Optional[StudentProfile]:
+        user = await get_user(session, user_id)
+        return StudentProfile.from_student(user) if user else None
+
+    # Not cached if an admin's change lands while this reads the old row
+    return await user_cache.get_or_load(user_id, load)
+
 async def update_user_language(session: AsyncSession, user_id: int, language: str):
     user = await get_user(session, user_id)
     if user:
         user.language = language
         await session.commit()
+        cache_student(user_id, user)
     return user
 
 async def get_all_students(session: AsyncSession):
@@ -40,12 +162,90 @@ async def get_unpaid_students(session: AsyncSession):
     result = await session.execute(select(Students).where(Students.is_paid == False))
     return result.scalars().all()
 
+async def count_students(session: AsyncSession) -> StudentCounts:
+    """Count all, paid and unpaid students with a single aggregate query"""
+    result = await session.execute(
+        select(
+            func.count(Students.id),
+            func.count(Students.id).filter(Students.is_paid == True),
+            func.count(Students.id).filter(Students.is_paid == False)
+        )
+    )
+    total, paid, unpaid = result.one()
+    return StudentCounts(total=total, paid=paid, unpaid=unpaid)
+
+async def get_student_counts(session: AsyncSession) -> StudentCounts:
+    """Get the dashboard counters, recounting at most once per STUDENT_COUNTS_TTL"""
+    return await student_counts_cache.get_or_load(None, lambda: count_students(session))
+
+async def get_students_page(
+    session: AsyncSession,
+    category: str = "all",
+    after_id: Optional[int] = None,
+    before_id: Optional[int] = None,
+    limit: int = 10
+) -> StudentPage:
+    """Get one page of students ordered by id, seeking from a cursor instead of using OFFSET"""
+    query = select(Students)
+    category_filter = STUDENT_CATEGORIES[category]
+    if category_filter is not None:
+        query = query.where(category_filter)
+
+    # Fetch one extra row to know whether another page exists in that direction
+    if before_id is not None:
+        query = query.where(Students.id < before_id).order_by(Students.id.desc()).limit(limit + 1)
+        result = await session.execute(query)
+        students = list(result.scalars().all())
+        has_prev = len(students) > limit
+        students = students[:limit]
+        students.reverse()
+        return StudentPage(students=students, has_prev=has_prev, has_next=True)
+
+    if after_id is not None:
+        query = query.where(Students.id > after_id)
+    query = query.order_by(Students.id).limit(limit + 1)
+    result = await session.execute(query)
+    students = list(result.scalars().all())
+    return StudentPage(
+        students=students[:limit],
+        has_prev=after_id is not None,
+        has_next=len(students) > limit
+    )
+
 async def update_payment_status(session: AsyncSession, user_id: int, is_paid: bool):
     """Update a student's payment status"""
     user = await get_user(session, user_id)
     if user:
         user.is_paid = is_paid
         await session.commit()
+        cache_student(user_id, user)
+        student_counts_cache.clear()
+    return user
+
+async def get_recipients_batch(session: AsyncSession, category: str, after_id: int, limit: int) -> List[Row]:
+    """Next batch of (id, user_id) of students who have not blocked the bot, in id order after `after_id`"""
+    query = select(Students.id, Students.user_id).where(Students.id > after_id, Students.is_blocked.isnot(True))
+    category_filter = STUDENT_CATEGORIES[category]
+    if category_filter is not None:
+        query = query.where(category_filter)
+    result = await session.execute(query.order_by(Students.id).limit(limit))
+    return list(result.all())
+
+async def count_recipients(session: AsyncSession, category: str) -> int:
+    """Number of students in a category who have not blocked the bot"""
+    query = select(func.count(Students.id)).where(Students.is_blocked.isnot(True))
+    category_filter = STUDENT_CATEGORIES[category]
+    if category_filter is not None:
+        query = query.where(category_filter)
+    return (await session.execute(query)).scalar_one()
+
+async def mark_student_blocked(session: AsyncSession, user_id: int):
+    """Remember that a student has blocked the bot"""
+    user = await get_user(session, user_id)
+    if user:
+        user.is_blocked = True
+        await session.commit()
+        cache_student(user_id, user)
     return user
 
 async def get_admin_students(session: AsyncSession):
@@ -59,6 +259,7 @@ async def add_admin(session: AsyncSession, user_id: int):
     if user:
         user.is_admin = True
         await session.commit()
+        cache_student(user_id, user)
     return user
 
 async def remove_admin(session: AsyncSession, user_id: int):
@@ -67,6 +268,7 @@ async def remove_admin(session: AsyncSession, user_id: int):
     if user:
         user.is_admin = False
         await session.commit()
+        cache_student(user_id, user)
     return user
 
 async def check_if_admin(session: AsyncSession, user_id: int):
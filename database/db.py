@@ -1,8 +1,8 @@
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
-from database.config import DATABASE_URL
+from database.config import get_engine_options
 
-engine = create_async_engine(DATABASE_URL, echo=True)
+engine = create_async_engine(**get_engine_options())
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 Base = declarative_base()
@@ -0,0 +1,41 @@
+from typing import Any, Dict, Optional, Tuple
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.redis import RedisStorage # Needs the redis package
+
+
+class RedisFSMStorage(RedisStorage):
+    """RedisStorage that reads and writes a key's state and data together, in one round trip"""
+
+    async def read(self, key: StorageKey) -> Tuple[Optional[str], Dict[str, Any]]:
+        state, data = await self.redis.mget(self.key_builder.build(key, "state"), self.key_builder.build(key, "data"))
+        if isinstance(state, bytes):
+            state = state.decode("utf-8")
+        if data is None:
+            return state, {}
+        if isinstance(data, bytes):
+            data = data.decode("utf-8")
+        return state, self.json_loads(data)
+
+    async def write(self, key: StorageKey, **values: Any) -> None:
+        """Set the given "state" and/or "data" of `key` in one MULTI/EXEC, so readers never see half of it"""
+        state_key = self.key_builder.build(key, "state")
+        data_key = self.key_builder.build(key, "data")
+        async with self.redis.pipeline(transaction=True) as pipe:
+            if "state" in values:
+                state = values["state"]
+                if state is None:
+                    pipe.delete(state_key)
+                else:
+                    pipe.set(state_key, state.state if isinstance(state, State) else state, ex=self.state_ttl)
+            elif self.state_ttl:
+                # The state lives as long as its data
+                pipe.expire(state_key, self.state_ttl)
+            if "data" in values:
+                if values["data"]:
+                    pipe.set(data_key, self.json_dumps(values["data"]), ex=self.data_ttl)
+                else:
+                    pipe.delete(data_key)
+            elif self.data_ttl:
+                pipe.expire(data_key, self.data_ttl)
+            await pipe.execute()
@@ -0,0 +1,221 @@
+"""FSM storages that outlive the process.
+
+SQLAlchemyStorage keeps states in the fsm_states table; RedisFSMStorage
+(database/fsm_redis.py, needs the `redis` package) works with any
+Redis-protocol server. Either one is wrapped in BufferedStorage: an update
+reads a user's state once, and a handler calling state.update_data() several
+times costs at most one write at the end, none if nothing changed.
+"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Mapping, Optional, Tuple
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, DefaultKeyBuilder, KeyBuilder, StateType, StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+from sqlalchemy import delete, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from config import settings
+from database.cache import TTLCache
+from database.db import async_session
+from database.models.fsm import FSMRecord
+from logging_config import logger
+
+
+def _state_name(state: StateType) -> Optional[str]:
+    return state.state if isinstance(state, State) else state
+
+
+class SQLAlchemyStorage(BaseStorage):
+    """States in the fsm_states table, shared by every instance of the bot"""
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession] = async_session, key_builder: Optional[KeyBuilder] = None):
+        self.session_factory = session_factory
+        self.key_builder = key_builder or DefaultKeyBuilder(with_bot_id=True, with_destiny=True)
+        # Both dialects spell an upsert as INSERT ... ON CONFLICT DO UPDATE
+        dialect = session_factory.kw["bind"].dialect.name
+        self._insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+
+    async def read(self, key: StorageKey) -> Tuple[Optional[str], Dict[str, Any]]:
+        """State and data of `key` in one query"""
+        async with self.session_factory() as session:
+            row = (await session.execute(
+                select(FSMRecord.state, FSMRecord.data).where(FSMRecord.key == self.key_builder.build(key))
+            )).first()
+        if row is None:
+            return None, {}
+        return row.state, dict(row.data or {})
+
+    async def write(self, key: StorageKey, **values: Any) -> None:
+        """Upsert the given columns ("state" and/or "data") of `key` in one statement"""
+        values["updated_at"] = int(time.time())
+        stmt = self._insert(FSMRecord).values(key=self.key_builder.build(key), **values)
+        stmt = stmt.on_conflict_do_update(index_elements=[FSMRecord.key], set_=values)
+        async with self.session_factory() as session:
+            await session.execute(stmt)
+            await session.commit()
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        await self.write(key, state=_state_name(state))
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        state, _ = await self.read(key)
+        return state
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        await self.write(key, data=dict(data))
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        _, data = await self.read(key)
+        return data
+
+    async def delete_expired(self, ttl: int) -> int:
+        """Delete states not written for `ttl` seconds, return how many"""
+        async with self.session_factory() as session:
+            result = await session.execute(delete(FSMRecord).where(FSMRecord.updated_at < int(time.time()) - ttl))
+            await session.commit()
+        return result.rowcount
+
+    async def close(self) -> None:
+        pass
+
+
+@dataclass(slots=True)
+class _Entry:
+    state: Optional[str]
+    data: Dict[str, Any]
+    # As last read from or written to the storage; equal values are not written again
+    saved_state: Optional[str]
+    saved_data: Dict[str, Any]
+
+
+class _UpdateBuffer:
+    __slots__ = ("entries", "open")
+
+    def __init__(self):
+        self.entries: Dict[StorageKey, _Entry] = {}
+        self.open = True
+
+
+# Buffer of the update being handled in the current task
+_buffer: ContextVar[Optional[_UpdateBuffer]] = ContextVar("fsm_buffer", default=None)
+
+
+class BufferedStorage(BaseStorage):
+    """
+    Reads each key at most once per update and writes it at most once, and only if it changed.
+
+    `storage` must provide read(key) -> (state, data) and write(key, state=..., data=...).
+    Outside of buffer() (e.g. in background tasks) reads and writes go through at once.
+    With cache_size, states are also kept in memory for cache_ttl seconds: only
+    safe while no other bot instance shares the storage, since their writes are
+    not seen until the cached state expires.
+    """
+
+    def __init__(self, storage: BaseStorage, cache_size: int = 0, cache_ttl: float = 0):
+        self.storage = storage
+        # Key -> (state, data) as saved in the storage; off by default
+        self.cache = TTLCache(maxsize=cache_size, ttl=cache_ttl) if cache_size and cache_ttl else None
+
+    @asynccontextmanager
+    async def buffer(self) -> AsyncIterator[None]:
+        """Collect the FSM reads and writes made inside, write the changes at the end"""
+        buffer = _UpdateBuffer()
+        token = _buffer.set(buffer)
+        try:
+            yield
+        finally:
+            _buffer.reset(token)
+            # Tasks started by the handler copied the context; let them write through
+            buffer.open = False
+            for key, entry in buffer.entries.items():
+                await self._write(key, entry)
+
+    async def _load(self, key: StorageKey) -> _Entry:
+        if self.cache is None:
+            state, data = await self.storage.read(key)
+        else:
+            state, data = await self.cache.get_or_load(key, lambda: self.storage.read(key))
+        return _Entry(state=state, data=data, saved_state=state, saved_data=data)
+
+    async def _entry(self, key: StorageKey) -> Tuple[_Entry, bool]:
+        """The entry of `key` and whether it must be written right away (no open buffer)"""
+        buffer = _buffer.get()
+        if buffer is None or not buffer.open:
+            return await self._load(key), True
+        entry = buffer.entries.get(key)
+        if entry is None:
+            entry = buffer.entries[key] = await self._load(key)
+        return entry, False
+
+    async def _write(self, key: StorageKey, entry: _Entry) -> None:
+        values = {}
+        if entry.state != entry.saved_state:
+            values["state"] = entry.state
+        if entry.data != entry.saved_data:
+            values["data"] = entry.data
+        if not values:
+            return
+        await self.storage.write(key, **values)
+        entry.saved_state, entry.saved_data = entry.state, entry.data
+        if self.cache is not None:
+            self.cache.set(key, (entry.state, entry.data))
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        entry, write_now = await self._entry(key)
+        entry.state = _state_name(state)
+        if write_now:
+            await self._write(key, entry)
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        entry, _ = await self._entry(key)
+        return entry.state
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        entry, write_now = await self._entry(key)
+        # Never changed in place: the cache may share the dict
+        entry.data = dict(data)
+        if write_now:
+            await self._write(key, entry)
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        entry, _ = await self._entry(key)
+        # Callers may change the dict they get
+        return dict(entry.data)
+
+    async def close(self) -> None:
+        await self.storage.close()
+
+
+def create_fsm_storage() -> BaseStorage:
+    """The storage selected by FSM_STORAGE"""
+    if settings.FSM_STORAGE == "memory":
+        return MemoryStorage()
+    if settings.FSM_STORAGE == "database":
+        return BufferedStorage(SQLAlchemyStorage(), settings.FSM_CACHE_SIZE, settings.FSM_CACHE_TTL)
+    if settings.FSM_STORAGE == "redis":
+        try:
+            from database.fsm_redis import RedisFSMStorage
+        except ImportError as e:
+            raise RuntimeError("FSM_STORAGE=redis needs the redis package: pip install redis") from e
+        ttl = settings.FSM_TTL or None
+        storage = RedisFSMStorage.from_url(settings.FSM_REDIS_URL, state_ttl=ttl, data_ttl=ttl)
+        return BufferedStorage(storage, settings.FSM_CACHE_SIZE, settings.FSM_CACHE_TTL)
+    raise ValueError(f"Unknown FSM_STORAGE {settings.FSM_STORAGE!r}, expected memory, database or redis")
+
+
+async def expire_fsm_states(storage: SQLAlchemyStorage, ttl: int, interval: float):
+    """Delete abandoned states every `interval` seconds (Redis expires its keys by itself)"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            deleted = await storage.delete_expired(ttl)
+            if deleted:
+                logger.info(f"Deleted {deleted} expired FSM states")
+        except Exception as e:
+            logger.error(f"Could not delete expired FSM states: {e}")
@@ -0,0 +1,45 @@
+from sqlalchemy import Column, Integer, String, BigInteger, Enum, Index # type: ignore
+from database.db import Base
+import enum
+
+
+class BroadcastStatus(enum.Enum):
+    RUNNING = "running"
+    PAUSED = "paused"
+    COMPLETED = "completed"
+    CANCELLED = "cancelled"
+
+
+class Broadcast(Base):
+    __tablename__ = "broadcasts"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    created_by = Column(BigInteger, nullable=False)  # Telegram ID of the admin, gets the final report
+
+    # Recipients: a key of STUDENT_CATEGORIES ("all", "paid", "unpaid")
+    segment = Column(String(16), nullable=False)
+
+    # The admin's message, copied to every recipient
+    from_chat_id = Column(BigInteger, nullable=False)
+    message_id = Column(BigInteger, nullable=False)
+
+    status = Column(Enum(BroadcastStatus), nullable=False, default=BroadcastStatus.RUNNING)
+
+    # Progress: recipients are walked in Students.id order, last_student_id is the last one handled
+    last_student_id = Column(Integer, nullable=False, default=0)
+    total_count = Column(Integer, nullable=False, default=0)  # Recipients when the broadcast started
+    sent_count = Column(Integer, nullable=False, default=0)
+    blocked_count = Column(Integer, nullable=False, default=0)  # Students who blocked the bot
+    failed_count = Column(Integer, nullable=False, default=0)
+
+    # Incremented by each runner that takes the broadcast over; only the latest one may send
+    run_id = Column(Integer, nullable=False, default=0)
+
+    # Timestamps
+    created_at = Column(BigInteger, nullable=False)  # Unix timestamp
+    finished_at = Column(BigInteger, nullable=True)  # Unix timestamp
+
+    __table_args__ = (
+        # Broadcasts to resume on startup and to list in the admin menu
+        Index("ix_broadcasts_status", "status"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Text, BigInteger, Enum # type: ignore
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Text, BigInteger, Enum, Index, text # type: ignore
 from sqlalchemy.orm import relationship # type: ignore
 from database.db import Base
 import enum
@@ -23,6 +23,11 @@ class CourseType(Base):
     # Relationship with courses
     courses = relationship("Course", back_populates="course_type", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # get_active_course_types
+        Index("ix_course_types_active", "id", postgresql_where=text("is_active"), sqlite_where=text("is_active = 1")),
+    )
+
 
 class Course(Base):
     __tablename__ = "courses"
@@ -62,3 +67,18 @@ class Course(Base):
     # Timestamps
     created_at = Column(BigInteger, nullable=False)  # Unix timestamp
     updated_at = Column(BigInteger, nullable=True)   # Unix timestamp
+
+    __table_args__ = (
+        # get_courses_by_type_and_difficulty with a difficulty level
+        Index(
+            "ix_courses_active_type_difficulty_order",
+            "course_type_id", "difficulty_level", "order_index",
+            postgresql_where=text("is_active"), sqlite_where=text("is_active = 1")
+        ),
+        # get_courses_by_type and the "all levels" listing
+        Index(
+            "ix_courses_active_type_order",
+            "course_type_id", "order_index",
+            postgresql_where=text("is_active"), sqlite_where=text("is_active = 1")
+        ),
+    )
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, String, BigInteger, JSON, Index # type: ignore
+from sqlalchemy.dialects.postgresql import JSONB # type: ignore
+from database.db import Base
+
+
+class FSMRecord(Base):
+    """Conversation state of one chat/user, see database/fsm_storage.py"""
+    __tablename__ = "fsm_states"
+
+    key = Column(String(255), primary_key=True)  # Built by aiogram's DefaultKeyBuilder
+    state = Column(String(255), nullable=True)  # e.g. "CourseCreation:waiting_for_title"
+    data = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=False, default=dict)
+    updated_at = Column(BigInteger, nullable=False)  # Unix timestamp of the last write
+
+    __table_args__ = (
+        # Expired states are deleted by updated_at
+        Index("ix_fsm_states_updated_at", "updated_at"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, BigInteger, String, Boolean, Integer, Enum
+from sqlalchemy import Column, BigInteger, String, Boolean, Integer, Enum, Index, text
 from database.db import Base
 from utils.i18n import LanguageCode
 
@@ -14,3 +14,10 @@ class Students(Base):
     is_admin = Column(Boolean, default=False)
     is_blocked = Column(Boolean, default=False)
     is_paid = Column(Boolean, default=False)
+
+    __table_args__ = (
+        # Paid/unpaid filters, dashboard counts and keyset pagination on id
+        Index("ix_students_is_paid_id", "is_paid", "id"),
+        # get_admin_students
+        Index("ix_students_admins", "id", postgresql_where=text("is_admin"), sqlite_where=text("is_admin = 1")),
+    )
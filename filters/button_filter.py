@@ -0,0 +1,17 @@
+from typing import Optional
+from aiogram.filters import BaseFilter
+from aiogram.types import Message
+from utils.i18n import get_button_key
+
+
+class ButtonFilter(BaseFilter):
+    """Matches messages sent by pressing the reply button with the given translation key"""
+
+    def __init__(self, key: str):
+        self.key = key
+
+    async def __call__(self, message: Message, button: Optional[str] = None) -> bool:
+        # ButtonMiddleware resolves the label once per update; look it up here if it did not run
+        if button is None:
+            button = get_button_key(message.text)
+        return button == self.key
@@ -11,7 +11,9 @@ from database.crud.user import (
     check_if_admin
 )
 from keyboards.admin import get_admin_main_keyboard
-from utils.i18n import get_text, get_all_translations_for_key
+from keyboards.callback_data import RemoveAdminCallback
+from filters.button_filter import ButtonFilter
+from utils.i18n import get_text
 from config import settings
 
 router = Router()
@@ -23,7 +25,7 @@ class AdminManagement(StatesGroup):
     confirming_remove = State()
 
 
-@router.message(F.text.in_(get_all_translations_for_key("admin.admin_management")))
+@router.message(ButtonFilter("admin.admin_management"))
 async def admin_management_command(message: types.Message, session: AsyncSession, state: FSMContext, i18n_language=None):
     """Handle the admin management command"""
     # Get all admins
@@ -224,7 +226,7 @@ async def remove_admin_request(callback: types.CallbackQuery, session: AsyncSess
         keyboard.append([
             types.InlineKeyboardButton(
                 text=f"{full_name}" + (f" (@{admin.username})" if admin.username else ""),
-                callback_data=f"confirm_remove_{admin.user_id}"
+                callback_data=RemoveAdminCallback(user_id=admin.user_id).pack()
             )
         ])
     
@@ -257,10 +259,10 @@ async def remove_admin_request(callback: types.CallbackQuery, session: AsyncSess
     await callback.answer()
 
 
-@router.callback_query(AdminManagement.removing_admin, F.data.startswith("confirm_remove_"))
-async def confirm_remove_admin(callback: types.CallbackQuery, session: AsyncSession, state: FSMContext, i18n_language=None):
+@router.callback_query(AdminManagement.removing_admin, RemoveAdminCallback.filter(~F.confirmed))
+async def confirm_remove_admin(callback: types.CallbackQuery, callback_data: RemoveAdminCallback, session: AsyncSession, state: FSMContext, i18n_language=None):
     """Confirm removing an admin"""
-    user_id = int(callback.data.split("_")[-1])
+    user_id = callback_data.user_id
     
     # Check if user is trying to remove themselves
     if user_id == callback.from_user.id:
@@ -291,7 +293,7 @@ async def confirm_remove_admin(callback: types.CallbackQuery, session: AsyncSess
         [
             types.InlineKeyboardButton(
                 text=get_text("buttons.confirm", i18n_language),
-                callback_data=f"remove_admin_{user_id}"
+                callback_data=RemoveAdminCallback(user_id=user_id, confirmed=True).pack()
             ),
             types.InlineKeyboardButton(
                 text=get_text("buttons.cancel", i18n_language),
@@ -308,10 +310,10 @@ async def confirm_remove_admin(callback: types.CallbackQuery, session: AsyncSess
     await callback.answer()
 
 
-@router.callback_query(AdminManagement.confirming_remove, F.data.startswith("remove_admin_"))
-async def process_remove_admin(callback: types.CallbackQuery, session: AsyncSession, state: FSMContext, i18n_language=None):
+@router.callback_query(AdminManagement.confirming_remove, RemoveAdminCallback.filter(F.confirmed))
+async def process_remove_admin(callback: types.CallbackQuery, callback_data: RemoveAdminCallback, session: AsyncSession, state: FSMContext, i18n_language=None):
     """Process removing an admin"""
-    user_id = int(callback.data.split("_")[-1])
+    user_id = callback_data.user_id
     
     # Check if user is trying to remove themselves
     if user_id == callback.from_user.id:
@@ -8,11 +8,11 @@ from aiogram.types import ReplyKeyboardRemove
 
 from filters.admin_filter import AdminFilter
 from database.db import async_session
-from database.crud.user import get_user, check_if_admin
 from config import settings
 from utils.i18n import get_text
 
 from keyboards.admin import get_admin_main_keyboard
+from middleware.user_context import UserContext
 
 load_dotenv()
 
@@ -26,11 +26,9 @@ except Exception as e:
     logger.error(f"Error parsing ADMIN_IDS from environment: {e}")
 
 @router.message(Command("admin"))
-async def start_handler(message: Message, session, i18n_language: str):
-    # Check if user is an admin in database
-    is_admin = await check_if_admin(session, message.from_user.id)
-    
-    if is_admin:
+async def start_handler(message: Message, user_context: UserContext, i18n_language: str):
+    # Check if user is an admin (loaded once by UserContextMiddleware)
+    if user_context.is_admin:
         await message.answer(get_text("admin.welcome", i18n_language), reply_markup=get_admin_main_keyboard(i18n_language))
     else:
         await message.answer(get_text("errors.access_denied", i18n_language), reply_markup=ReplyKeyboardRemove())
@@ -0,0 +1,211 @@
+from aiogram import Router, F, types
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.state import State, StatesGroup
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.crud.broadcast import create_broadcast, get_broadcast, get_broadcasts_by_status, set_broadcast_status
+from database.crud.user import STUDENT_CATEGORIES, count_recipients
+from database.models.broadcast import Broadcast, BroadcastStatus
+from keyboards.callback_data import BroadcastAction, BroadcastCallback, BroadcastSegmentCallback
+from utils.broadcast import broadcaster, format_broadcast_progress
+from filters.button_filter import ButtonFilter
+from utils.i18n import get_text
+
+router = Router()
+
+class Broadcasting(StatesGroup):
+    waiting_message = State()
+    confirming = State()
+
+
+def get_broadcast_keyboard(broadcast: Broadcast, i18n_language=None) -> types.InlineKeyboardMarkup:
+    """Controls for one broadcast"""
+    keyboard = []
+    if broadcast.status == BroadcastStatus.RUNNING:
+        keyboard.append([
+            types.InlineKeyboardButton(
+                text=get_text("admin.broadcast_pause", i18n_language),
+                callback_data=BroadcastCallback(action=BroadcastAction.PAUSE, broadcast_id=broadcast.id).pack()
+            )
+        ])
+    elif broadcast.status == BroadcastStatus.PAUSED:
+        keyboard.append([
+            types.InlineKeyboardButton(
+                text=get_text("admin.broadcast_resume", i18n_language),
+                callback_data=BroadcastCallback(action=BroadcastAction.RESUME, broadcast_id=broadcast.id).pack()
+            )
+        ])
+
+    if broadcast.status in (BroadcastStatus.RUNNING, BroadcastStatus.PAUSED):
+        keyboard.append([
+            types.InlineKeyboardButton(
+                text=get_text("admin.broadcast_refresh", i18n_language),
+                callback_data=BroadcastCallback(action=BroadcastAction.VIEW, broadcast_id=broadcast.id).pack()
+            ),
+            types.InlineKeyboardButton(
+                text=get_text("admin.broadcast_stop", i18n_language),
+                callback_data=BroadcastCallback(action=BroadcastAction.STOP, broadcast_id=broadcast.id).pack()
+            )
+        ])
+
+    keyboard.append([
+        types.InlineKeyboardButton(
+            text=get_text("buttons.back", i18n_language),
+            callback_data="broadcast_menu"
+        )
+    ])
+    return types.InlineKeyboardMarkup(inline_keyboard=keyboard)
+
+async def get_broadcast_menu(session: AsyncSession, i18n_language=None) -> types.InlineKeyboardMarkup:
+    """Segments to broadcast to, followed by the unfinished broadcasts"""
+    keyboard = []
+    for category in STUDENT_CATEGORIES:
+        count = await count_recipients(session, category)
+        keyboard.append([
+            types.InlineKeyboardButton(
+                text=get_text(f"admin.broadcast_segment_{category}", i18n_language).format(count=count),
+                callback_data=BroadcastSegmentCallback(category=category).pack()
+            )
+        ])
+
+    for broadcast in await get_broadcasts_by_status(session, BroadcastStatus.RUNNING, BroadcastStatus.PAUSED):
+        status = get_text(f"admin.broadcast_status_{broadcast.status.value}", i18n_language)
+        keyboard.append([
+            types.InlineKeyboardButton(
+                text=f"📢 #{broadcast.id} — {status}",
+                callback_data=BroadcastCallback(action=BroadcastAction.VIEW, broadcast_id=broadcast.id).pack()
+            )
+        ])
+
+    keyboard.append([
+        types.InlineKeyboardButton(
+            text=get_text("buttons.back_to_menu", i18n_language),
+            callback_data="back_to_admin_menu"
+        )
+    ])
+    return types.InlineKeyboardMarkup(inline_keyboard=keyboard)
+
+
+@router.message(ButtonFilter("admin.broadcast"))
+async def broadcast_command(message: types.Message, session: AsyncSession, state: FSMContext, i18n_language=None):
+    """Show the broadcast menu"""
+    await state.clear()
+    await message.answer(
+        get_text("admin.broadcast_menu", i18n_language),
+        reply_markup=await get_broadcast_menu(session, i18n_language)
+    )
+
+@router.callback_query(F.data == "broadcast_menu")
+async def back_to_broadcast_menu(callback: types.CallbackQuery, session: AsyncSession, state: FSMContext, i18n_language=None):
+    """Return to the broadcast menu"""
+    await state.clear()
+    await callback.message.edit_text(
+        get_text("admin.broadcast_menu", i18n_language),
+        reply_markup=await get_broadcast_menu(session, i18n_language)
+    )
+    await callback.answer()
+
+@router.callback_query(BroadcastSegmentCallback.filter())
+async def select_segment(callback: types.CallbackQuery, callback_data: BroadcastSegmentCallback, session: AsyncSession, state: FSMContext, i18n_language=None):
+    """Ask for the message to broadcast to the selected students"""
+    segment = callback_data.category
+    if segment not in STUDENT_CATEGORIES:
+        await callback.answer(get_text("student.invalid_selection", i18n_language))
+        return
+
+    count = await count_recipients(session, segment)
+    await state.set_state(Broadcasting.waiting_message)
+    await state.update_data(segment=segment, count=count)
+    await callback.message.edit_text(
+        get_text("admin.broadcast_send_message", i18n_language).format(count=count),
+        reply_markup=types.InlineKeyboardMarkup(inline_keyboard=[[
+            types.InlineKeyboardButton(
+                text=get_text("buttons.cancel", i18n_language),
+                callback_data="broadcast_menu"
+            )
+        ]])
+    )
+    await callback.answer()
+
+@router.message(Broadcasting.waiting_message)
+async def process_broadcast_message(message: types.Message, state: FSMContext, i18n_language=None):
+    """Remember the message to broadcast and ask for confirmation"""
+    data = await state.get_data()
+    await state.update_data(from_chat_id=message.chat.id, message_id=message.message_id)
+    await state.set_state(Broadcasting.confirming)
+    await message.answer(
+        get_text("admin.broadcast_confirm", i18n_language).format(count=data.get("count", 0)),
+        reply_markup=types.InlineKeyboardMarkup(inline_keyboard=[
+            [
+                types.InlineKeyboardButton(
+                    text=get_text("buttons.confirm", i18n_language),
+                    callback_data="broadcast_confirm"
+                ),
+                types.InlineKeyboardButton(
+                    text=get_text("buttons.cancel", i18n_language),
+                    callback_data="broadcast_menu"
+                )
+            ]
+        ])
+    )
+
+@router.callback_query(Broadcasting.confirming, F.data == "broadcast_confirm")
+async def confirm_broadcast(callback: types.CallbackQuery, session: AsyncSession, state: FSMContext, i18n_language=None):
+    """Create the broadcast and start sending it"""
+    data = await state.get_data()
+    await state.clear()
+
+    broadcast = await create_broadcast(
+        session,
+        created_by=callback.from_user.id,
+        segment=data["segment"],
+        from_chat_id=data["from_chat_id"],
+        message_id=data["message_id"]
+    )
+    broadcaster.start(broadcast.id)
+
+    await callback.message.edit_text(
+        f"{get_text('admin.broadcast_started', i18n_language).format(id=broadcast.id)}\n\n"
+        f"{format_broadcast_progress(broadcast, i18n_language)}",
+        reply_markup=get_broadcast_keyboard(broadcast, i18n_language)
+    )
+    await callback.answer()
+
+@router.callback_query(BroadcastCallback.filter(F.action == BroadcastAction.VIEW))
+async def view_broadcast(callback: types.CallbackQuery, callback_data: BroadcastCallback, session: AsyncSession, i18n_language=None):
+    """Show the progress of a broadcast"""
+    broadcast = await get_broadcast(session, callback_data.broadcast_id)
+    if broadcast is None:
+        await callback.answer(get_text("admin.broadcast_not_found", i18n_language), show_alert=True)
+        return
+
+    text = format_broadcast_progress(broadcast, i18n_language)
+    if text != callback.message.text:
+        await callback.message.edit_text(text, reply_markup=get_broadcast_keyboard(broadcast, i18n_language))
+    await callback.answer()
+
+@router.callback_query(BroadcastCallback.filter(F.action != BroadcastAction.VIEW))
+async def change_broadcast_status(callback: types.CallbackQuery, callback_data: BroadcastCallback, session: AsyncSession, i18n_language=None):
+    """Pause, resume or stop a broadcast"""
+    broadcast_id = callback_data.broadcast_id
+    status = {
+        BroadcastAction.PAUSE: BroadcastStatus.PAUSED,
+        BroadcastAction.RESUME: BroadcastStatus.RUNNING,
+        BroadcastAction.STOP: BroadcastStatus.CANCELLED
+    }[callback_data.action]
+
+    broadcast = await set_broadcast_status(session, broadcast_id, status)
+    if broadcast is None:
+        await callback.answer(get_text("admin.broadcast_not_found", i18n_language), show_alert=True)
+        return
+
+    if status == BroadcastStatus.RUNNING:
+        broadcaster.start(broadcast_id)
+    else:
+        broadcaster.stop(broadcast_id)
+
+    await callback.message.edit_text(
+        format_broadcast_progress(broadcast, i18n_language),
+        reply_markup=get_broadcast_keyboard(broadcast, i18n_language)
+    )
+    await callback.answer()
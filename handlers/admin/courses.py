@@ -18,17 +18,31 @@ from database.crud.courses import (
     delete_course
 )
 from database.models.courses import DifficultyLevel, CourseType
+from database.catalog import reload_catalog
+from keyboards.cache import cached_keyboard
+from keyboards.callback_data import (
+    CourseAction,
+    CourseAdminCallback,
+    CourseListAdminCallback,
+    CourseTypeAction,
+    CourseTypeAdminCallback,
+    NewCourseDifficultyCallback,
+    NewCourseTypeCallback,
+    SetDifficultyCallback
+)
 from keyboards.admin import (
     get_admin_main_keyboard,
     get_admin_course_keyboard,
     get_difficulty_keyboard,
     get_course_management_keyboard
 )
-from utils.i18n import get_text, get_all_translations_for_key
+from filters.button_filter import ButtonFilter
+from utils.i18n import get_text
 
 router = Router()
 
 # Helper function to create a cancel keyboard
+@cached_keyboard
 def get_cancel_keyboard(i18n_language=None) -> types.ReplyKeyboardMarkup:
     """Create a cancel keyboard with localized text"""
     keyboard = [[types.KeyboardButton(text=get_text("buttons.cancel", i18n_language))]]
@@ -59,7 +73,7 @@ class CourseManagement(StatesGroup):
     waiting_for_new_order = State()
     confirm_delete = State()
 
-@router.message(F.text.in_(get_all_translations_for_key("course_type.add")))
+@router.message(ButtonFilter("course_type.add"))
 async def cmd_add_course_type(message: types.Message, state: FSMContext, session: AsyncSession, i18n_language=None):
     """Handler for adding a new course type"""
     await message.answer(get_text("course_type.name", i18n_language), reply_markup=get_cancel_keyboard(i18n_language))
@@ -86,7 +100,7 @@ async def process_course_type_name(message: types.Message, state: FSMContext, se
     await state.clear()
 
 
-@router.message(F.text.in_(get_all_translations_for_key("course.add")))
+@router.message(ButtonFilter("course.add"))
 async def cmd_add_course(message: types.Message, state: FSMContext, session: AsyncSession, i18n_language=None):
     """Start the course creation process"""
     query = select(CourseType).filter(CourseType.is_active == True)
@@ -108,10 +122,10 @@ async def cmd_add_course(message: types.Message, state: FSMContext, session: Asy
     )
     await state.set_state(CourseCreation.waiting_for_type)
 
-@router.callback_query(CourseCreation.waiting_for_type, F.data.startswith("course_type_"))
-async def process_course_type_selection(callback: types.CallbackQuery, state: FSMContext, i18n_language=None):
+@router.callback_query(CourseCreation.waiting_for_type, NewCourseTypeCallback.filter())
+async def process_course_type_selection(callback: types.CallbackQuery, callback_data: NewCourseTypeCallback, state: FSMContext, i18n_language=None):
     """Process course type selection"""
-    course_type_id = int(callback.data.split("_")[-1])
+    course_type_id = callback_data.course_type_id
     await state.update_data(course_type_id=course_type_id)
     
     await callback.message.edit_text(get_text("course.add_title", i18n_language))
@@ -235,11 +249,11 @@ async def process_practice_image_text(message: types.Message, state: FSMContext,
     if message.text == get_text("course.practice_finish_button", i18n_language):
         await finish_practice_images(message, state, i18n_language)
 
-@router.callback_query(CourseCreation.waiting_for_difficulty, F.data.startswith("difficulty_"))
-async def process_difficulty(callback: types.CallbackQuery, state: FSMContext, i18n_language=None):
+@router.callback_query(CourseCreation.waiting_for_difficulty, NewCourseDifficultyCallback.filter())
+async def process_difficulty(callback: types.CallbackQuery, callback_data: NewCourseDifficultyCallback, state: FSMContext, i18n_language=None):
     """Process difficulty selection"""
-    difficulty = DifficultyLevel[callback.data.split("_")[-1]]
-    await state.update_data(difficulty_level=difficulty)
+    # By name, FSM data must be JSON serializable
+    await state.update_data(difficulty_level=callback_data.level.name)
     
     await callback.message.edit_text(get_text("course.enter_order", i18n_language))
     await state.set_state(CourseCreation.waiting_for_order)
@@ -265,7 +279,7 @@ async def process_order(message: types.Message, state: FSMContext, session: Asyn
         course_type_id=data["course_type_id"],
         title=data["title"],
         description=data["description"],
-        difficulty_level=data["difficulty_level"],
+        difficulty_level=DifficultyLevel[data["difficulty_level"]],
         order_index=order_index,
         banner_file_id=data["banner_file_id"],
         video_file_id=data["video_file_id"],
@@ -302,7 +316,7 @@ async def cancel_course_creation(callback: types.CallbackQuery, state: FSMContex
         reply_markup=get_admin_main_keyboard(i18n_language)
     )
 
-@router.message(F.text.in_(get_all_translations_for_key("admin.course_management")))
+@router.message(ButtonFilter("admin.course_management"))
 async def cmd_course_management(message: types.Message, state: FSMContext, session: AsyncSession, i18n_language=None):
     """Handler for course management - show main management options first"""
     keyboard = [
@@ -356,7 +370,7 @@ async def manage_courses(callback: types.CallbackQuery, state: FSMContext, sessi
         keyboard.append([
             types.InlineKeyboardButton(
                 text=f"📚 {course_type.name}",
-                callback_data=f"manage_course_type_{course_type.id}"
+                callback_data=CourseTypeAdminCallback(action=CourseTypeAction.MANAGE, course_type_id=course_type.id).pack()
             )
         ])
     
@@ -400,17 +414,17 @@ async def manage_course_types(callback: types.CallbackQuery, session: AsyncSessi
         keyboard.append([
             types.InlineKeyboardButton(
                 text=f"📚 {course_type.name}",
-                callback_data=f"select_course_type_{course_type.id}"
+                callback_data="noop"
             )
         ])
         keyboard.append([
             types.InlineKeyboardButton(
                 text=get_text("course_type.edit", i18n_language),
-                callback_data=f"rename_course_type_{course_type.id}"
+                callback_data=CourseTypeAdminCallback(action=CourseTypeAction.RENAME, course_type_id=course_type.id).pack()
             ),
             types.InlineKeyboardButton(
                 text=get_text("course_type.delete", i18n_language),
-                callback_data=f"delete_type_course_{course_type.id}" 
+                callback_data=CourseTypeAdminCallback(action=CourseTypeAction.DELETE, course_type_id=course_type.id).pack() 
             )
         ])
     
@@ -432,10 +446,10 @@ async def back_to_course_management(callback: types.CallbackQuery, state: FSMCon
     await cmd_course_management(callback.message, state, None, i18n_language)
     await callback.message.delete()
 
-@router.callback_query(F.data.startswith("manage_course_type_"))
-async def process_manage_course_type(callback: types.CallbackQuery, state: FSMContext, session: AsyncSession, i18n_language=None):
+@router.callback_query(CourseTypeAdminCallback.filter(F.action == CourseTypeAction.MANAGE))
+async def process_manage_course_type(callback: types.CallbackQuery, callback_data: CourseTypeAdminCallback, state: FSMContext, session: AsyncSession, i18n_language=None):
     """Show difficulty levels for selected course type"""
-    course_type_id = int(callback.data.split("_")[-1])
+    course_type_id = callback_data.course_type_id
     
     # Store the course type ID for later use
     await state.update_data(course_type_id=course_type_id)
@@ -463,7 +477,7 @@ async def process_manage_course_type(callback: types.CallbackQuery, state: FSMCo
         keyboard.append([
             types.InlineKeyboardButton(
                 text=difficulty_text,
-                callback_data=f"manage_course_difficulty_{course_type_id}_{level.name}"
+                callback_data=CourseListAdminCallback(course_type_id=course_type_id, level=level).pack()
             )
         ])
     
@@ -471,7 +485,7 @@ async def process_manage_course_type(callback: types.CallbackQuery, state: FSMCo
     keyboard.append([
         types.InlineKeyboardButton(
             text=get_text("course.difficulty.all", i18n_language),
-            callback_data=f"manage_course_difficulty_{course_type_id}_ALL"
+            callback_data=CourseListAdminCallback(course_type_id=course_type_id).pack()
         )
     ])
     
@@ -489,12 +503,11 @@ async def process_manage_course_type(callback: types.CallbackQuery, state: FSMCo
     )
     await state.set_state(CourseManagement.waiting_for_type)
 
-@router.callback_query(F.data.startswith("manage_course_difficulty_"))
-async def process_manage_course_difficulty(callback: types.CallbackQuery, state: FSMContext, session: AsyncSession, i18n_language=None):
+@router.callback_query(CourseListAdminCallback.filter())
+async def process_manage_course_difficulty(callback: types.CallbackQuery, callback_data: CourseListAdminCallback, state: FSMContext, session: AsyncSession, i18n_language=None):
     """Show courses for selected type and difficulty"""
-    parts = callback.data.split("_")
-    course_type_id = int(parts[3])
-    difficulty = parts[4]
+    course_type_id = callback_data.course_type_id
+    difficulty = callback_data.level.name if callback_data.level else "ALL"
     
     # Store the course type ID for later use
     await state.update_data(course_type_id=course_type_id)
@@ -533,7 +546,7 @@ async def process_manage_course_difficulty(callback: types.CallbackQuery, state:
             reply_markup=types.InlineKeyboardMarkup(inline_keyboard=[[
                 types.InlineKeyboardButton(
                     text=get_text("buttons.back", i18n_language),
-                    callback_data=f"manage_course_type_{course_type_id}"
+                    callback_data=CourseTypeAdminCallback(action=CourseTypeAction.MANAGE, course_type_id=course_type_id).pack()
                 )
             ]])
         )
@@ -546,14 +559,14 @@ async def process_manage_course_difficulty(callback: types.CallbackQuery, state:
         keyboard.append([
             types.InlineKeyboardButton(
                 text=f"{course.title} ({difficulty_text}, #{course.order_index})",
-                callback_data=f"manage_course_{course.id}"
+                callback_data=CourseAdminCallback(action=CourseAction.MANAGE, course_id=course.id).pack()
             )
         ])
     
     keyboard.append([
         types.InlineKeyboardButton(
             text=get_text("buttons.back", i18n_language),
-            callback_data=f"manage_course_type_{course_type_id}"
+            callback_data=CourseTypeAdminCallback(action=CourseTypeAction.MANAGE, course_type_id=course_type_id).pack()
         )
     ])
     
@@ -572,10 +585,10 @@ async def process_manage_course_difficulty(callback: types.CallbackQuery, state:
     )
     await state.set_state(CourseManagement.waiting_for_course)
 
-@router.callback_query(F.data.startswith("manage_course_"))
-async def process_manage_course(callback: types.CallbackQuery, state: FSMContext, session: AsyncSession, i18n_language=None):
+@router.callback_query(CourseAdminCallback.filter(F.action == CourseAction.MANAGE))
+async def process_manage_course(callback: types.CallbackQuery, callback_data: CourseAdminCallback, state: FSMContext, session: AsyncSession, i18n_language=None):
     """Show management options for selected course"""
-    course_id = int(callback.data.split("_")[-1])
+    course_id = callback_data.course_id
     
     # Store the course ID for later use
     await state.update_data(course_id=course_id)
@@ -602,7 +615,6 @@ async def process_manage_course(callback: types.CallbackQuery, state: FSMContext
     
     # Send course info
     difficulty_text = get_text(f"course.difficulty.{course.difficulty_level.name.lower()}", i18n_language)
-    print(difficulty_text)
     course_info = (
         f"{get_text('course.title', i18n_language)}: {course.title}\n"
         f"📊 {get_text('course.difficulty_title', i18n_language)}: {difficulty_text}\n"
@@ -626,10 +638,10 @@ async def process_manage_course(callback: types.CallbackQuery, state: FSMContext
         reply_markup=keyboard
     )
 
-@router.callback_query(F.data.startswith("edit_course_"))
-async def edit_course_menu(callback: types.CallbackQuery, state: FSMContext, i18n_language=None):
+@router.callback_query(CourseAdminCallback.filter(F.action == CourseAction.EDIT))
+async def edit_course_menu(callback: types.CallbackQuery, callback_data: CourseAdminCallback, state: FSMContext, i18n_language=None):
     """Show edit options for the course"""
-    course_id = int(callback.data.split("_")[-1])
+    course_id = callback_data.course_id
     await state.update_data(course_id=course_id)
     
     # Reset the state to waiting_for_course to ensure back button works after cancellation
@@ -639,37 +651,37 @@ async def edit_course_menu(callback: types.CallbackQuery, state: FSMContext, i18
         [
             types.InlineKeyboardButton(
                 text=get_text("course.edit_title", i18n_language),
-                callback_data=f"edit_title_{course_id}"
+                callback_data=CourseAdminCallback(action=CourseAction.EDIT_TITLE, course_id=course_id).pack()
             ),
             types.InlineKeyboardButton(
                 text=get_text("course.edit_description", i18n_language),
-                callback_data=f"edit_description_{course_id}"
+                callback_data=CourseAdminCallback(action=CourseAction.EDIT_DESCRIPTION, course_id=course_id).pack()
             )
         ],
         [
             types.InlineKeyboardButton(
                 text=get_text("course.edit_banner", i18n_language),
-                callback_data=f"edit_banner_{course_id}"
+                callback_data=CourseAdminCallback(action=CourseAction.EDIT_BANNER, course_id=course_id).pack()
             ),
             types.InlineKeyboardButton(
                 text=get_text("course.edit_video", i18n_language),
-                callback_data=f"edit_video_{course_id}"
+                callback_data=CourseAdminCallback(action=CourseAction.EDIT_VIDEO, course_id=course_id).pack()
             )
         ],
         [
             types.InlineKeyboardButton(
                 text=get_text("course.edit_voice", i18n_language),
-                callback_data=f"edit_voice_{course_id}"
+                callback_data=CourseAdminCallback(action=CourseAction.EDIT_VOICE, course_id=course_id).pack()
             ),
             types.InlineKeyboardButton(
                 text=get_text("course.edit_text", i18n_language),
-                callback_data=f"edit_text_{course_id}"
+                callback_data=CourseAdminCallback(action=CourseAction.EDIT_TEXT, course_id=course_id).pack()
             )
         ],
         [
             types.InlineKeyboardButton(
                 text=get_text("buttons.back", i18n_language),
-                callback_data=f"manage_course_{course_id}"
+                callback_data=CourseAdminCallback(action=CourseAction.MANAGE, course_id=course_id).pack()
             )
         ]
     ]
@@ -679,21 +691,21 @@ async def edit_course_menu(callback: types.CallbackQuery, state: FSMContext, i18
         reply_markup=types.InlineKeyboardMarkup(inline_keyboard=keyboard)
     )
 
-@router.callback_query(F.data.startswith("delete_course_"))
-async def delete_course_confirmation(callback: types.CallbackQuery, state: FSMContext, i18n_language=None):
+@router.callback_query(CourseAdminCallback.filter(F.action == CourseAction.DELETE))
+async def delete_course_confirmation(callback: types.CallbackQuery, callback_data: CourseAdminCallback, state: FSMContext, i18n_language=None):
     """Ask for confirmation before deleting a course"""
-    course_id = int(callback.data.split("_")[-1])
+    course_id = callback_data.course_id
     await state.update_data(course_id=course_id)
     
     keyboard = [
         [
             types.InlineKeyboardButton(
                 text=get_text("buttons.confirm", i18n_language),
-                callback_data=f"confirm_delete_{course_id}"
+                callback_data=CourseAdminCallback(action=CourseAction.CONFIRM_DELETE, course_id=course_id).pack()
             ),
             types.InlineKeyboardButton(
                 text=get_text("buttons.cancel", i18n_language),
-                callback_data=f"manage_course_{course_id}"
+                callback_data=CourseAdminCallback(action=CourseAction.MANAGE, course_id=course_id).pack()
             )
         ]
     ]
@@ -704,10 +716,10 @@ async def delete_course_confirmation(callback: types.CallbackQuery, state: FSMCo
     )
     await state.set_state(CourseManagement.confirm_delete)
 
-@router.callback_query(CourseManagement.confirm_delete, F.data.startswith("confirm_delete_"))
-async def confirm_delete_course(callback: types.CallbackQuery, state: FSMContext, session: AsyncSession, i18n_language=None):
+@router.callback_query(CourseManagement.confirm_delete, CourseAdminCallback.filter(F.action == CourseAction.CONFIRM_DELETE))
+async def confirm_delete_course(callback: types.CallbackQuery, callback_data: CourseAdminCallback, state: FSMContext, session: AsyncSession, i18n_language=None):
     """Handle course deletion confirmation"""
-    course_id = int(callback.data.split("_")[-1])
+    course_id = callback_data.course_id
     
     # Get course data for messages
     query = select(Course).filter(Course.id == course_id)
@@ -747,17 +759,17 @@ async def confirm_delete_course(callback: types.CallbackQuery, state: FSMContext
             reply_markup=types.InlineKeyboardMarkup(inline_keyboard=[[
                 types.InlineKeyboardButton(
                     text=get_text("buttons.back", i18n_language),
-                    callback_data=f"manage_course_{course_id}"
+                    callback_data=CourseAdminCallback(action=CourseAction.MANAGE, course_id=course_id).pack()
                 )
             ]])
         )
     
     await state.clear()
 
-@router.callback_query(F.data.startswith("change_difficulty_"))
-async def change_difficulty(callback: types.CallbackQuery, state: FSMContext, i18n_language=None):
+@router.callback_query(CourseAdminCallback.filter(F.action == CourseAction.CHANGE_DIFFICULTY))
+async def change_difficulty(callback: types.CallbackQuery, callback_data: CourseAdminCallback, state: FSMContext, i18n_language=None):
     """Show difficulty selection for changing course difficulty"""
-    course_id = int(callback.data.split("_")[-1])
+    course_id = callback_data.course_id
     await state.update_data(course_id=course_id)
     
     # Reset the state to waiting_for_course to ensure back button works after cancellation
@@ -775,14 +787,14 @@ async def change_difficulty(callback: types.CallbackQuery, state: FSMContext, i1
         keyboard.append([
             types.InlineKeyboardButton(
                 text=difficulty_texts[level],
-                callback_data=f"set_difficulty_{course_id}_{level.name}"
+                callback_data=SetDifficultyCallback(course_id=course_id, level=level).pack()
             )
         ])
     
     keyboard.append([
         types.InlineKeyboardButton(
             text=get_text("buttons.back", i18n_language),
-            callback_data=f"manage_course_{course_id}"
+            callback_data=CourseAdminCallback(action=CourseAction.MANAGE, course_id=course_id).pack()
         )
     ])
     
@@ -792,25 +804,19 @@ async def change_difficulty(callback: types.CallbackQuery, state: FSMContext, i1
     )
     await state.set_state(CourseManagement.waiting_for_new_difficulty)
 
-@router.callback_query(CourseManagement.waiting_for_new_difficulty, F.data.startswith("set_difficulty_"))
-async def set_difficulty(callback: types.CallbackQuery, state: FSMContext, session: AsyncSession, i18n_language=None):
+@router.callback_query(CourseManagement.waiting_for_new_difficulty, SetDifficultyCallback.filter())
+async def set_difficulty(callback: types.CallbackQuery, callback_data: SetDifficultyCallback, state: FSMContext, session: AsyncSession, i18n_language=None):
     """Update course difficulty"""
-    parts = callback.data.split("_")
-    course_id = int(parts[2])
-    difficulty = DifficultyLevel[parts[3]]
-    
-    # Get course before update for message
-    query = select(Course).filter(Course.id == course_id)
-    result = await session.execute(query)
-    course = result.scalar_one_or_none()
-    course_title = course.title if course else ""
+    course_id = callback_data.course_id
+    difficulty = callback_data.level
     
-    # Update the course
+    # Update the course (one round trip, also returns the old values)
     updated_course = await update_course(
         session,
         course_id,
         difficulty_level=difficulty
     )
+    course_title = updated_course.old["title"] if updated_course else ""
     
     # Reset the state to waiting_for_course to ensure back button works after update
     await state.set_state(CourseManagement.waiting_for_course)
@@ -825,7 +831,7 @@ async def set_difficulty(callback: types.CallbackQuery, state: FSMContext, sessi
             reply_markup=types.InlineKeyboardMarkup(inline_keyboard=[[
                 types.InlineKeyboardButton(
                     text=get_text("buttons.back", i18n_language),
-                    callback_data=f"manage_course_{course_id}"
+                    callback_data=CourseAdminCallback(action=CourseAction.MANAGE, course_id=course_id).pack()
                 )
             ]])
         )
@@ -835,15 +841,15 @@ async def set_difficulty(callback: types.CallbackQuery, state: FSMContext, sessi
             reply_markup=types.InlineKeyboardMarkup(inline_keyboard=[[
                 types.InlineKeyboardButton(
                     text=get_text("buttons.back", i18n_language),
-                    callback_data=f"manage_course_{course_id}"
+                    callback_data=CourseAdminCallback(action=CourseAction.MANAGE, course_id=course_id).pack()
                 )
             ]])
         )
 
-@router.callback_query(F.data.startswith("change_order_"))
-async def change_order(callback: types.CallbackQuery, state: FSMContext, i18n_language=None):
+@router.callback_query(CourseAdminCallback.filter(F.action == CourseAction.CHANGE_ORDER))
+async def change_order(callback: types.CallbackQuery, callback_data: CourseAdminCallback, state: FSMContext, i18n_language=None):
     """Prompt for a new order index"""
-    course_id = int(callback.data.split("_")[-1])
+    course_id = callback_data.course_id
     await state.update_data(course_id=course_id)
     
     await callback.message.edit_text(
@@ -851,7 +857,7 @@ async def change_order(callback: types.CallbackQuery, state: FSMContext, i18n_la
         reply_markup=types.InlineKeyboardMarkup(inline_keyboard=[[
             types.InlineKeyboardButton(
                 text=get_text("buttons.cancel", i18n_language),
-                callback_data=f"manage_course_{course_id}"
+                callback_data=CourseAdminCallback(action=CourseAction.MANAGE, course_id=course_id).pack()
             )
         ]])
     )
@@ -870,11 +876,11 @@ async def process_new_order(message: types.Message, state: FSMContext, session:
             reply_markup=types.InlineKeyboardMarkup(inline_keyboard=[[
                 types.InlineKeyboardButton(
                     text=get_text("buttons.try_again", i18n_language),
-                    callback_data=f"change_order_{course_id}"
+                    callback_data=CourseAdminCallback(action=CourseAction.CHANGE_ORDER, course_id=course_id).pack()
                 ),
                 types.InlineKeyboardButton(
                     text=get_text("buttons.back", i18n_language),
-                    callback_data=f"manage_course_{course_id}"
+                    callback_data=CourseAdminCallback(action=CourseAction.MANAGE, course_id=course_id).pack()
                 )
             ]])
         )
@@ -883,19 +889,14 @@ async def process_new_order(message: types.Message, state: FSMContext, session:
     data = await state.get_data()
     course_id = data.get("course_id")
     
-    # Get course before update for message
-    query = select(Course).filter(Course.id == course_id)
-    result = await session.execute(query)
-    course = result.scalar_one_or_none()
-    course_title = course.title if course else ""
-    old_order = course.order_index if course else 0
-    
-    # Update the course
+    # Update the course (one round trip, also returns the old values)
     updated_course = await update_course(
         session,
         course_id,
         order_index=order_index
     )
+    course_title = updated_course.old["title"] if updated_course else ""
+    old_order = updated_course.old["order_index"] if updated_course else 0
     
     if updated_course:
         await message.answer(
@@ -907,7 +908,7 @@ async def process_new_order(message: types.Message, state: FSMContext, session:
             reply_markup=types.InlineKeyboardMarkup(inline_keyboard=[[
                 types.InlineKeyboardButton(
                     text=get_text("buttons.back", i18n_language),
-                    callback_data=f"manage_course_{course_id}"
+                    callback_data=CourseAdminCallback(action=CourseAction.MANAGE, course_id=course_id).pack()
                 )
             ]])
         )
@@ -917,7 +918,7 @@ async def process_new_order(message: types.Message, state: FSMContext, session:
             reply_markup=types.InlineKeyboardMarkup(inline_keyboard=[[
                 types.InlineKeyboardButton(
                     text=get_text("buttons.back", i18n_language),
-                    callback_data=f"manage_course_{course_id}"
+                    callback_data=CourseAdminCallback(action=CourseAction.MANAGE, course_id=course_id).pack()
                 )
             ]])
         )
@@ -956,10 +957,10 @@ async def cancel_course_management(callback: types.CallbackQuery, state: FSMCont
         reply_markup=get_admin_main_keyboard(i18n_language)
     )
 
-@router.callback_query(F.data.startswith("edit_title_"))
-async def edit_title(callback: types.CallbackQuery, state: FSMContext, i18n_language=None):
+@router.callback_query(CourseAdminCallback.filter(F.action == CourseAction.EDIT_TITLE))
+async def edit_title(callback: types.CallbackQuery, callback_data: CourseAdminCallback, state: FSMContext, i18n_language=None):
     """Prompt for new course title"""
-    course_id = int(callback.data.split("_")[-1])
+    course_id = callback_data.course_id
     await state.update_data(course_id=course_id)
     
     await callback.message.edit_text(
@@ -967,7 +968,7 @@ async def edit_title(callback: types.CallbackQuery, state: FSMContext, i18n_lang
         reply_markup=types.InlineKeyboardMarkup(inline_keyboard=[[
             types.InlineKeyboardButton(
                 text=get_text("buttons.cancel", i18n_language),
-                callback_data=f"edit_course_{course_id}"
+                callback_data=CourseAdminCallback(action=CourseAction.EDIT, course_id=course_id).pack()
             )
         ]])
     )
@@ -984,11 +985,11 @@ async def process_new_title(message: types.Message, state: FSMContext, session:
             reply_markup=types.InlineKeyboardMarkup(inline_keyboard=[[
                 types.InlineKeyboardButton(
                     text=get_text("buttons.try_again", i18n_language),
-                    callback_data=f"edit_title_{course_id}"
+                    callback_data=CourseAdminCallback(action=CourseAction.EDIT_TITLE, course_id=course_id).pack()
                 ),
                 types.InlineKeyboardButton(
                     text=get_text("buttons.back", i18n_language),
-                    callback_data=f"edit_course_{course_id}"
+                    callback_data=CourseAdminCallback(action=CourseAction.EDIT, course_id=course_id).pack()
                 )
             ]])
         )
@@ -997,19 +998,15 @@ async def process_new_title(message: types.Message, state: FSMContext, session:
     data = await state.get_data()
     course_id = data.get("course_id")
     
-    # Get course before update for message
-    query = select(Course).filter(Course.id == course_id)
-    result = await session.execute(query)
-    course = result.scalar_one_or_none()
-    old_title = course.title if course else ""
     new_title = message.text.strip()
     
-    # Update the course title
+    # Update the course title (one round trip, also returns the old values)
     updated_course = await update_course(
         session,
         course_id,
         title=new_title
     )
+    old_title = updated_course.old["title"] if updated_course else ""
     
     if updated_course:
         await message.answer(
@@ -1020,7 +1017,7 @@ async def process_new_title(message: types.Message, state: FSMContext, session:
             reply_markup=types.InlineKeyboardMarkup(inline_keyboard=[[
                 types.InlineKeyboardButton(
                     text=get_text("buttons.back", i18n_language),
-                    callback_data=f"edit_course_{course_id}"
+                    callback_data=CourseAdminCallback(action=CourseAction.EDIT, course_id=course_id).pack()
                 )
             ]])
         )
@@ -1030,15 +1027,15 @@ async def process_new_title(message: types.Message, state: FSMContext, session:
             reply_markup=types.InlineKeyboardMarkup(inline_keyboard=[[
                 types.InlineKeyboardButton(
                     text=get_text("buttons.back", i18n_language),
-                    callback_data=f"edit_course_{course_id}"
+                    callback_data=CourseAdminCallback(action=CourseAction.EDIT, course_id=course_id).pack()
                 )
             ]])
         )
 
-@router.callback_query(F.data.startswith("edit_description_"))
-async def edit_description(callback: types.CallbackQuery, state: FSMContext, i18n_language=None):
+@router.callback_query(CourseAdminCallback.filter(F.action == CourseAction.EDIT_DESCRIPTION))
+async def edit_description(callback: types.CallbackQuery, callback_data: CourseAdminCallback, state: FSMContext, i18n_language=None):
     """Prompt for new course description"""
-    course_id = int(callback.data.split("_")[-1])
+    course_id = callback_data.course_id
     await state.update_data(course_id=course_id)
     
     await callback.message.edit_text(
@@ -1046,7 +1043,7 @@ async def edit_description(callback: types.CallbackQuery, state: FSMContext, i18
         reply_markup=types.InlineKeyboardMarkup(inline_keyboard=[[
             types.InlineKeyboardButton(
                 text=get_text("buttons.cancel", i18n_language),
-                callback_data=f"edit_course_{course_id}"
+                callback_data=CourseAdminCallback(action=CourseAction.EDIT, course_id=course_id).pack()
             )
         ]])
     )
@@ -1063,11 +1060,11 @@ async def process_new_description(message: types.Message, state: FSMContext, ses
             reply_markup=types.InlineKeyboardMarkup(inline_keyboard=[[
                 types.InlineKeyboardButton(
                     text=get_text("buttons.try_again", i18n_language),
-                    callback_data=f"edit_description_{course_id}"
+                    callback_data=CourseAdminCallback(action=CourseAction.EDIT_DESCRIPTION, course_id=course_id).pack()
                 ),
                 types.InlineKeyboardButton(
                     text=get_text("buttons.back", i18n_language),
-                    callback_data=f"edit_course_{course_id}"
+                    callback_data=CourseAdminCallback(action=CourseAction.EDIT, course_id=course_id).pack()
                 )
             ]])
         )
@@ -1076,18 +1073,13 @@ async def process_new_description(message: types.Message, state: FSMContext, ses
     data = await state.get_data()
     course_id = data.get("course_id")
     
-    # Get course before update for message
-    query = select(Course).filter(Course.id == course_id)
-    result = await session.execute(query)
-    course = result.scalar_one_or_none()
-    course_title = course.title if course else ""
-    
-    # Update the course description
+    # Update the course description (one round trip, also returns the old values)
     updated_course = await update_course(
         session,
         course_id,
         description=message.text.strip()
     )
+    course_title = updated_course.old["title"] if updated_course else ""
     
     if updated_course:
         await message.answer(
@@ -1095,7 +1087,7 @@ async def process_new_description(message: types.Message, state: FSMContext, ses
             reply_markup=types.InlineKeyboardMarkup(inline_keyboard=[[
                 types.InlineKeyboardButton(
                     text=get_text("buttons.back", i18n_language),
-                    callback_data=f"edit_course_{course_id}"
+                    callback_data=CourseAdminCallback(action=CourseAction.EDIT, course_id=course_id).pack()
                 )
             ]])
         )
@@ -1105,15 +1097,15 @@ async def process_new_description(message: types.Message, state: FSMContext, ses
             reply_markup=types.InlineKeyboardMarkup(inline_keyboard=[[
                 types.InlineKeyboardButton(
                     text=get_text("buttons.back", i18n_language),
-                    callback_data=f"edit_course_{course_id}"
+                    callback_data=CourseAdminCallback(action=CourseAction.EDIT, course_id=course_id).pack()
                 )
             ]])
         )
 
-@router.callback_query(F.data.startswith("edit_banner_"))
-async def edit_banner(callback: types.CallbackQuery, state: FSMContext, i18n_language=None):
+@router.callback_query(CourseAdminCallback.filter(F.action == CourseAction.EDIT_BANNER))
+async def edit_banner(callback: types.CallbackQuery, callback_data: CourseAdminCallback, state: FSMContext, i18n_language=None):
     """Prompt for new course banner"""
-    course_id = int(callback.data.split("_")[-1])
+    course_id = callback_data.course_id
     await state.update_data(course_id=course_id)
     
     await callback.message.edit_text(
@@ -1121,7 +1113,7 @@ async def edit_banner(callback: types.CallbackQuery, state: FSMContext, i18n_lan
         reply_markup=types.InlineKeyboardMarkup(inline_keyboard=[[
             types.InlineKeyboardButton(
                 text=get_text("buttons.cancel", i18n_language),
-                callback_data=f"edit_course_{course_id}"
+                callback_data=CourseAdminCallback(action=CourseAction.EDIT, course_id=course_id).pack()
             )
         ]])
     )
@@ -1133,18 +1125,13 @@ async def process_new_banner(message: types.Message, state: FSMContext, session:
     data = await state.get_data()
     course_id = data.get("course_id")
     
-    # Get course before update for message
-    query = select(Course).filter(Course.id == course_id)
-    result = await session.execute(query)
-    course = result.scalar_one_or_none()
-    course_title = course.title if course else ""
-    
-    # Update the course banner
+    # Update the course banner (one round trip, also returns the old values)
     updated_course = await update_course(
         session,
         course_id,
         banner_file_id=message.photo[-1].file_id
     )
+    course_title = updated_course.old["title"] if updated_course else ""
     
     if updated_course:
         await message.answer(
@@ -1152,7 +1139,7 @@ async def process_new_banner(message: types.Message, state: FSMContext, session:
             reply_markup=types.InlineKeyboardMarkup(inline_keyboard=[[
                 types.InlineKeyboardButton(
                     text=get_text("buttons.back", i18n_language),
-                    callback_data=f"edit_course_{course_id}"
+                    callback_data=CourseAdminCallback(action=CourseAction.EDIT, course_id=course_id).pack()
                 )
             ]])
         )
@@ -1162,7 +1149,7 @@ async def process_new_banner(message: types.Message, state: FSMContext, session:
             reply_markup=types.InlineKeyboardMarkup(inline_keyboard=[[
                 types.InlineKeyboardButton(
                     text=get_text("buttons.back", i18n_language),
-                    callback_data=f"edit_course_{course_id}"
+                    callback_data=CourseAdminCallback(action=CourseAction.EDIT, course_id=course_id).pack()
                 )
             ]])
         )
@@ -1178,19 +1165,19 @@ async def process_invalid_banner(message: types.Message, state: FSMContext, i18n
         reply_markup=types.InlineKeyboardMarkup(inline_keyboard=[[
             types.InlineKeyboardButton(
                 text=get_text("buttons.try_again", i18n_language),
-                callback_data=f"edit_banner_{course_id}"
+                callback_data=CourseAdminCallback(action=CourseAction.EDIT_BANNER, course_id=course_id).pack()
             ),
             types.InlineKeyboardButton(
                 text=get_text("buttons.back", i18n_language),
-                callback_data=f"edit_course_{course_id}"
+                callback_data=CourseAdminCallback(action=CourseAction.EDIT, course_id=course_id).pack()
             )
         ]])
     )
 
-@router.callback_query(F.data.startswith("edit_video_"))
-async def edit_video(callback: types.CallbackQuery, state: FSMContext, i18n_language=None):
+@router.callback_query(CourseAdminCallback.filter(F.action == CourseAction.EDIT_VIDEO))
+async def edit_video(callback: types.CallbackQuery, callback_data: CourseAdminCallback, state: FSMContext, i18n_language=None):
     """Prompt for new course video"""
-    course_id = int(callback.data.split("_")[-1])
+    course_id = callback_data.course_id
     await state.update_data(course_id=course_id)
     
     await callback.message.edit_text(
@@ -1198,7 +1185,7 @@ async def edit_video(callback: types.CallbackQuery, state: FSMContext, i18n_lang
         reply_markup=types.InlineKeyboardMarkup(inline_keyboard=[[
             types.InlineKeyboardButton(
                 text=get_text("buttons.cancel", i18n_language),
-                callback_data=f"edit_course_{course_id}"
+                callback_data=CourseAdminCallback(action=CourseAction.EDIT, course_id=course_id).pack()
             )
         ]])
     )
@@ -1210,18 +1197,13 @@ async def process_new_video(message: types.Message, state: FSMContext, session:
     data = await state.get_data()
     course_id = data.get("course_id")
     
-    # Get course before update for message
-    query = select(Course).filter(Course.id == course_id)
-    result = await session.execute(query)
-    course = result.scalar_one_or_none()
-    course_title = course.title if course else ""
-    
-    # Update the course video
+    # Update the course video (one round trip, also returns the old values)
     updated_course = await update_course(
         session,
         course_id,
         video_file_id=message.video.file_id
     )
+    course_title = updated_course.old["title"] if updated_course else ""
     
     if updated_course:
         await message.answer(
@@ -1229,7 +1211,7 @@ async def process_new_video(message: types.Message, state: FSMContext, session:
             reply_markup=types.InlineKeyboardMarkup(inline_keyboard=[[
                 types.InlineKeyboardButton(
                     text=get_text("buttons.back", i18n_language),
-                    callback_data=f"edit_course_{course_id}"
+                    callback_data=CourseAdminCallback(action=CourseAction.EDIT, course_id=course_id).pack()
                 )
             ]])
         )
@@ -1239,7 +1221,7 @@ async def process_new_video(message: types.Message, state: FSMContext, session:
             reply_markup=types.InlineKeyboardMarkup(inline_keyboard=[[
                 types.InlineKeyboardButton(
                     text=get_text("buttons.back", i18n_language),
-                    callback_data=f"edit_course_{course_id}"
+                    callback_data=CourseAdminCallback(action=CourseAction.EDIT, course_id=course_id).pack()
                 )
             ]])
         )
@@ -1255,19 +1237,19 @@ async def process_invalid_video(message: types.Message, state: FSMContext, i18n_
         reply_markup=types.InlineKeyboardMarkup(inline_keyboard=[[
             types.InlineKeyboardButton(
                 text=get_text("buttons.try_again", i18n_language),
-                callback_data=f"edit_video_{course_id}"
+                callback_data=CourseAdminCallback(action=CourseAction.EDIT_VIDEO, course_id=course_id).pack()
             ),
             types.InlineKeyboardButton(
                 text=get_text("buttons.back", i18n_language),
-                callback_data=f"edit_course_{course_id}"
+                callback_data=CourseAdminCallback(action=CourseAction.EDIT, course_id=course_id).pack()
             )
         ]])
     )
 
-@router.callback_query(F.data.startswith("edit_voice_"))
-async def edit_voice(callback: types.CallbackQuery, state: FSMContext, i18n_language=None):
+@router.callback_query(CourseAdminCallback.filter(F.action == CourseAction.EDIT_VOICE))
+async def edit_voice(callback: types.CallbackQuery, callback_data: CourseAdminCallback, state: FSMContext, i18n_language=None):
     """Prompt for new course voice"""
-    course_id = int(callback.data.split("_")[-1])
+    course_id = callback_data.course_id
     await state.update_data(course_id=course_id)
     
     await callback.message.edit_text(
@@ -1275,7 +1257,7 @@ async def edit_voice(callback: types.CallbackQuery, state: FSMContext, i18n_lang
         reply_markup=types.InlineKeyboardMarkup(inline_keyboard=[[
             types.InlineKeyboardButton(
                 text=get_text("buttons.cancel", i18n_language),
-                callback_data=f"edit_course_{course_id}"
+                callback_data=CourseAdminCallback(action=CourseAction.EDIT, course_id=course_id).pack()
             )
         ]])
     )
@@ -1287,18 +1269,13 @@ async def process_new_voice(message: types.Message, state: FSMContext, session:
     data = await state.get_data()
     course_id = data.get("course_id")
     
-    # Get course before update for message
-    query = select(Course).filter(Course.id == course_id)
-    result = await session.execute(query)
-    course = result.scalar_one_or_none()
-    course_title = course.title if course else ""
-    
-    # Update the course voice
+    # Update the course voice (one round trip, also returns the old values)
     updated_course = await update_course(
         session,
         course_id,
         voice_file_id=message.voice.file_id
     )
+    course_title = updated_course.old["title"] if updated_course else ""
     
     if updated_course:
         await message.answer(
@@ -1306,7 +1283,7 @@ async def process_new_voice(message: types.Message, state: FSMContext, session:
             reply_markup=types.InlineKeyboardMarkup(inline_keyboard=[[
                 types.InlineKeyboardButton(
                     text=get_text("buttons.back", i18n_language),
-                    callback_data=f"edit_course_{course_id}"
+                    callback_data=CourseAdminCallback(action=CourseAction.EDIT, course_id=course_id).pack()
                 )
             ]])
         )
@@ -1316,7 +1293,7 @@ async def process_new_voice(message: types.Message, state: FSMContext, session:
             reply_markup=types.InlineKeyboardMarkup(inline_keyboard=[[
                 types.InlineKeyboardButton(
                     text=get_text("buttons.back", i18n_language),
-                    callback_data=f"edit_course_{course_id}"
+                    callback_data=CourseAdminCallback(action=CourseAction.EDIT, course_id=course_id).pack()
                 )
             ]])
         )
@@ -1332,19 +1309,19 @@ async def process_invalid_voice(message: types.Message, state: FSMContext, i18n_
         reply_markup=types.InlineKeyboardMarkup(inline_keyboard=[[
             types.InlineKeyboardButton(
                 text=get_text("buttons.try_again", i18n_language),
-                callback_data=f"edit_voice_{course_id}"
+                callback_data=CourseAdminCallback(action=CourseAction.EDIT_VOICE, course_id=course_id).pack()
             ),
             types.InlineKeyboardButton(
                 text=get_text("buttons.back", i18n_language),
-                callback_data=f"edit_course_{course_id}"
+                callback_data=CourseAdminCallback(action=CourseAction.EDIT, course_id=course_id).pack()
             )
         ]])
     )
 
-@router.callback_query(F.data.startswith("edit_text_"))
-async def edit_text(callback: types.CallbackQuery, state: FSMContext, i18n_language=None):
+@router.callback_query(CourseAdminCallback.filter(F.action == CourseAction.EDIT_TEXT))
+async def edit_text(callback: types.CallbackQuery, callback_data: CourseAdminCallback, state: FSMContext, i18n_language=None):
     """Prompt for new course text"""
-    course_id = int(callback.data.split("_")[-1])
+    course_id = callback_data.course_id
     await state.update_data(course_id=course_id)
     
     await callback.message.edit_text(
@@ -1352,7 +1329,7 @@ async def edit_text(callback: types.CallbackQuery, state: FSMContext, i18n_langu
         reply_markup=types.InlineKeyboardMarkup(inline_keyboard=[[
             types.InlineKeyboardButton(
                 text=get_text("buttons.cancel", i18n_language),
-                callback_data=f"edit_course_{course_id}"
+                callback_data=CourseAdminCallback(action=CourseAction.EDIT, course_id=course_id).pack()
             )
         ]])
     )
@@ -1369,11 +1346,11 @@ async def process_new_text(message: types.Message, state: FSMContext, session: A
             reply_markup=types.InlineKeyboardMarkup(inline_keyboard=[[
                 types.InlineKeyboardButton(
                     text=get_text("buttons.try_again", i18n_language),
-                    callback_data=f"edit_text_{course_id}"
+                    callback_data=CourseAdminCallback(action=CourseAction.EDIT_TEXT, course_id=course_id).pack()
                 ),
                 types.InlineKeyboardButton(
                     text=get_text("buttons.back", i18n_language),
-                    callback_data=f"edit_course_{course_id}"
+                    callback_data=CourseAdminCallback(action=CourseAction.EDIT, course_id=course_id).pack()
                 )
             ]])
         )
@@ -1382,18 +1359,13 @@ async def process_new_text(message: types.Message, state: FSMContext, session: A
     data = await state.get_data()
     course_id = data.get("course_id")
     
-    # Get course before update for message
-    query = select(Course).filter(Course.id == course_id)
-    result = await session.execute(query)
-    course = result.scalar_one_or_none()
-    course_title = course.title if course else ""
-    
-    # Update the course text
+    # Update the course text (one round trip, also returns the old values)
     updated_course = await update_course(
         session,
         course_id,
         text_explanation=message.text.strip()
     )
+    course_title = updated_course.old["title"] if updated_course else ""
     
     if updated_course:
         await message.answer(
@@ -1401,7 +1373,7 @@ async def process_new_text(message: types.Message, state: FSMContext, session: A
             reply_markup=types.InlineKeyboardMarkup(inline_keyboard=[[
                 types.InlineKeyboardButton(
                     text=get_text("buttons.back", i18n_language),
-                    callback_data=f"edit_course_{course_id}"
+                    callback_data=CourseAdminCallback(action=CourseAction.EDIT, course_id=course_id).pack()
                 )
             ]])
         )
@@ -1411,13 +1383,13 @@ async def process_new_text(message: types.Message, state: FSMContext, session: A
             reply_markup=types.InlineKeyboardMarkup(inline_keyboard=[[
                 types.InlineKeyboardButton(
                     text=get_text("buttons.back", i18n_language),
-                    callback_data=f"edit_course_{course_id}"
+                    callback_data=CourseAdminCallback(action=CourseAction.EDIT, course_id=course_id).pack()
                 )
             ]])
         )
 
 # Handler for editing course type
-@router.message(F.text.in_(get_all_translations_for_key("course_type.edit")))
+@router.message(ButtonFilter("course_type.edit"))
 async def edit_course_type_command(message: types.Message, session: AsyncSession, state: FSMContext, i18n_language=None):
     """Handle the edit course type command"""
     
@@ -1439,17 +1411,17 @@ async def edit_course_type_command(message: types.Message, session: AsyncSession
         keyboard.append([
             types.InlineKeyboardButton(
                 text=f"📚 {course_type.name}",
-                callback_data=f"select_course_type_{course_type.id}"
+                callback_data="noop"
             )
         ])
         keyboard.append([
             types.InlineKeyboardButton(
                 text=get_text("course_type.edit", i18n_language), # Use translation instead of hardcoded Russian text
-                callback_data=f"rename_course_type_{course_type.id}"
+                callback_data=CourseTypeAdminCallback(action=CourseTypeAction.RENAME, course_type_id=course_type.id).pack()
             ),
             types.InlineKeyboardButton(
                 text=get_text("course_type.delete", i18n_language), # Use translation instead of hardcoded Russian text
-                callback_data=f"delete_type_course_{course_type.id}" 
+                callback_data=CourseTypeAdminCallback(action=CourseTypeAction.DELETE, course_type_id=course_type.id).pack() 
             )
         ])
     
@@ -1466,10 +1438,10 @@ async def edit_course_type_command(message: types.Message, session: AsyncSession
     )
 
 # Handler for renaming course type
-@router.callback_query(F.data.startswith("rename_course_type_"))
-async def rename_course_type(callback: types.CallbackQuery, state: FSMContext, i18n_language=None):
+@router.callback_query(CourseTypeAdminCallback.filter(F.action == CourseTypeAction.RENAME))
+async def rename_course_type(callback: types.CallbackQuery, callback_data: CourseTypeAdminCallback, state: FSMContext, i18n_language=None):
     """Handle renaming of course type"""
-    course_type_id = int(callback.data.split("_")[-1])
+    course_type_id = callback_data.course_type_id
     
     await state.set_state("waiting_for_course_type_name")
     await state.update_data(course_type_id=course_type_id)
@@ -1498,7 +1470,7 @@ async def process_new_course_type_name(message: types.Message, session: AsyncSes
             reply_markup=types.InlineKeyboardMarkup(inline_keyboard=[[
                 types.InlineKeyboardButton(
                     text=get_text("buttons.try_again", i18n_language),
-                    callback_data=f"rename_course_type_{course_type_id}"
+                    callback_data=CourseTypeAdminCallback(action=CourseTypeAction.RENAME, course_type_id=course_type_id).pack()
                 )
             ]])
         )
@@ -1508,6 +1480,7 @@ async def process_new_course_type_name(message: types.Message, session: AsyncSes
     query = update(CourseType).where(CourseType.id == course_type_id).values(name=message.text.strip())
     await session.execute(query)
     await session.commit()
+    await reload_catalog(session)
     
     await state.clear()
     
@@ -1517,10 +1490,10 @@ async def process_new_course_type_name(message: types.Message, session: AsyncSes
     )
 
 # Handler for deleting course type
-@router.callback_query(F.data.startswith("delete_type_course_"))
-async def delete_course_type(callback: types.CallbackQuery, session: AsyncSession, state: FSMContext, i18n_language=None):
+@router.callback_query(CourseTypeAdminCallback.filter(F.action == CourseTypeAction.DELETE))
+async def delete_course_type(callback: types.CallbackQuery, callback_data: CourseTypeAdminCallback, session: AsyncSession, state: FSMContext, i18n_language=None):
     """Ask for confirmation before deleting a course type"""
-    course_type_id = int(callback.data.split("_")[-1])
+    course_type_id = callback_data.course_type_id
     await state.update_data(course_type_id=course_type_id)
     
     # Get course type to show name
@@ -1545,7 +1518,7 @@ async def delete_course_type(callback: types.CallbackQuery, session: AsyncSessio
         [
             types.InlineKeyboardButton(
                 text=get_text("buttons.confirm", i18n_language),
-                callback_data=f"confirm_delete_type_{course_type_id}"
+                callback_data=CourseTypeAdminCallback(action=CourseTypeAction.CONFIRM_DELETE, course_type_id=course_type_id).pack()
             ),
             types.InlineKeyboardButton(
                 text=get_text("buttons.cancel", i18n_language),
@@ -1568,10 +1541,10 @@ async def delete_course_type(callback: types.CallbackQuery, session: AsyncSessio
     await state.set_state("confirm_delete_type")
     await callback.answer()
 
-@router.callback_query(StateFilter("confirm_delete_type"), F.data.startswith("confirm_delete_type_"))
-async def confirm_delete_course_type(callback: types.CallbackQuery, session: AsyncSession, state: FSMContext, i18n_language=None):
+@router.callback_query(StateFilter("confirm_delete_type"), CourseTypeAdminCallback.filter(F.action == CourseTypeAction.CONFIRM_DELETE))
+async def confirm_delete_course_type(callback: types.CallbackQuery, callback_data: CourseTypeAdminCallback, session: AsyncSession, state: FSMContext, i18n_language=None):
     """Handle course type deletion after confirmation"""
-    course_type_id = int(callback.data.split("_")[-1])
+    course_type_id = callback_data.course_type_id
     
     # Get course type name before deletion
     query = select(CourseType).filter(CourseType.id == course_type_id)
@@ -1583,6 +1556,7 @@ async def confirm_delete_course_type(callback: types.CallbackQuery, session: Asy
         delete_query = delete(CourseType).where(CourseType.id == course_type_id)
         await session.execute(delete_query)  
         await session.commit()
+        await reload_catalog(session)
         
         await callback.message.edit_text(
             get_text("course_type.deleted", i18n_language).format(title=course_type.name),
@@ -6,13 +6,16 @@ from sqlalchemy.future import select
 
 from database.models.user import Students
 from database.crud.user import (
-    get_all_students,
-    get_paid_students,
-    get_unpaid_students,
-    update_payment_status
+    get_student_counts,
+    get_students_page,
+    update_payment_status,
+    StudentCounts,
+    STUDENT_CATEGORIES
 )
 from keyboards.admin import get_admin_main_keyboard
-from utils.i18n import get_text, get_all_translations_for_key
+from keyboards.callback_data import PaymentStatusCallback, StudentCallback, StudentListCallback
+from filters.button_filter import ButtonFilter
+from utils.i18n import get_text
 
 router = Router()
 
@@ -22,36 +25,25 @@ class StudentManagement(StatesGroup):
     entering_student_id = State()
 
 
-@router.message(F.text.in_(get_all_translations_for_key("student.management")))
-async def student_management_command(message: types.Message, session: AsyncSession, state: FSMContext, i18n_language=None):
-    """Handle the student management command"""
-    # Get counts for each student category
-    all_students = await get_all_students(session)
-    paid_students = await get_paid_students(session)
-    unpaid_students = await get_unpaid_students(session)
-    
-    all_count = len(all_students)
-    paid_count = len(paid_students)
-    unpaid_count = len(unpaid_students)
-    
-    # Create the student management keyboard
+def get_student_management_keyboard(counts: StudentCounts, i18n_language=None) -> types.InlineKeyboardMarkup:
+    """Create the student management keyboard with per-category counts"""
     keyboard = [
         [
             types.InlineKeyboardButton(
-                text=get_text("student.all_students", i18n_language).format(count=all_count),
-                callback_data="students_all"
+                text=get_text("student.all_students", i18n_language).format(count=counts.total),
+                callback_data=StudentListCallback(category="all").pack()
             )
         ],
         [
             types.InlineKeyboardButton(
-                text=get_text("student.paid_students", i18n_language).format(count=paid_count),
-                callback_data="students_paid"
+                text=get_text("student.paid_students", i18n_language).format(count=counts.paid),
+                callback_data=StudentListCallback(category="paid").pack()
             )
         ],
         [
             types.InlineKeyboardButton(
-                text=get_text("student.unpaid_students", i18n_language).format(count=unpaid_count),
-                callback_data="students_unpaid"
+                text=get_text("student.unpaid_students", i18n_language).format(count=counts.unpaid),
+                callback_data=StudentListCallback(category="unpaid").pack()
             )
         ],
         [
@@ -67,41 +59,59 @@ async def student_management_command(message: types.Message, session: AsyncSessi
             )
         ]
     ]
+    return types.InlineKeyboardMarkup(inline_keyboard=keyboard)
+
+
+@router.message(ButtonFilter("student.management"))
+async def student_management_command(message: types.Message, session: AsyncSession, state: FSMContext, i18n_language=None):
+    """Handle the student management command"""
+    # Get counts for each student category (one aggregate query, briefly cached)
+    counts = await get_student_counts(session)
     
     await message.answer(
         get_text("student.management", i18n_language),
-        reply_markup=types.InlineKeyboardMarkup(inline_keyboard=keyboard)
+        reply_markup=get_student_management_keyboard(counts, i18n_language)
     )
     await state.set_state(StudentManagement.viewing_students)
 
 
-@router.callback_query(StudentManagement.viewing_students, F.data.startswith("students_"))
-async def process_students_list(callback: types.CallbackQuery, session: AsyncSession, state: FSMContext, i18n_language=None):
+@router.callback_query(StudentManagement.viewing_students, StudentListCallback.filter())
+async def process_students_list(callback: types.CallbackQuery, callback_data: StudentListCallback, session: AsyncSession, state: FSMContext, i18n_language=None):
     """Process the students list selection"""
-    # Get page from callback data if it exists (format: students_type_page)
-    parts = callback.data.split("_")
-    students_type = parts[1]
-    page = int(parts[2]) if len(parts) > 2 else 1
+    students_type = callback_data.category
+    page = callback_data.page
     items_per_page = 10  # Number of students per page
     
-    # Get students based on selection
+    if students_type not in STUDENT_CATEGORIES:
+        await callback.answer(get_text("student.invalid_selection", i18n_language))
+        return
+    
+    # Totals come from the cached dashboard counters
+    counts = await get_student_counts(session)
     if students_type == "all":
-        students = await get_all_students(session)
-        title = get_text("student.all_students", i18n_language).format(count=len(students))
+        total = counts.total
+        title = get_text("student.all_students", i18n_language).format(count=total)
     elif students_type == "paid":
-        students = await get_paid_students(session)
-        title = get_text("student.paid_students", i18n_language).format(count=len(students))
-    elif students_type == "unpaid":
-        students = await get_unpaid_students(session)
-        title = get_text("student.unpaid_students", i18n_language).format(count=len(students))
+        total = counts.paid
+        title = get_text("student.paid_students", i18n_language).format(count=total)
     else:
-        await callback.answer(get_text("student.invalid_selection", i18n_language))
-        return
+        total = counts.unpaid
+        title = get_text("student.unpaid_students", i18n_language).format(count=total)
     
     # Save the type for future reference
     await state.update_data(students_type=students_type)
     
-    if not students:
+    # Fetch only the rows of the requested page
+    students_page = await get_students_page(
+        session,
+        students_type,
+        after_id=callback_data.after_id,
+        before_id=callback_data.before_id,
+        limit=items_per_page
+    )
+    current_page_students = students_page.students
+    
+    if not current_page_students:
         await callback.message.edit_text(
             get_text("student.no_students", i18n_language),
             reply_markup=types.InlineKeyboardMarkup(inline_keyboard=[[
@@ -114,10 +124,7 @@ async def process_students_list(callback: types.CallbackQuery, session: AsyncSes
         return
     
     # Calculate pagination
-    total_pages = (len(students) + items_per_page - 1) // items_per_page
-    start_idx = (page - 1) * items_per_page
-    end_idx = start_idx + items_per_page
-    current_page_students = students[start_idx:end_idx]
+    total_pages = max((total + items_per_page - 1) // items_per_page, page)
     
     # Create a keyboard with the students for current page
     keyboard = []
@@ -132,17 +139,17 @@ async def process_students_list(callback: types.CallbackQuery, session: AsyncSes
         keyboard.append([
             types.InlineKeyboardButton(
                 text=f"{status_emoji} {display_name} (@{student.username or get_text('student.no_username', i18n_language)})",
-                callback_data=f"view_student_{student.user_id}"
+                callback_data=StudentCallback(user_id=student.user_id).pack()
             )
         ])
     
     # Add pagination controls
     pagination_buttons = []
-    if page > 1:
+    if students_page.has_prev:
         pagination_buttons.append(
             types.InlineKeyboardButton(
                 text="◀️",
-                callback_data=f"students_{students_type}_{page-1}"
+                callback_data=StudentListCallback(category=students_type, page=page - 1, before_id=current_page_students[0].id).pack()
             )
         )
     
@@ -153,11 +160,11 @@ async def process_students_list(callback: types.CallbackQuery, session: AsyncSes
         )
     )
     
-    if page < total_pages:
+    if students_page.has_next:
         pagination_buttons.append(
             types.InlineKeyboardButton(
                 text="▶️",
-                callback_data=f"students_{students_type}_{page+1}"
+                callback_data=StudentListCallback(category=students_type, page=page + 1, after_id=current_page_students[-1].id).pack()
             )
         )
     
@@ -187,10 +194,10 @@ async def ignore_callback(callback: types.CallbackQuery):
     await callback.answer()
 
 
-@router.callback_query(StudentManagement.viewing_students, F.data.startswith("view_student_"))
-async def view_student(callback: types.CallbackQuery, session: AsyncSession, state: FSMContext, i18n_language=None):
+@router.callback_query(StudentManagement.viewing_students, StudentCallback.filter())
+async def view_student(callback: types.CallbackQuery, callback_data: StudentCallback, session: AsyncSession, state: FSMContext, i18n_language=None):
     """View a specific student's details"""
-    user_id = int(callback.data.split("_")[-1])
+    user_id = callback_data.user_id
     
     # Get the student
     result = await session.execute(select(Students).where(Students.user_id == user_id))
@@ -238,14 +245,14 @@ async def view_student(callback: types.CallbackQuery, session: AsyncSession, sta
         keyboard.append([
             types.InlineKeyboardButton(
                 text=get_text("student.change_to_unpaid", i18n_language),
-                callback_data=f"change_payment_{user_id}_false"
+                callback_data=PaymentStatusCallback(user_id=user_id, is_paid=False).pack()
             )
         ])
     else:
         keyboard.append([
             types.InlineKeyboardButton(
                 text=get_text("student.change_to_paid", i18n_language),
-                callback_data=f"change_payment_{user_id}_true"
+                callback_data=PaymentStatusCallback(user_id=user_id, is_paid=True).pack()
             )
         ])
     
@@ -255,7 +262,7 @@ async def view_student(callback: types.CallbackQuery, session: AsyncSession, sta
     keyboard.append([
         types.InlineKeyboardButton(
             text=get_text("student.back_to_list", i18n_language),
-            callback_data=f"students_{students_type}"
+            callback_data=StudentListCallback(category=students_type).pack()
         )
     ])
     
@@ -267,12 +274,11 @@ async def view_student(callback: types.CallbackQuery, session: AsyncSession, sta
     await callback.answer()
 
 
-@router.callback_query(StudentManagement.viewing_student, F.data.startswith("change_payment_"))
-async def change_payment_status(callback: types.CallbackQuery, session: AsyncSession, state: FSMContext, i18n_language=None):
+@router.callback_query(StudentManagement.viewing_student, PaymentStatusCallback.filter())
+async def change_payment_status(callback: types.CallbackQuery, callback_data: PaymentStatusCallback, session: AsyncSession, state: FSMContext, i18n_language=None):
     """Change a student's payment status"""
-    parts = callback.data.split("_")
-    user_id = int(parts[2])
-    is_paid = parts[3] == "true"
+    user_id = callback_data.user_id
+    is_paid = callback_data.is_paid
     
     # Update the payment status
     student = await update_payment_status(session, user_id, is_paid)
@@ -298,60 +304,19 @@ async def change_payment_status(callback: types.CallbackQuery, session: AsyncSes
     )
     
     # Go back to viewing the student with updated info
-    callback.data = f"view_student_{user_id}"
-    await view_student(callback, session, state, i18n_language)
+    await view_student(callback, StudentCallback(user_id=user_id), session, state, i18n_language)
 
 
 @router.callback_query(F.data == "back_to_student_management")
 async def back_to_student_management(callback: types.CallbackQuery, session: AsyncSession, state: FSMContext, i18n_language=None):
     """Return to student management main menu"""
     
-    # Get counts for each student category
-    all_students = await get_all_students(session)
-    paid_students = await get_paid_students(session)
-    unpaid_students = await get_unpaid_students(session)
-    
-    all_count = len(all_students)
-    paid_count = len(paid_students)
-    unpaid_count = len(unpaid_students)
-    
-    # Create the student management keyboard
-    keyboard = [
-        [
-            types.InlineKeyboardButton(
-                text=get_text("student.all_students", i18n_language).format(count=all_count),
-                callback_data="students_all"
-            )
-        ],
-        [
-            types.InlineKeyboardButton(
-                text=get_text("student.paid_students", i18n_language).format(count=paid_count),
-                callback_data="students_paid"
-            )
-        ],
-        [
-            types.InlineKeyboardButton(
-                text=get_text("student.unpaid_students", i18n_language).format(count=unpaid_count),
-                callback_data="students_unpaid"
-            )
-        ],
-        [
-            types.InlineKeyboardButton(
-                text=get_text("student.enter_id", i18n_language),
-                callback_data="enter_student_id"
-            )
-        ],
-        [
-            types.InlineKeyboardButton(
-                text=get_text("buttons.back_to_menu", i18n_language),
-                callback_data="back_to_admin_menu"
-            )
-        ]
-    ]
+    # Get counts for each student category (one aggregate query, briefly cached)
+    counts = await get_student_counts(session)
     
     await callback.message.edit_text(
         get_text("student.management", i18n_language),
-        reply_markup=types.InlineKeyboardMarkup(inline_keyboard=keyboard)
+        reply_markup=get_student_management_keyboard(counts, i18n_language)
     )
     await state.set_state(StudentManagement.viewing_students)
     await callback.answer()
@@ -375,13 +340,13 @@ async def back_to_admin_menu_from_students(callback: types.CallbackQuery, state:
     await callback.answer()
 
 
-@router.callback_query(StudentManagement.viewing_student, F.data.startswith("students_"))
-async def back_to_students_list(callback: types.CallbackQuery, session: AsyncSession, state: FSMContext, i18n_language=None):
+@router.callback_query(StudentManagement.viewing_student, StudentListCallback.filter())
+async def back_to_students_list(callback: types.CallbackQuery, callback_data: StudentListCallback, session: AsyncSession, state: FSMContext, i18n_language=None):
     """Handle going back to the students list from student details"""
     # First set the state back to viewing_students
     await state.set_state(StudentManagement.viewing_students)
     # Then process the students list
-    await process_students_list(callback, session, state, i18n_language)
+    await process_students_list(callback, callback_data, session, state, i18n_language)
 
 
 @router.callback_query(F.data == "enter_student_id")
@@ -456,14 +421,14 @@ async def process_student_id(message: types.Message, session: AsyncSession, stat
             keyboard.append([
                 types.InlineKeyboardButton(
                     text=get_text("student.change_to_unpaid", i18n_language),
-                    callback_data=f"change_payment_{user_id}_false"
+                    callback_data=PaymentStatusCallback(user_id=user_id, is_paid=False).pack()
                 )
             ])
         else:
             keyboard.append([
                 types.InlineKeyboardButton(
                     text=get_text("student.change_to_paid", i18n_language),
-                    callback_data=f"change_payment_{user_id}_true"
+                    callback_data=PaymentStatusCallback(user_id=user_id, is_paid=True).pack()
                 )
             ])
         
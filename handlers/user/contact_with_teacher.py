@@ -1,11 +1,12 @@
-from aiogram import Router, F
+from aiogram import Router
 from aiogram.types import Message
 from keyboards.inline.contact_with_teacher import contact_with_teacher_button
-from utils.i18n import get_text, get_all_translations_for_key
+from filters.button_filter import ButtonFilter
+from utils.i18n import get_text
 
 router = Router()
 
-@router.message(F.text.in_(get_all_translations_for_key("buttons.contact_teacher")))
+@router.message(ButtonFilter("buttons.contact_teacher"))
 async def contact_handler(message: Message, i18n_language: str):
     # Here you would typically get teacher info from database
     teacher_available = True  # This should be determined by your business logic
@@ -1,31 +1,41 @@
+from typing import List, Sequence
 from logging_config import logger
 from aiogram import Router, F, types
+from aiogram.exceptions import TelegramBadRequest
 from aiogram.filters import Command
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 from aiogram.fsm.context import FSMContext
 
-from database.crud.courses import get_active_course_types, get_courses_by_type_and_difficulty
-from database.models.courses import DifficultyLevel, Course
-from database.crud.user import get_user
+from database.catalog import get_catalog
+from database.models.courses import DifficultyLevel
 from keyboards.user import (
     get_user_main_keyboard,
     get_course_type_keyboard,
     get_difficulty_selection_keyboard,
     get_course_list_keyboard,
-    get_course_content_keyboard
+    get_course_content_keyboard,
+    get_practice_gallery_keyboard
 )
-from utils.i18n import get_text, get_all_translations_for_key
+from keyboards.callback_data import (
+    BackToCoursesCallback,
+    ContentKind,
+    CourseCallback,
+    CourseContentCallback,
+    CourseTypeCallback,
+    DifficultyCallback,
+    PracticeAlbumCallback,
+    PracticeCallback
+)
+from middleware.user_context import UserContext
+from filters.button_filter import ButtonFilter
+from utils.i18n import get_text
 
 router = Router()
 
-@router.message(F.text.in_(get_all_translations_for_key("buttons.courses")))
-async def cmd_courses(message: types.Message, session: AsyncSession, i18n_language=None):
+@router.message(ButtonFilter("buttons.courses"))
+async def cmd_courses(message: types.Message, user_context: UserContext, i18n_language=None):
     """Show available course types"""
     # Check if user has paid
-    user = await get_user(session, message.from_user.id)
-    
-    if user and not user.is_paid:
+    if user_context.exists and not user_context.is_paid:
         # User hasn't paid, send payment required message
         await message.answer(
             get_text("errors.payment_required", i18n_language),
@@ -34,7 +44,7 @@ async def cmd_courses(message: types.Message, session: AsyncSession, i18n_langua
         )
         return
         
-    course_types = await get_active_course_types(session)
+    course_types = get_catalog().course_types
     
     if not course_types:
         await message.answer(
@@ -47,47 +57,33 @@ async def cmd_courses(message: types.Message, session: AsyncSession, i18n_langua
     keyboard = get_course_type_keyboard(course_types, i18n_language)
     await message.answer(get_text("course_type.select", i18n_language), reply_markup=keyboard, protect_content=True)
 
-@router.callback_query(F.data.startswith("view_course_type_"))
-async def process_course_type_selection(callback: types.CallbackQuery, session: AsyncSession, i18n_language=None):
+@router.callback_query(CourseTypeCallback.filter())
+async def process_course_type_selection(callback: types.CallbackQuery, callback_data: CourseTypeCallback, user_context: UserContext, i18n_language=None):
     """Process course type selection and show difficulty levels"""
     # Check if user has paid
-    user = await get_user(session, callback.from_user.id)
-    
-    if user and not user.is_paid:
+    if user_context.exists and not user_context.is_paid:
         # User hasn't paid, send payment required message
         await callback.message.edit_text(get_text("errors.payment_required", i18n_language), protect_content=True)
         return
         
-    course_type_id = int(callback.data.split("_")[-1])
-    
-    keyboard = get_difficulty_selection_keyboard(course_type_id, i18n_language)
+    keyboard = get_difficulty_selection_keyboard(callback_data.course_type_id, i18n_language)
     await callback.message.edit_text(get_text("course.select_difficulty", i18n_language), reply_markup=keyboard, protect_content=True)
 
-@router.callback_query(F.data.startswith("difficulty_"))
-async def show_courses(callback: types.CallbackQuery, session: AsyncSession, state: FSMContext, i18n_language=None):
+@router.callback_query(DifficultyCallback.filter())
+async def show_courses(callback: types.CallbackQuery, callback_data: DifficultyCallback, user_context: UserContext, state: FSMContext, i18n_language=None):
     """Show courses for selected type and difficulty"""
     # Check if user has paid
-    user = await get_user(session, callback.from_user.id)
-    
-    if user and not user.is_paid:
+    if user_context.exists and not user_context.is_paid:
         # User hasn't paid, send payment required message
         await callback.message.edit_text(get_text("errors.payment_required", i18n_language), protect_content=True)
         return
         
-    parts = callback.data.split("_")
-    if len(parts) < 3:
-        await callback.answer("Invalid selection")
-        return
-        
-    course_type_id = int(parts[1])
-    difficulty = parts[2]
+    course_type_id = callback_data.course_type_id
     
     # Store the current difficulty level in state for back navigation
-    await state.update_data(current_difficulty=difficulty)
+    await state.update_data(current_difficulty=callback_data.level.name if callback_data.level else "all")
     
-    difficulty_level = None if difficulty == "all" else DifficultyLevel[difficulty]
-    courses = await get_courses_by_type_and_difficulty(session, course_type_id, difficulty_level)
-    print(f"view_course_type_{course_type_id}")
+    courses = get_catalog().get_courses(course_type_id, callback_data.level)
     if not courses:
         await callback.message.edit_text(
             get_text("course.no_available", i18n_language),
@@ -95,7 +91,7 @@ async def show_courses(callback: types.CallbackQuery, session: AsyncSession, sta
                 inline_keyboard=[[
                     types.InlineKeyboardButton( 
                         text=get_text("buttons.back", i18n_language),
-                        callback_data=f"view_course_type_{course_type_id}"
+                        callback_data=CourseTypeCallback(course_type_id=course_type_id).pack()
                     )
                 ]]
             ),
@@ -106,22 +102,18 @@ async def show_courses(callback: types.CallbackQuery, session: AsyncSession, sta
     keyboard = get_course_list_keyboard(courses, i18n_language, course_type_id)
     await callback.message.edit_text(get_text("course.available", i18n_language), reply_markup=keyboard, protect_content=True)
 
-@router.callback_query(F.data.startswith("course_"))
-async def show_course_details(callback: types.CallbackQuery, session: AsyncSession, i18n_language=None):
+@router.callback_query(CourseCallback.filter())
+async def show_course_details(callback: types.CallbackQuery, callback_data: CourseCallback, user_context: UserContext, i18n_language=None):
     """Show detailed information about a course"""
     # Check if user has paid
-    user = await get_user(session, callback.from_user.id)
-    
-    if user and not user.is_paid:
+    if user_context.exists and not user_context.is_paid:
         # User hasn't paid, send payment required message
         await callback.message.edit_text(get_text("errors.payment_required", i18n_language), protect_content=True)
         return
         
-    course_id = int(callback.data.split("_")[-1])
+    course_id = callback_data.course_id
     
-    query = select(Course).filter(Course.id == course_id)
-    result = await session.execute(query)
-    course = result.scalar_one_or_none()
+    course = get_catalog().get_course(course_id)
     
     if not course:
         await callback.message.edit_text(get_text("course.not_found", i18n_language), protect_content=True)
@@ -146,22 +138,18 @@ async def show_course_details(callback: types.CallbackQuery, session: AsyncSessi
         )
 
 
-@router.callback_query(F.data.startswith("video_"))
-async def send_course_video(callback: types.CallbackQuery, session: AsyncSession, i18n_language=None):
+@router.callback_query(CourseContentCallback.filter(F.kind == ContentKind.VIDEO))
+async def send_course_video(callback: types.CallbackQuery, callback_data: CourseContentCallback, user_context: UserContext, i18n_language=None):
     """Send course video content"""
     # Check if user has paid
-    user = await get_user(session, callback.from_user.id)
-    
-    if user and not user.is_paid:
+    if user_context.exists and not user_context.is_paid:
         # User hasn't paid, send payment required message
         await callback.answer(get_text("errors.payment_required", i18n_language))
         return
         
-    course_id = int(callback.data.split("_")[-1])
+    course_id = callback_data.course_id
     
-    query = select(Course).filter(Course.id == course_id)
-    result = await session.execute(query)
-    course = result.scalar_one_or_none()
+    course = get_catalog().get_course(course_id)
     
     if course and course.video_file_id:
         await callback.message.answer_video(
@@ -169,22 +157,18 @@ async def send_course_video(callback: types.CallbackQuery, session: AsyncSession
             protect_content=True
         )
 
-@router.callback_query(F.data.startswith("voice_"))
-async def send_course_voice(callback: types.CallbackQuery, session: AsyncSession, i18n_language=None):
+@router.callback_query(CourseContentCallback.filter(F.kind == ContentKind.VOICE))
+async def send_course_voice(callback: types.CallbackQuery, callback_data: CourseContentCallback, user_context: UserContext, i18n_language=None):
     """Send course voice explanation"""
     # Check if user has paid
-    user = await get_user(session, callback.from_user.id)
-    
-    if user and not user.is_paid:
+    if user_context.exists and not user_context.is_paid:
         # User hasn't paid, send payment required message
         await callback.answer(get_text("errors.payment_required", i18n_language))
         return
         
-    course_id = int(callback.data.split("_")[-1])
+    course_id = callback_data.course_id
     
-    query = select(Course).filter(Course.id == course_id)
-    result = await session.execute(query)
-    course = result.scalar_one_or_none()
+    course = get_catalog().get_course(course_id)
     
     if course and course.voice_file_id:
         await callback.message.answer_voice(
@@ -192,22 +176,18 @@ async def send_course_voice(callback: types.CallbackQuery, session: AsyncSession
             protect_content=True
         )
 
-@router.callback_query(F.data.startswith("text_"))
-async def show_course_text(callback: types.CallbackQuery, session: AsyncSession, i18n_language=None):
+@router.callback_query(CourseContentCallback.filter(F.kind == ContentKind.TEXT))
+async def show_course_text(callback: types.CallbackQuery, callback_data: CourseContentCallback, user_context: UserContext, i18n_language=None):
     """Show course text explanation"""
     # Check if user has paid
-    user = await get_user(session, callback.from_user.id)
-    
-    if user and not user.is_paid:
+    if user_context.exists and not user_context.is_paid:
         # User hasn't paid, send payment required message
         await callback.answer(get_text("errors.payment_required", i18n_language))
         return
         
-    course_id = int(callback.data.split("_")[-1])
+    course_id = callback_data.course_id
     
-    query = select(Course).filter(Course.id == course_id)
-    result = await session.execute(query)
-    course = result.scalar_one_or_none()
+    course = get_catalog().get_course(course_id)
     
     if course and course.text_explanation:
         await callback.message.answer(
@@ -215,105 +195,125 @@ async def show_course_text(callback: types.CallbackQuery, session: AsyncSession,
             protect_content=True
         )
 
-@router.callback_query(F.data.startswith("practice_"))
-async def show_practice_image(callback: types.CallbackQuery, session: AsyncSession, i18n_language=None):
-    """Show practice images with navigation"""
+# Telegram media groups hold 2-10 items
+ALBUM_SIZE = 10
+
+def split_album(file_ids: Sequence[str], size: int = ALBUM_SIZE) -> List[Sequence[str]]:
+    """Split images into media groups of at most `size`, never leaving a single image on its own"""
+    chunks = [file_ids[i:i + size] for i in range(0, len(file_ids), size)]
+    if len(chunks) > 1 and len(chunks[-1]) == 1:
+        chunks[-1] = chunks[-2][-1:] + chunks[-1]
+        chunks[-2] = chunks[-2][:-1]
+    return chunks
+
+def practice_caption(index: int, total: int, i18n_language=None) -> str:
+    return f"{get_text('course.practice_image', i18n_language)} {index + 1}/{total}"
+
+@router.callback_query(PracticeCallback.filter(~F.edit))
+async def show_practice_image(callback: types.CallbackQuery, callback_data: PracticeCallback, user_context: UserContext, i18n_language=None):
+    """Open the practice image gallery in a new message"""
     # Check if user has paid
-    user = await get_user(session, callback.from_user.id)
-    
-    if user and not user.is_paid:
+    if user_context.exists and not user_context.is_paid:
         # User hasn't paid, send payment required message
         await callback.answer(get_text("errors.payment_required", i18n_language))
         return
         
-    parts = callback.data.split("_")
-    course_id = int(parts[1])
-    current_index = int(parts[2]) - 1  # Convert to 0-based index
+    course_id = callback_data.course_id
+    current_index = callback_data.index
+    
+    course = get_catalog().get_course(course_id)
+    
+    if not course or not course.practice_images:
+        await callback.answer(get_text("course.no_practice_images", i18n_language))
+        return
+    
+    # Ensure the index is valid
+    total_images = len(course.practice_images)
+    current_index = max(0, min(current_index, total_images - 1))
+    
+    await callback.message.answer_photo(
+        photo=course.practice_images[current_index],
+        caption=practice_caption(current_index, total_images, i18n_language),
+        reply_markup=get_practice_gallery_keyboard(course_id, current_index, total_images, i18n_language),
+        protect_content=True
+    )
+    await callback.answer()
+
+@router.callback_query(PracticeCallback.filter(F.edit))
+async def navigate_practice_images(callback: types.CallbackQuery, callback_data: PracticeCallback, user_context: UserContext, i18n_language=None):
+    """Show another practice image by editing the gallery message in place"""
+    # Check if user has paid
+    if user_context.exists and not user_context.is_paid:
+        # User hasn't paid, send payment required message
+        await callback.answer(get_text("errors.payment_required", i18n_language))
+        return
+    
+    course_id = callback_data.course_id
+    current_index = callback_data.index
     
-    query = select(Course).filter(Course.id == course_id)
-    result = await session.execute(query)
-    course = result.scalar_one_or_none()
+    course = get_catalog().get_course(course_id)
     
     if not course or not course.practice_images:
         await callback.answer(get_text("course.no_practice_images", i18n_language))
         return
     
+    # The course may have fewer images than when the gallery was opened
+    total_images = len(course.practice_images)
+    current_index = max(0, min(current_index, total_images - 1))
+    
+    # Replaces the photo, caption and keyboard; the message keeps its content protection
     try:
-        import json
-        practice_images = json.loads(course.practice_images)
-        
-        if not practice_images:
-            await callback.answer(get_text("course.no_practice_images", i18n_language))
-            return
-        
-        # Ensure the index is valid
-        total_images = len(practice_images)
-        current_index = max(0, min(current_index, total_images - 1))
-        
-        # Build navigation keyboard
-        keyboard = []
-        nav_row = []
-        
-        # Previous button (if not first image)
-        if current_index > 0:
-            nav_row.append(
-                types.InlineKeyboardButton(
-                    text="⬅️",
-                    callback_data=f"practice_{course_id}_{current_index}"
-                )
-            )
-        
-        # Image counter
-        nav_row.append(
-            types.InlineKeyboardButton(
-                text=f"📸 {current_index + 1}/{total_images}",
-                callback_data="noop"
-            )
+        await callback.message.edit_media(
+            media=types.InputMediaPhoto(
+                media=course.practice_images[current_index],
+                caption=practice_caption(current_index, total_images, i18n_language)
+            ),
+            reply_markup=get_practice_gallery_keyboard(course_id, current_index, total_images, i18n_language)
         )
-        
-        # Next button (if not last image)
-        if current_index < total_images - 1:
-            nav_row.append(
-                types.InlineKeyboardButton(
-                    text="➡️",
-                    callback_data=f"practice_{course_id}_{current_index + 2}"  # +2 because we need 1-based index in callback
-                )
-            )
-        
-        keyboard.append(nav_row)
-        
-        # Back button
-        keyboard.append([
-            types.InlineKeyboardButton(
-                text=get_text("course.back_to_content", i18n_language),
-                callback_data=f"course_{course_id}"
-            )
-        ])
-        
-        # Send or edit the image
-        image_file_id = practice_images[current_index]
-        caption = f"{get_text('course.practice_image', i18n_language)} {current_index + 1}/{total_images}"
-        
-        # If this is a fresh message, answer with new photo
-        await callback.message.answer_photo(
-            photo=image_file_id,
-            caption=caption,
-            reply_markup=types.InlineKeyboardMarkup(inline_keyboard=keyboard),
+    except TelegramBadRequest as e:
+        # A double tap, or the index was clamped to the image already shown
+        if "message is not modified" not in e.message:
+            raise
+    await callback.answer()
+
+@router.callback_query(PracticeAlbumCallback.filter())
+async def send_practice_album(callback: types.CallbackQuery, callback_data: PracticeAlbumCallback, user_context: UserContext, i18n_language=None):
+    """Send all practice images as albums"""
+    # Check if user has paid
+    if user_context.exists and not user_context.is_paid:
+        # User hasn't paid, send payment required message
+        await callback.answer(get_text("errors.payment_required", i18n_language))
+        return
+    
+    course_id = callback_data.course_id
+    
+    course = get_catalog().get_course(course_id)
+    
+    if not course or not course.practice_images:
+        await callback.answer(get_text("course.no_practice_images", i18n_language))
+        return
+    
+    await callback.answer()
+    
+    if len(course.practice_images) == 1:
+        await callback.message.answer_photo(photo=course.practice_images[0], protect_content=True)
+        return
+    
+    for chunk in split_album(course.practice_images):
+        await callback.message.answer_media_group(
+            media=[types.InputMediaPhoto(media=file_id) for file_id in chunk],
             protect_content=True
         )
         
-    except (json.JSONDecodeError, IndexError) as e:
-        await callback.answer(f"Error showing practice image: {str(e)}")
-        
 @router.callback_query(F.data == "noop")
 async def noop_callback(callback: types.CallbackQuery):
     """Handle no-operation callback"""
     await callback.answer()
 
 @router.callback_query(F.data == "back_to_types")
-async def back_to_types(callback: types.CallbackQuery, session: AsyncSession, i18n_language=None):
+async def back_to_types(callback: types.CallbackQuery, i18n_language=None):
     """Return to course type selection"""
-    course_types = await get_active_course_types(session)
+    course_types = get_catalog().course_types
     keyboard = get_course_type_keyboard(course_types, i18n_language)
     await callback.message.edit_text(get_text("course_type.select", i18n_language), reply_markup=keyboard, protect_content=True)
 
@@ -329,17 +329,17 @@ async def back_to_menu(callback: types.CallbackQuery, i18n_language=None):
         reply_markup=get_user_main_keyboard(i18n_language)
     )
 
-@router.callback_query(F.data.startswith("back_to_courses_"))
-async def back_to_courses(callback: types.CallbackQuery, session: AsyncSession, state: FSMContext, i18n_language=None):
+@router.callback_query(BackToCoursesCallback.filter())
+async def back_to_courses(callback: types.CallbackQuery, callback_data: BackToCoursesCallback, state: FSMContext, i18n_language=None):
     """Return to course list with previously selected difficulty level"""
-    course_type_id = int(callback.data.split("_")[-1])
+    course_type_id = callback_data.course_type_id
     
     # Get the stored difficulty level
     data = await state.get_data()
     difficulty = data.get("current_difficulty", "all")
     
     difficulty_level = None if difficulty == "all" else DifficultyLevel[difficulty]
-    courses = await get_courses_by_type_and_difficulty(session, course_type_id, difficulty_level)
+    courses = get_catalog().get_courses(course_type_id, difficulty_level)
     
     if not courses:
         await callback.message.answer(
@@ -3,13 +3,15 @@ from aiogram.types import Message, CallbackQuery
 from aiogram.filters import Command
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 from database.crud.user import update_user_language
-from utils.i18n import get_text, get_all_translations_for_key
+from filters.button_filter import ButtonFilter
+from utils.i18n import get_text
 from keyboards.default.user_keyboard import main_menu_keyboard
+from keyboards.callback_data import LanguageCallback
 
 router = Router()
 
 @router.message(Command("settings"))
-@router.message(F.text.in_(get_all_translations_for_key("buttons.settings")))
+@router.message(ButtonFilter("buttons.settings"))
 async def show_settings(message: Message, i18n_language: str):
     kb = InlineKeyboardBuilder()
     kb.button(text=get_text("user.language", i18n_language), callback_data="change_language")
@@ -23,8 +25,8 @@ async def show_settings(message: Message, i18n_language: str):
 @router.callback_query(F.data == "change_language")
 async def show_language_selection(callback: CallbackQuery, i18n_language: str):
     kb = InlineKeyboardBuilder()
-    kb.button(text="Русский", callback_data="lang_ru")
-    kb.button(text="O'zbek", callback_data="lang_uz")
+    kb.button(text="Русский", callback_data=LanguageCallback(language="ru"))
+    kb.button(text="O'zbek", callback_data=LanguageCallback(language="uz"))
     kb.adjust(2)
     
     await callback.message.edit_text(
@@ -33,9 +35,9 @@ async def show_language_selection(callback: CallbackQuery, i18n_language: str):
         protect_content=True
     )
 
-@router.callback_query(F.data.startswith("lang_"))
-async def change_language(callback: CallbackQuery, session, i18n_language: str):
-    new_language = callback.data.split("_")[1]
+@router.callback_query(LanguageCallback.filter())
+async def change_language(callback: CallbackQuery, callback_data: LanguageCallback, session, i18n_language: str):
+    new_language = callback_data.language
     await update_user_language(session, callback.from_user.id, new_language)
     
     # Send new main menu keyboard with updated language
@@ -1,8 +1,11 @@
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton, ReplyKeyboardMarkup, KeyboardButton
 from typing import List, Optional
 from database.models.courses import CourseType, DifficultyLevel
+from keyboards.cache import cached_keyboard
+from keyboards.callback_data import CourseAction, CourseAdminCallback, NewCourseDifficultyCallback, NewCourseTypeCallback
 from utils.i18n import get_text
 
+@cached_keyboard
 def get_admin_main_keyboard(language: Optional[str] = None) -> ReplyKeyboardMarkup:
     """Create main admin keyboard"""
     keyboard = [
@@ -17,7 +20,8 @@ def get_admin_main_keyboard(language: Optional[str] = None) -> ReplyKeyboardMark
             KeyboardButton(text=get_text("course_type.add", language)),
         ],
         [
-            KeyboardButton(text=get_text("admin.admin_management", language))
+            KeyboardButton(text=get_text("admin.admin_management", language)),
+            KeyboardButton(text=get_text("admin.broadcast", language))
         ],
         [
             KeyboardButton(text=get_text("buttons.settings", language))
@@ -32,7 +36,7 @@ def get_admin_course_keyboard(course_types: List[CourseType], language: Optional
         keyboard.append([
             InlineKeyboardButton(
                 text=f"📚 {course_type.name}",
-                callback_data=f"course_type_{course_type.id}"
+                callback_data=NewCourseTypeCallback(course_type_id=course_type.id).pack()
             )
         ])
     
@@ -45,6 +49,7 @@ def get_admin_course_keyboard(course_types: List[CourseType], language: Optional
     
     return InlineKeyboardMarkup(inline_keyboard=keyboard)
 
+@cached_keyboard
 def get_difficulty_keyboard(language: Optional[str] = None) -> InlineKeyboardMarkup:
     """Create keyboard for difficulty level selection"""
     keyboard = []
@@ -60,7 +65,7 @@ def get_difficulty_keyboard(language: Optional[str] = None) -> InlineKeyboardMar
         keyboard.append([
             InlineKeyboardButton(
                 text=difficulty_texts[level],
-                callback_data=f"difficulty_{level.name}"
+                callback_data=NewCourseDifficultyCallback(level=level).pack()
             )
         ])
     
@@ -73,27 +78,28 @@ def get_difficulty_keyboard(language: Optional[str] = None) -> InlineKeyboardMar
     
     return InlineKeyboardMarkup(inline_keyboard=keyboard)
 
+@cached_keyboard
 def get_course_management_keyboard(course_id: int, language: Optional[str] = None) -> InlineKeyboardMarkup:
     """Create keyboard for course management"""
     keyboard = [
         [
             InlineKeyboardButton(
                 text=get_text("admin.edit_course", language),
-                callback_data=f"edit_course_{course_id}"
+                callback_data=CourseAdminCallback(action=CourseAction.EDIT, course_id=course_id).pack()
             ),
             InlineKeyboardButton(
                 text=get_text("admin.delete_course", language),
-                callback_data=f"delete_course_{course_id}"
+                callback_data=CourseAdminCallback(action=CourseAction.DELETE, course_id=course_id).pack()
             )
         ],
         [
             InlineKeyboardButton(
                 text=get_text("course.change_difficulty", language),
-                callback_data=f"change_difficulty_{course_id}"
+                callback_data=CourseAdminCallback(action=CourseAction.CHANGE_DIFFICULTY, course_id=course_id).pack()
             ),
             InlineKeyboardButton(
                 text=get_text("course.change_order", language),
-                callback_data=f"change_order_{course_id}"
+                callback_data=CourseAdminCallback(action=CourseAction.CHANGE_ORDER, course_id=course_id).pack()
             )
         ],
         [
@@ -0,0 +1,53 @@
+"""Cache of built keyboard markups.
+
+Keyboards only depend on their arguments, the translations and the course
+catalog, so each one is built once per (builder, language, parameters) and
+reused. The cache is dropped when translations reload or the catalog
+version changes. Returned markups are shared: do not modify them.
+"""
+from functools import wraps
+from typing import Any, Callable, Optional, TypeVar
+
+from config import settings
+from database.cache import MISSING, TTLCache
+from database.catalog import get_catalog
+from utils.i18n import add_reload_listener
+
+KeyboardBuilder = TypeVar("KeyboardBuilder", bound=Callable[..., Any])
+
+# Entries never expire on their own, only on invalidation or LRU eviction
+keyboard_cache = TTLCache(maxsize=settings.KEYBOARD_CACHE_SIZE, ttl=float("inf"))
+# Catalog version the cached keyboards were built from
+_catalog_version: Optional[int] = None
+
+
+def clear_keyboard_cache() -> None:
+    keyboard_cache.clear()
+
+
+add_reload_listener(clear_keyboard_cache)
+
+
+def cached_keyboard(builder: KeyboardBuilder) -> KeyboardBuilder:
+    """Reuse the markup built by `builder` for the same arguments"""
+
+    @wraps(builder)
+    def wrapper(*args, **kwargs):
+        global _catalog_version
+        version = get_catalog().version
+        if version != _catalog_version:
+            keyboard_cache.clear()
+            _catalog_version = version
+
+        key = (builder, args, tuple(sorted(kwargs.items())))
+        try:
+            markup = keyboard_cache.get(key)
+        except TypeError:
+            # Unhashable arguments, e.g. a list of ORM rows
+            return builder(*args, **kwargs)
+        if markup is MISSING:
+            markup = builder(*args, **kwargs)
+            keyboard_cache.set(key, markup)
+        return markup
+
+    return wrapper
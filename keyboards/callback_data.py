@@ -0,0 +1,210 @@
+"""Callback data of the inline buttons.
+
+Every payload is "<tag>:<field>:<field>..." where the tag is short and unique,
+so it stays well under Telegram's 64-byte limit and no payload can be mistaken
+for another one. CallbackDataMiddleware decodes the payload once per update by
+looking the tag up in CALLBACKS; handlers filter with `SomeCallback.filter()`
+and receive the decoded object as `callback_data`.
+"""
+from enum import Enum
+from typing import Any, Dict, Optional, Type
+from aiogram.filters import Filter
+from aiogram.filters.callback_data import CallbackData
+from aiogram.types import CallbackQuery
+from magic_filter import MagicFilter
+
+from database.models.courses import DifficultyLevel
+from utils.i18n import LanguageCode
+
+# Callback classes by tag
+CALLBACKS: Dict[str, Type["Callback"]] = {}
+
+
+class Callback(CallbackData, prefix=""):
+    """Base class that registers each callback under its tag"""
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        if cls.__prefix__ in CALLBACKS:
+            raise ValueError(f"Callback tag {cls.__prefix__!r} is used by both {CALLBACKS[cls.__prefix__].__name__} and {cls.__name__}")
+        CALLBACKS[cls.__prefix__] = cls
+
+    @classmethod
+    def filter(cls, rule: Optional[MagicFilter] = None) -> "CallbackFilter":
+        return CallbackFilter(cls, rule)
+
+
+def decode_callback(data: Optional[str]) -> Optional[Callback]:
+    """Parse a payload, or return None if it is not a registered callback"""
+    if not data:
+        return None
+    callback_class = CALLBACKS.get(data.split(":", 1)[0])
+    if callback_class is None:
+        return None
+    try:
+        return callback_class.unpack(data)
+    except (TypeError, ValueError):
+        return None
+
+
+class CallbackFilter(Filter):
+    """Matches callback queries whose decoded payload is a `callback_class`"""
+
+    __slots__ = ("callback_class", "rule")
+
+    def __init__(self, callback_class: Type[Callback], rule: Optional[MagicFilter] = None):
+        self.callback_class = callback_class
+        self.rule = rule
+
+    async def __call__(self, query: CallbackQuery, callback_data: Optional[Callback] = None) -> bool | Dict[str, Any]:
+        if callback_data is None:
+            # Not decoded by CallbackDataMiddleware (e.g. a router used on its own)
+            callback_data = decode_callback(query.data)
+            if not isinstance(callback_data, self.callback_class):
+                return False
+            if self.rule is None or self.rule.resolve(callback_data):
+                return {"callback_data": callback_data}
+            return False
+
+        if not isinstance(callback_data, self.callback_class):
+            return False
+        return self.rule is None or bool(self.rule.resolve(callback_data))
+
+
+# User: course browsing
+
+class CourseTypeCallback(Callback, prefix="t"):
+    course_type_id: int
+
+
+class DifficultyCallback(Callback, prefix="d"):
+    course_type_id: int
+    level: Optional[DifficultyLevel] = None  # None = all levels
+
+
+class CourseCallback(Callback, prefix="c"):
+    course_id: int
+
+
+class BackToCoursesCallback(Callback, prefix="bc"):
+    course_type_id: int
+
+
+class ContentKind(str, Enum):
+    VIDEO = "v"
+    VOICE = "a"
+    TEXT = "t"
+
+
+class CourseContentCallback(Callback, prefix="cc"):
+    course_id: int
+    kind: ContentKind
+
+
+class PracticeCallback(Callback, prefix="p"):
+    course_id: int
+    index: int = 0  # 0-based
+    edit: bool = False  # Edit the gallery message instead of sending a new one
+
+
+class PracticeAlbumCallback(Callback, prefix="pa"):
+    course_id: int
+
+
+class LanguageCallback(Callback, prefix="l"):
+    language: LanguageCode
+
+
+# Admin: course creation
+
+class NewCourseTypeCallback(Callback, prefix="nt"):
+    course_type_id: int
+
+
+class NewCourseDifficultyCallback(Callback, prefix="nd"):
+    level: DifficultyLevel
+
+
+# Admin: course management
+
+class CourseTypeAction(str, Enum):
+    MANAGE = "m"
+    RENAME = "r"
+    DELETE = "d"
+    CONFIRM_DELETE = "x"
+
+
+class CourseTypeAdminCallback(Callback, prefix="at"):
+    action: CourseTypeAction
+    course_type_id: int
+
+
+class CourseListAdminCallback(Callback, prefix="al"):
+    course_type_id: int
+    level: Optional[DifficultyLevel] = None  # None = all levels
+
+
+class CourseAction(str, Enum):
+    MANAGE = "m"
+    EDIT = "e"
+    DELETE = "d"
+    CONFIRM_DELETE = "x"
+    CHANGE_DIFFICULTY = "cd"
+    CHANGE_ORDER = "co"
+    EDIT_TITLE = "et"
+    EDIT_DESCRIPTION = "ed"
+    EDIT_BANNER = "eb"
+    EDIT_VIDEO = "ev"
+    EDIT_VOICE = "ea"
+    EDIT_TEXT = "ex"
+
+
+class CourseAdminCallback(Callback, prefix="ac"):
+    action: CourseAction
+    course_id: int
+
+
+class SetDifficultyCallback(Callback, prefix="sd"):
+    course_id: int
+    level: DifficultyLevel
+
+
+# Admin: students
+
+class StudentListCallback(Callback, prefix="sl"):
+    category: str  # Key of STUDENT_CATEGORIES
+    page: int = 1
+    after_id: Optional[int] = None  # Keyset cursors, see get_students_page
+    before_id: Optional[int] = None
+
+
+class StudentCallback(Callback, prefix="s"):
+    user_id: int
+
+
+class PaymentStatusCallback(Callback, prefix="ps"):
+    user_id: int
+    is_paid: bool
+
+
+class RemoveAdminCallback(Callback, prefix="ra"):
+    user_id: int
+    confirmed: bool = False
+
+
+# Admin: broadcasts
+
+class BroadcastSegmentCallback(Callback, prefix="bs"):
+    category: str  # Key of STUDENT_CATEGORIES
+
+
+class BroadcastAction(str, Enum):
+    VIEW = "v"
+    PAUSE = "p"
+    RESUME = "r"
+    STOP = "s"
+
+
+class BroadcastCallback(Callback, prefix="b"):
+    action: BroadcastAction
+    broadcast_id: int
@@ -1,7 +1,9 @@
 from aiogram.types import ReplyKeyboardMarkup, KeyboardButton
+from keyboards.cache import cached_keyboard
 from utils.i18n import get_text, DEFAULT_LANGUAGE
 
 
+@cached_keyboard
 def main_menu_keyboard(language: str = DEFAULT_LANGUAGE) -> ReplyKeyboardMarkup:
     kb = [
         [
@@ -1,8 +1,21 @@
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton, ReplyKeyboardMarkup, KeyboardButton
-from typing import List, Optional
-from database.models.courses import CourseType, Course, DifficultyLevel
+from typing import Optional, Sequence
+from database.catalog import CourseSnapshot, CourseTypeSnapshot
+from database.models.courses import DifficultyLevel
+from keyboards.cache import cached_keyboard
+from keyboards.callback_data import (
+    BackToCoursesCallback,
+    ContentKind,
+    CourseCallback,
+    CourseContentCallback,
+    CourseTypeCallback,
+    DifficultyCallback,
+    PracticeAlbumCallback,
+    PracticeCallback
+)
 from utils.i18n import get_text
 
+@cached_keyboard
 def get_user_main_keyboard(language: Optional[str] = None) -> ReplyKeyboardMarkup:
     """Create main user keyboard"""
     keyboard = [
@@ -19,14 +32,15 @@ def get_user_main_keyboard(language: Optional[str] = None) -> ReplyKeyboardMarku
     ]
     return ReplyKeyboardMarkup(keyboard=keyboard, resize_keyboard=True)
 
-def get_course_type_keyboard(course_types: List[CourseType], language: Optional[str] = None) -> InlineKeyboardMarkup:
+@cached_keyboard
+def get_course_type_keyboard(course_types: Sequence[CourseTypeSnapshot], language: Optional[str] = None) -> InlineKeyboardMarkup:
     """Create keyboard for course type selection"""
     keyboard = []
     for course_type in course_types:
         keyboard.append([
             InlineKeyboardButton(
                 text=f"📚 {course_type.name}",
-                callback_data=f"view_course_type_{course_type.id}"
+                callback_data=CourseTypeCallback(course_type_id=course_type.id).pack()
             )
         ])
     
@@ -39,6 +53,7 @@ def get_course_type_keyboard(course_types: List[CourseType], language: Optional[
     
     return InlineKeyboardMarkup(inline_keyboard=keyboard)
 
+@cached_keyboard
 def get_difficulty_selection_keyboard(course_type_id: int, language: Optional[str] = None) -> InlineKeyboardMarkup:
     """Create keyboard for difficulty level selection"""
     keyboard = []
@@ -54,14 +69,14 @@ def get_difficulty_selection_keyboard(course_type_id: int, language: Optional[st
         keyboard.append([
             InlineKeyboardButton(
                 text=difficulty_texts[level],
-                callback_data=f"difficulty_{course_type_id}_{level.name}"
+                callback_data=DifficultyCallback(course_type_id=course_type_id, level=level).pack()
             )
         ])
     
     keyboard.append([
         InlineKeyboardButton(
             text=get_text("course.difficulty.all", language),
-            callback_data=f"difficulty_{course_type_id}_all"
+            callback_data=DifficultyCallback(course_type_id=course_type_id).pack()
         )
     ])
     
@@ -74,54 +89,106 @@ def get_difficulty_selection_keyboard(course_type_id: int, language: Optional[st
     
     return InlineKeyboardMarkup(inline_keyboard=keyboard)
 
-def get_course_list_keyboard(courses: List[Course], language: Optional[str] = None, course_type_id: Optional[int] = None) -> InlineKeyboardMarkup:
+@cached_keyboard
+def get_course_list_keyboard(courses: Sequence[CourseSnapshot], language: Optional[str] = None, course_type_id: Optional[int] = None) -> InlineKeyboardMarkup:
     """Create keyboard for course list"""
     keyboard = []
     for course in courses:
         keyboard.append([
             InlineKeyboardButton(
                 text=f"📚 {course.order_index}. {course.title}",
-                callback_data=f"course_{course.id}"
+                callback_data=CourseCallback(course_id=course.id).pack()
             )
         ])
 
     keyboard.append([
         InlineKeyboardButton(
             text=get_text("buttons.back", language),
-            callback_data=f"view_course_type_{course_type_id}"
+            callback_data=CourseTypeCallback(course_type_id=course_type_id).pack()
         )
     ])
     
     return InlineKeyboardMarkup(inline_keyboard=keyboard)
 
+@cached_keyboard
 def get_course_content_keyboard(course_id: int, course_type_id: int, language: Optional[str] = None) -> InlineKeyboardMarkup:
     """Create keyboard for course content"""
     keyboard = [
         [
             InlineKeyboardButton(
                 text=get_text("course.watch_video", language),
-                callback_data=f"video_{course_id}"
+                callback_data=CourseContentCallback(course_id=course_id, kind=ContentKind.VIDEO).pack()
             ),
             InlineKeyboardButton(
                 text=get_text("course.listen_voice", language),
-                callback_data=f"voice_{course_id}"
+                callback_data=CourseContentCallback(course_id=course_id, kind=ContentKind.VOICE).pack()
             )
         ],
         [
             InlineKeyboardButton(
                 text=get_text("course.text_content", language),
-                callback_data=f"text_{course_id}"
+                callback_data=CourseContentCallback(course_id=course_id, kind=ContentKind.TEXT).pack()
             ),
             InlineKeyboardButton(
                 text=get_text("course.practice_images", language),
-                callback_data=f"practice_{course_id}_1"  # Start with first image
+                callback_data=PracticeCallback(course_id=course_id).pack()  # Start with first image
             )
         ],
         [
             InlineKeyboardButton(
                 text=get_text("course.back_to_list", language),
-                callback_data=f"back_to_courses_{course_type_id}"
+                callback_data=BackToCoursesCallback(course_type_id=course_type_id).pack()
             )
         ]
     ]
-    return InlineKeyboardMarkup(inline_keyboard=keyboard) 
\ No newline at end of file
+    return InlineKeyboardMarkup(inline_keyboard=keyboard) 
+
+@cached_keyboard
+def get_practice_gallery_keyboard(course_id: int, index: int, total: int, language: Optional[str] = None) -> InlineKeyboardMarkup:
+    """Create navigation keyboard for the practice image gallery (index is 0-based)"""
+    nav_row = []
+    
+    # Previous button (if not first image)
+    if index > 0:
+        nav_row.append(
+            InlineKeyboardButton(
+                text="⬅️",
+                callback_data=PracticeCallback(course_id=course_id, index=index - 1, edit=True).pack()
+            )
+        )
+    
+    # Image counter
+    nav_row.append(
+        InlineKeyboardButton(
+            text=f"📸 {index + 1}/{total}",
+            callback_data="noop"
+        )
+    )
+    
+    # Next button (if not last image)
+    if index < total - 1:
+        nav_row.append(
+            InlineKeyboardButton(
+                text="➡️",
+                callback_data=PracticeCallback(course_id=course_id, index=index + 1, edit=True).pack()
+            )
+        )
+    
+    keyboard = [nav_row]
+    
+    # Send every image at once
+    if total > 1:
+        keyboard.append([
+            InlineKeyboardButton(
+                text=get_text("course.practice_album", language),
+                callback_data=PracticeAlbumCallback(course_id=course_id).pack()
+            )
+        ])
+    
+    keyboard.append([
+        InlineKeyboardButton(
+            text=get_text("course.back_to_content", language),
+            callback_data=CourseCallback(course_id=course_id).pack()
+        )
+    ])
+    return InlineKeyboardMarkup(inline_keyboard=keyboard)
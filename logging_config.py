@@ -1,43 +1,152 @@
+import atexit
+import copy
+import json
 import logging
-from rich.logging import RichHandler
-from rich.console import Console
-from rich.theme import Theme
-
-# Create custom theme for rich
-custom_theme = Theme({
-    "info": "bold cyan",
-    "warning": "bold yellow", 
-    "error": "bold red",
-    "critical": "bold white on red"
-})
-
-console = Console(theme=custom_theme)
-
-# Define log format - simplified and cleaner
-LOG_FORMAT = "%(message)s"  # Rich will handle the formatting
-
-# Set up logging with Rich
-logging.basicConfig(
-    level=logging.INFO,
-    format=LOG_FORMAT,
-    handlers=[
-        RichHandler(
-            console=console,
-            rich_tracebacks=True,
-            tracebacks_show_locals=True,
-            show_time=True,
-            show_path=False
-        )
-    ]
-)
+import logging.handlers
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from config import settings
+
+# Attributes every LogRecord has; anything else was passed in `extra=`
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, for log collectors"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        for name, value in vars(record).items():
+            if name not in _RECORD_ATTRS:
+                entry[name] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Enqueues records with their message merged but the traceback left for JsonFormatter"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The listener runs in this process, so exc_info can be passed as is
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps only a fraction of the INFO/DEBUG records of noisy loggers (and their children)"""
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self._resolved: Dict[str, Optional[float]] = {}
+
+    def _rate(self, name: str) -> Optional[float]:
+        if name not in self._resolved:
+            rate = None
+            parts = name.split(".")
+            for i in range(len(parts), 0, -1):
+                rate = self.rates.get(".".join(parts[:i]))
+                if rate is not None:
+                    break
+            self._resolved[name] = rate
+        return self._resolved[name]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate(record.name)
+        return rate is None or random.random() < rate
+
+
+def parse_sampling(value: str) -> Dict[str, float]:
+    """Parse "logger=rate,logger=rate", e.g. "sqlalchemy.engine=0.01,aiogram.event=0.1" """
+    rates = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        name, _, rate = item.partition("=")
+        rates[name.strip()] = float(rate)
+    return rates
+
+
+def _rich_handler() -> logging.Handler:
+    from rich.console import Console
+    from rich.logging import RichHandler
+    from rich.theme import Theme
+
+    # Create custom theme for rich
+    custom_theme = Theme({
+        "info": "bold cyan",
+        "warning": "bold yellow",
+        "error": "bold red",
+        "critical": "bold white on red"
+    })
+
+    return RichHandler(
+        console=Console(theme=custom_theme),
+        rich_tracebacks=True,
+        tracebacks_show_locals=True,
+        show_time=True,
+        show_path=False
+    )
+
+
+def setup_logging() -> Optional[logging.handlers.QueueListener]:
+    """
+    Configure the root logger from Settings.
+    "rich" writes pretty output synchronously (development); "json" only
+    enqueues records on the event loop and a background thread writes them.
+    """
+    root = logging.getLogger()
+    root.setLevel(settings.LOG_LEVEL)
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+
+    # SQL statements go through the same handlers (and sampling) instead of SQLAlchemy's own echo handler
+    if settings.DB_ECHO:
+        logging.getLogger("sqlalchemy.engine").setLevel(logging.INFO)
+
+    listener = None
+    if settings.LOG_MODE == "rich":
+        handler = _rich_handler()
+    else:
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(JsonFormatter())
+        log_queue = queue.SimpleQueue()
+        handler = _QueueHandler(log_queue)
+        listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+        listener.start()
+        # Flush what is still queued when the process exits
+        atexit.register(listener.stop)
+
+    rates = parse_sampling(settings.LOG_SAMPLING)
+    if rates:
+        handler.addFilter(SamplingFilter(rates))
+    root.addHandler(handler)
+    return listener
+
+
+log_listener = setup_logging()
 
 # Get logger
 logger = logging.getLogger("Bot")
-logger.info("[bold green]✓[/] Logging system initialized successfully!")
+logger.info(f"Logging initialized ({settings.LOG_MODE})")
 
 # Example log messages to show formatting:
 # logger.debug("Debug message")
-# logger.info("Info message") 
+# logger.info("Info message")
 # logger.warning("Warning message")
 # logger.error("Error message")
 # logger.critical("Critical message")
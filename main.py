@@ -1,42 +1,74 @@
 import asyncio
 import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional
 
 from aiogram import Bot, Dispatcher # type: ignore
 from aiogram.client.default import DefaultBotProperties # type: ignore
 from aiogram.enums import ParseMode # type: ignore
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application # type: ignore
+from aiohttp import web
 
 from config import settings
 from database import db
+from database.catalog import reload_catalog
+from database.fsm_storage import BufferedStorage, SQLAlchemyStorage, create_fsm_storage, expire_fsm_states
 from handlers.admin import admin_start
 from handlers.admin.courses import router as admin_courses_router
 from handlers.admin.students import router as admin_students_router
 from handlers.admin.admin_management import router as admin_management_router
+from handlers.admin.broadcast import router as admin_broadcast_router
 from handlers.user import authorization, get_courses, contact_with_teacher, about_us, settings as user_settings
 from handlers.user.courses import router as user_courses_router
+from middleware.button import ButtonMiddleware
+from middleware.callback_data import CallbackDataMiddleware
+from middleware.fsm_buffer import FSMBufferMiddleware
+from middleware.metrics import MetricsMiddleware
+from middleware.scheduler import UpdateSchedulerMiddleware
+from middleware.throttling import ThrottlingMiddleware, limiters_from_settings
+from middleware.user_context import UserContextMiddleware
 from middleware.i18n import I18nMiddleware
 from middleware.payment_check import PaymentCheckMiddleware
 from middleware.admin_check import AdminRequiredMiddleware
-from utils.i18n import load_translations
+from utils.i18n import watch_translations
+from utils.metrics import instrument_engine, register_cache, start_metrics_server
 from logging_config import logger
-from database.crud.user import get_admin_students
+from database.crud.user import get_admin_students, student_counts_cache, user_cache
+from keyboards.cache import keyboard_cache
+from utils.broadcast import broadcaster
 
 class DatabaseMiddleware:
     async def __call__(self, handler, event, data):
+        # AsyncSession checks out a pooled connection only on its first query
         async with db.async_session() as session:
             data["session"] = session
             return await handler(event, data)
 
-async def main() -> None:
-    logger.info('Starting bot...')
-    bot = Bot(token=settings.BOT_TOKEN, default=DefaultBotProperties(parse_mode=ParseMode.HTML))
-    dp = Dispatcher()
+def create_dispatcher() -> Dispatcher:
+    """Dispatcher with all middlewares and routers registered"""
+    # The FSM middleware is registered below, so the state is loaded only once it is the update's turn
+    dp = Dispatcher(storage=create_fsm_storage(), disable_fsm=True)
     
-    # Load translations
-    load_translations()
+    # Drop button floods before they queue up behind the user's running update
+    dp.update.outer_middleware(ThrottlingMiddleware(limiters_from_settings()))
+    # Each user's updates run one at a time in order; different users run in parallel
+    dp.update.outer_middleware(UpdateSchedulerMiddleware(settings.MAX_CONCURRENT_UPDATES))
+    # Read and write each FSM state at most once per update
+    if isinstance(dp.fsm.storage, BufferedStorage):
+        dp.update.outer_middleware(FSMBufferMiddleware(dp.fsm.storage))
+    dp.update.outer_middleware(dp.fsm)
     
-    # Register middlewares
+    # Decode button labels and callback payloads once, before the handler filters look at them
+    dp.message.outer_middleware(ButtonMiddleware())
+    dp.callback_query.outer_middleware(CallbackDataMiddleware())
+    
+    # Register middlewares; metrics first so they include opening and closing the session
+    dp.message.middleware(MetricsMiddleware("message"))
+    dp.callback_query.middleware(MetricsMiddleware("callback_query"))
     dp.message.middleware(DatabaseMiddleware())
     dp.callback_query.middleware(DatabaseMiddleware())
+    dp.message.middleware(UserContextMiddleware())
+    dp.callback_query.middleware(UserContextMiddleware())
     dp.message.middleware(I18nMiddleware())
     dp.callback_query.middleware(I18nMiddleware())
     dp.message.middleware(PaymentCheckMiddleware([]))  # Empty list since we check database directly
@@ -50,7 +82,8 @@ async def main() -> None:
         admin_start.router,
         admin_courses_router,
         admin_students_router,
-        admin_management_router
+        admin_management_router,
+        admin_broadcast_router
     ]
     
     for router in admin_routers:
@@ -64,10 +97,118 @@ async def main() -> None:
     dp.include_routers(contact_with_teacher.router)
     dp.include_routers(about_us.router)
     dp.include_routers(user_settings.router)
+    
+    return dp
 
+async def run_polling(bot: Bot, dp: Dispatcher, allowed_updates: Optional[List[str]] = None) -> None:
     await bot.delete_webhook(drop_pending_updates=True)
-    await dp.start_polling(bot)
+    await dp.start_polling(bot, allowed_updates=allowed_updates or dp.resolve_used_update_types())
 
+async def run_webhook(bot: Bot, dp: Dispatcher, allowed_updates: Optional[List[str]] = None) -> None:
+    """
+    Serve updates from Telegram on an aiohttp server, usually behind a reverse proxy.
+    `allowed_updates` defaults to the update types `dp` has handlers for.
+    """
+    if not settings.WEBHOOK_SECRET:
+        logger.warning("WEBHOOK_SECRET is not set, webhook requests will not be verified")
+    
+    app = web.Application()
+    # Rejects requests without the right X-Telegram-Bot-Api-Secret-Token header
+    SimpleRequestHandler(
+        dispatcher=dp,
+        bot=bot,
+        secret_token=settings.WEBHOOK_SECRET
+    ).register(app, path=settings.WEBHOOK_PATH)
+    setup_application(app, dp, bot=bot)
+    
+    # Without a public URL the server only takes updates POSTed to it directly (local testing)
+    if settings.WEBHOOK_BASE_URL:
+        await bot.set_webhook(
+            url=f"{settings.WEBHOOK_BASE_URL.rstrip('/')}{settings.WEBHOOK_PATH}",
+            secret_token=settings.WEBHOOK_SECRET,
+            allowed_updates=allowed_updates or dp.resolve_used_update_types(),
+            drop_pending_updates=True
+        )
+    
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, host=settings.WEBAPP_HOST, port=settings.WEBAPP_PORT)
+    await site.start()
+    logger.info(f"Webhook server listening on {settings.WEBAPP_HOST}:{settings.WEBAPP_PORT}{settings.WEBHOOK_PATH}")
+    
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+@asynccontextmanager
+async def bot_services(bot: Bot, dp: Dispatcher, metrics_port: int = settings.METRICS_PORT, primary: bool = True) -> AsyncIterator[None]:
+    """
+    Start what a process handling updates needs next to the dispatcher and stop it on exit.
+    Only the primary process sends broadcasts and deletes expired FSM states.
+    """
+    metrics_runner = None
+    if metrics_port:
+        instrument_engine(db.engine)
+        register_cache("users", user_cache)
+        register_cache("student_counts", student_counts_cache)
+        register_cache("keyboards", keyboard_cache)
+        if isinstance(dp.fsm.storage, BufferedStorage) and dp.fsm.storage.cache is not None:
+            register_cache("fsm_states", dp.fsm.storage.cache)
+        metrics_runner = await start_metrics_server(settings.METRICS_HOST, metrics_port)
+        logger.info(f"Metrics served on http://{settings.METRICS_HOST}:{metrics_port}/metrics")
+    
+    # Translations are loaded on import; pick up edits to the locale files while running
+    watcher = None
+    if settings.LOCALES_RELOAD_INTERVAL > 0:
+        watcher = asyncio.create_task(watch_translations(settings.LOCALES_RELOAD_INTERVAL))
+    
+    # Drop conversations abandoned for FSM_TTL seconds
+    fsm_cleaner = None
+    fsm_storage = dp.fsm.storage
+    if primary and isinstance(fsm_storage, BufferedStorage) and isinstance(fsm_storage.storage, SQLAlchemyStorage) and settings.FSM_TTL:
+        fsm_cleaner = asyncio.create_task(expire_fsm_states(fsm_storage.storage, settings.FSM_TTL, settings.FSM_CLEANUP_INTERVAL))
+    
+    # Build the in-memory course catalog served to students
+    async with db.async_session() as session:
+        catalog = await reload_catalog(session)
+    logger.info(f"Course catalog loaded: {len(catalog.course_types)} types, {len(catalog.courses)} courses")
+    
+    # This process sends every broadcast; continue those interrupted by the previous shutdown
+    if primary:
+        broadcaster.bot = bot
+        resumed = await broadcaster.resume_all()
+        if resumed:
+            logger.info(f"Resumed {resumed} broadcast(s)")
+    
+    try:
+        yield
+    finally:
+        if watcher:
+            watcher.cancel()
+        if fsm_cleaner:
+            fsm_cleaner.cancel()
+        if metrics_runner:
+            await metrics_runner.cleanup()
+        await broadcaster.shutdown()
+        logger.info(f"User cache stats: {user_cache.stats()}")
+
+async def main() -> None:
+    if settings.WORKERS > 1:
+        # Imported here, cluster imports this module
+        from cluster import run_cluster
+        await run_cluster(settings.WORKERS)
+        return
+    
+    logger.info('Starting bot...')
+    bot = Bot(token=settings.BOT_TOKEN, default=DefaultBotProperties(parse_mode=ParseMode.HTML))
+    dp = create_dispatcher()
+    
+    async with bot_services(bot, dp):
+        if settings.DELIVERY_MODE == "webhook":
+            await run_webhook(bot, dp)
+        else:
+            await run_polling(bot, dp)
 
 if __name__ == '__main__':
     logging.basicConfig(level=logging.INFO)
@@ -1,7 +1,6 @@
 from typing import Callable, Dict, Any, Awaitable
 from aiogram import BaseMiddleware
 from aiogram.types import Message, CallbackQuery
-from database.crud.user import get_user
 
 
 class AdminRequiredMiddleware(BaseMiddleware):
@@ -11,17 +10,11 @@ class AdminRequiredMiddleware(BaseMiddleware):
         event: Message | CallbackQuery,
         data: Dict[str, Any]
     ) -> Any:
-        # Get user ID based on event type
-        user_id = event.from_user.id if isinstance(event, Message) else event.from_user.id
-        
-        # Get session from data (provided by DatabaseMiddleware)
-        session = data["session"]
-        
-        # Get user from database
-        user = await get_user(session, user_id)
+        # Get user context (provided by UserContextMiddleware)
+        user_context = data["user_context"]
         
         # Check if user exists and is admin
-        if not user or not user.is_admin:
+        if not user_context.is_admin:
             if isinstance(event, Message):
                 await event.answer("⛔️ Эта команда доступна только для администраторов.")
             else:
@@ -0,0 +1,18 @@
+from typing import Any, Awaitable, Callable, Dict
+from aiogram import BaseMiddleware
+from aiogram.types import Message
+from utils.i18n import get_button_key
+
+
+class ButtonMiddleware(BaseMiddleware):
+    """Resolve the pressed reply button once per update and share its key as data["button"]"""
+
+    async def __call__(
+        self,
+        handler: Callable[[Message, Dict[str, Any]], Awaitable[Any]],
+        event: Message,
+        data: Dict[str, Any]
+    ) -> Any:
+        # Must run as an outer middleware so the handler filters can use it
+        data["button"] = get_button_key(event.text)
+        return await handler(event, data)
@@ -0,0 +1,18 @@
+from typing import Any, Awaitable, Callable, Dict
+from aiogram import BaseMiddleware
+from aiogram.types import CallbackQuery
+from keyboards.callback_data import decode_callback
+
+
+class CallbackDataMiddleware(BaseMiddleware):
+    """Decode the callback payload once per update and share it as data["callback_data"]"""
+
+    async def __call__(
+        self,
+        handler: Callable[[CallbackQuery, Dict[str, Any]], Awaitable[Any]],
+        event: CallbackQuery,
+        data: Dict[str, Any]
+    ) -> Any:
+        # Must run as an outer middleware so the handler filters can use it
+        data["callback_data"] = decode_callback(event.data)
+        return await handler(event, data)
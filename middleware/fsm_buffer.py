@@ -0,0 +1,23 @@
+from typing import Any, Awaitable, Callable, Dict
+from aiogram import BaseMiddleware
+from aiogram.types import Update
+from database.fsm_storage import BufferedStorage
+
+
+class FSMBufferMiddleware(BaseMiddleware):
+    """
+    Give every update its own FSM buffer, written to the storage once the update is handled.
+    Must be an outer dp.update middleware that runs before the FSM one, so the state it loads is buffered too.
+    """
+
+    def __init__(self, storage: BufferedStorage):
+        self.storage = storage
+
+    async def __call__(
+        self,
+        handler: Callable[[Update, Dict[str, Any]], Awaitable[Any]],
+        event: Update,
+        data: Dict[str, Any]
+    ) -> Any:
+        async with self.storage.buffer():
+            return await handler(event, data)
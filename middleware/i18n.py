@@ -1,7 +1,6 @@
 from typing import Any, Awaitable, Callable
 from aiogram import BaseMiddleware
 from aiogram.types import Message, CallbackQuery
-from database.crud.user import get_user
 from utils.i18n import DEFAULT_LANGUAGE
 
 class I18nMiddleware(BaseMiddleware):
@@ -11,15 +10,11 @@ class I18nMiddleware(BaseMiddleware):
         event: Message | CallbackQuery,
         data: dict[str, Any]
     ) -> Any:
-        # Get user from the database
-        user = None
-        if isinstance(event, Message):
-            user = await get_user(data["session"], event.from_user.id)
-        elif isinstance(event, CallbackQuery):
-            user = await get_user(data["session"], event.from_user.id)
+        # Language comes from the user context loaded by UserContextMiddleware
+        user_context = data.get("user_context")
 
         # Set language in data
-        data["i18n_language"] = user.language if user else DEFAULT_LANGUAGE
-        
+        data["i18n_language"] = user_context.language if user_context else DEFAULT_LANGUAGE
+
         # Call the handler
-        return await handler(event, data) 
\ No newline at end of file
+        return await handler(event, data)
@@ -0,0 +1,36 @@
+import time
+from typing import Any, Awaitable, Callable, Dict
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+from utils.metrics import QueryStats, handler_db_duration, handler_duration, handler_errors, handler_statements, query_stats
+
+
+class MetricsMiddleware(BaseMiddleware):
+    """Record latency, errors and SQL statements of every handled update, per handler"""
+
+    def __init__(self, event_type: str):
+        self.event_type = event_type
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        # Inner middleware: the matched handler is known. Routers are one per module, so the module names it
+        callback = data["handler"].callback
+        labels = (self.event_type, callback.__module__, callback.__qualname__)
+
+        stats = QueryStats()
+        token = query_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            return await handler(event, data)
+        except Exception:
+            handler_errors.inc(labels)
+            raise
+        finally:
+            handler_duration.observe(labels, time.perf_counter() - started)
+            query_stats.reset(token)
+            handler_statements.observe(labels, stats.statements)
+            handler_db_duration.observe(labels, stats.seconds)
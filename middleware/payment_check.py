@@ -1,11 +1,14 @@
 from typing import Any, Awaitable, Callable, Dict
 from aiogram import BaseMiddleware
 from aiogram.types import Message, CallbackQuery, TelegramObject
-from database.crud.user import get_user
-from utils.i18n import get_text
+from utils.i18n import get_button_key
 from filters.admin_filter import AdminFilter
 from config import settings
 
+# Allowed actions even if not paid
+ALLOWED_COMMANDS = frozenset({"/start", "/admin", "/help"})
+ALLOWED_BUTTONS = frozenset({"buttons.about_us", "buttons.contact_teacher", "buttons.settings", "settings.language"})
+
 class PaymentCheckMiddleware(BaseMiddleware):
     """Middleware to check if a user has paid before accessing certain functionalities"""
     
@@ -25,30 +28,25 @@ class PaymentCheckMiddleware(BaseMiddleware):
         if isinstance(event, CallbackQuery) and str(event.from_user.id) in self.admin_ids:
             return await handler(event, data)
         
-        # Check if the user has paid
-        user = await get_user(data["session"], event.from_user.id)
+        # Check if the user has paid (loaded once by UserContextMiddleware)
+        user_context = data["user_context"]
         
-        if not user:
+        if not user_context.exists:
             # User doesn't exist, let the handler deal with it
             return await handler(event, data)
         
-        # Allowed actions even if not paid
-        allowed_commands = ["/start", "/admin", "/help"]
-        allowed_buttons = ["buttons.about_us", "buttons.contact_teacher", "buttons.settings", "settings.language"]
-        
         if isinstance(event, Message):
             # Allow certain commands for all users
-            if event.text and event.text in allowed_commands:
+            if event.text in ALLOWED_COMMANDS:
                 return await handler(event, data)
             
-            # Check if text is in allowed buttons
-            for button in allowed_buttons:
-                translations = [get_text(button, "ru"), get_text(button, "uz")]
-                if event.text and event.text in translations:
-                    return await handler(event, data)
+            # Allow certain buttons (resolved by ButtonMiddleware)
+            button = data["button"] if "button" in data else get_button_key(event.text)
+            if button in ALLOWED_BUTTONS:
+                return await handler(event, data)
         
         # Block access if not paid
-        if not user.is_paid:
+        if not user_context.is_paid:
             i18n_language = data.get("i18n_language", "ru")
             
             if isinstance(event, Message):
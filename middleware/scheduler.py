@@ -0,0 +1,70 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+from aiogram import BaseMiddleware
+from aiogram.types import Update
+from utils.metrics import update_wait, updates_running, updates_waiting, users_active
+
+
+class _UserQueue:
+    __slots__ = ("lock", "pending")
+
+    def __init__(self):
+        self.lock = asyncio.Lock()  # Wakes waiters in arrival order
+        self.pending = 0
+
+
+class UpdateSchedulerMiddleware(BaseMiddleware):
+    """
+    Run the updates of one user one at a time, in arrival order, while
+    different users run in parallel, at most `max_concurrency` at once.
+    Must be an outer middleware on dp.update so it wraps the whole processing.
+    """
+
+    def __init__(self, max_concurrency: int):
+        self.slots = asyncio.Semaphore(max_concurrency)
+        self.queues: Dict[int, _UserQueue] = {}
+
+    async def __call__(
+        self,
+        handler: Callable[[Update, Dict[str, Any]], Awaitable[Any]],
+        event: Update,
+        data: Dict[str, Any]
+    ) -> Any:
+        # Set by aiogram's own outer middleware, which runs before this one
+        user = data.get("event_from_user")
+        chat = data.get("event_chat")
+        key: Optional[int] = user.id if user else chat.id if chat else None
+
+        queued_at = time.perf_counter()
+        updates_waiting.inc()
+        if key is None:
+            async with self.slots:
+                updates_waiting.dec()
+                return await self._run(handler, event, data, queued_at)
+
+        queue = self.queues.get(key)
+        if queue is None:
+            queue = self.queues[key] = _UserQueue()
+            users_active.inc()
+        queue.pending += 1
+        try:
+            # Take the user's turn first, so a user's backlog does not hold global slots
+            async with queue.lock:
+                async with self.slots:
+                    updates_waiting.dec()
+                    return await self._run(handler, event, data, queued_at)
+        finally:
+            queue.pending -= 1
+            if not queue.pending:
+                del self.queues[key]
+                users_active.dec()
+
+    @staticmethod
+    async def _run(handler, event, data, queued_at: float) -> Any:
+        update_wait.observe((), time.perf_counter() - queued_at)
+        updates_running.inc()
+        try:
+            return await handler(event, data)
+        finally:
+            updates_running.dec()
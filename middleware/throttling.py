@@ -0,0 +1,76 @@
+from typing import Any, Awaitable, Callable, Dict, Optional
+from aiogram import BaseMiddleware
+from aiogram.exceptions import TelegramAPIError
+from aiogram.types import Update
+from config import settings
+from database.cache import MISSING
+from database.crud.user import user_cache
+from keyboards.callback_data import CourseContentCallback, PracticeAlbumCallback, PracticeCallback
+from logging_config import logger
+from utils.i18n import DEFAULT_LANGUAGE, LANGUAGES, get_text
+from utils.metrics import updates_throttled
+from utils.rate_limit import RateLimiter
+
+MEDIA = "media"
+NAVIGATION = "navigation"
+
+# Callback tags whose handlers send lesson media; everything else counts as navigation
+MEDIA_TAGS = frozenset({CourseContentCallback.__prefix__, PracticeCallback.__prefix__, PracticeAlbumCallback.__prefix__})
+
+
+def action_of(data: Optional[str]) -> str:
+    """Limit class of a callback payload, judged by its tag (and for the practice gallery, its edit flag)"""
+    tag = data.split(":", 1)[0] if data else ""
+    if tag == PracticeCallback.__prefix__:
+        # Paging through an open gallery edits its one photo in place, which is navigation
+        try:
+            return NAVIGATION if PracticeCallback.unpack(data).edit else MEDIA
+        except (TypeError, ValueError):
+            return MEDIA
+    return MEDIA if tag in MEDIA_TAGS else NAVIGATION
+
+
+def limiters_from_settings() -> Dict[str, RateLimiter]:
+    limits = {
+        MEDIA: (settings.THROTTLE_MEDIA_RATE, settings.THROTTLE_MEDIA_BURST),
+        NAVIGATION: (settings.THROTTLE_NAVIGATION_RATE, settings.THROTTLE_NAVIGATION_BURST)
+    }
+    return {action: RateLimiter(rate, burst) for action, (rate, burst) in limits.items() if rate > 0}
+
+
+class ThrottlingMiddleware(BaseMiddleware):
+    """
+    Answer callback queries over the user's limit with a short notice and drop them.
+    Registered on dp.update before the scheduler, so a rejected press neither waits
+    behind the user's running update nor touches the database.
+    """
+
+    def __init__(self, limiters: Dict[str, RateLimiter]):
+        self.limiters = limiters
+
+    async def __call__(
+        self,
+        handler: Callable[[Update, Dict[str, Any]], Awaitable[Any]],
+        event: Update,
+        data: Dict[str, Any]
+    ) -> Any:
+        query = event.callback_query
+        if query is None:
+            return await handler(event, data)
+
+        action = action_of(query.data)
+        limiter = self.limiters.get(action)
+        if limiter is None or limiter.try_acquire(query.from_user.id):
+            return await handler(event, data)
+
+        updates_throttled.inc((action,))
+        # Language from the profile cache if it is there (peek: not counted as a lookup), else from the Telegram client
+        profile = user_cache.peek(query.from_user.id)
+        if profile is not MISSING and profile is not None:
+            language = profile.language
+        else:
+            language = query.from_user.language_code if query.from_user.language_code in LANGUAGES else DEFAULT_LANGUAGE
+        try:
+            await query.answer(get_text("errors.too_many_requests", language))
+        except TelegramAPIError as e:
+            logger.debug(f"Could not answer throttled callback of {query.from_user.id}: {e}")
@@ -0,0 +1,47 @@
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+from aiogram import BaseMiddleware
+from aiogram.types import Message, CallbackQuery
+from database.crud.user import StudentProfile, get_user_profile
+from utils.i18n import DEFAULT_LANGUAGE
+
+
+@dataclass(frozen=True, slots=True)
+class UserContext:
+    """Snapshot of the student who sent the current update"""
+    user_id: int
+    exists: bool = False
+    language: str = DEFAULT_LANGUAGE
+    is_paid: bool = False
+    is_admin: bool = False
+    is_blocked: bool = False
+
+    @classmethod
+    def from_profile(cls, user_id: int, profile: Optional[StudentProfile]) -> "UserContext":
+        if profile is None:
+            return cls(user_id=user_id)
+        return cls(
+            user_id=user_id,
+            exists=True,
+            language=profile.language or DEFAULT_LANGUAGE,
+            is_paid=profile.is_paid,
+            is_admin=profile.is_admin,
+            is_blocked=profile.is_blocked
+        )
+
+
+class UserContextMiddleware(BaseMiddleware):
+    """Load the student once per update and share it as data["user_context"]"""
+
+    async def __call__(
+        self,
+        handler: Callable[[Message, Dict[str, Any]], Awaitable[Any]],
+        event: Message | CallbackQuery,
+        data: Dict[str, Any]
+    ) -> Any:
+        user_id = event.from_user.id
+        # Served from the profile cache; only a miss touches the database
+        profile = await get_user_profile(data["session"], user_id)
+        data["user_context"] = UserContext.from_profile(user_id, profile)
+
+        return await handler(event, data)
@@ -0,0 +1,201 @@
+import asyncio
+from typing import Dict, Optional, Set
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramAPIError, TelegramForbiddenError, TelegramRetryAfter
+
+from config import settings
+from database import db
+from database.crud.broadcast import claim_broadcast, claim_recipient, get_broadcasts_by_status, record_delivery, set_broadcast_status
+from database.crud.user import get_recipients_batch, get_user_profile, mark_student_blocked
+from database.models.broadcast import Broadcast, BroadcastStatus
+from logging_config import logger
+from utils.i18n import DEFAULT_LANGUAGE, get_text
+from utils.invalidation import on_invalidate, publish
+from utils.rate_limit import RateLimiter, TokenBucket
+
+
+def format_broadcast_progress(broadcast: Broadcast, language: str = DEFAULT_LANGUAGE) -> str:
+    """Progress report shown to admins"""
+    return get_text("admin.broadcast_progress", language).format(
+        id=broadcast.id,
+        status=get_text(f"admin.broadcast_status_{broadcast.status.value}", language),
+        sent=broadcast.sent_count,
+        blocked=broadcast.blocked_count,
+        failed=broadcast.failed_count,
+        done=broadcast.sent_count + broadcast.blocked_count + broadcast.failed_count,
+        total=broadcast.total_count
+    )
+
+
+class Broadcaster:
+    """Runs broadcasts in background tasks, sharing one rate limit between all of them.
+
+    The cursor is moved past each recipient before sending to them, so a
+    restarted bot continues where it stopped instead of sending the message
+    twice. Moving it is a conditional UPDATE that also checks the status and
+    the run_id claimed at start, so a broadcast paused or restarted from
+    another worker process stops here at the next recipient.
+
+    Only one process sends broadcasts, the one whose `bot` is set (worker 0
+    with WORKERS > 1), so the rate limit covers all of them. The other
+    workers hand start() and stop() over to it.
+    """
+
+    def __init__(self, rate: float, batch_size: int, chat_interval: float = 0):
+        # Global limit for all broadcasts together
+        self.bucket = TokenBucket(rate)
+        # Per-chat limit: broadcasts running at once (and the final report) reach the same chats
+        self.chats = RateLimiter(1 / chat_interval, 1) if chat_interval > 0 else None
+        self.batch_size = batch_size
+        self._tasks: Dict[int, asyncio.Task] = {}
+        # Set in the process that sends broadcasts
+        self.bot: Optional[Bot] = None
+        # Broadcasts asked to stop after the current recipient (paused or cancelled)
+        self._stopping: Set[int] = set()
+
+    def is_running(self, broadcast_id: int) -> bool:
+        return broadcast_id in self._tasks and broadcast_id not in self._stopping
+
+    def start(self, broadcast_id: int) -> None:
+        """Start (or resume) sending a broadcast whose status is RUNNING"""
+        if self.bot is None:
+            publish("broadcast", ("start", broadcast_id))
+            return
+
+        self._stopping.discard(broadcast_id)
+        if broadcast_id in self._tasks:
+            return
+
+        task = asyncio.create_task(self._run(self.bot, broadcast_id), name=f"broadcast-{broadcast_id}")
+        self._tasks[broadcast_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(broadcast_id, None))
+
+    def stop(self, broadcast_id: int) -> None:
+        """Stop sending after the current recipient; the status must already be changed in the database"""
+        if self.bot is None:
+            publish("broadcast", ("stop", broadcast_id))
+        elif broadcast_id in self._tasks:
+            self._stopping.add(broadcast_id)
+
+    async def resume_all(self) -> int:
+        """Restart broadcasts that were running when the bot stopped"""
+        async with db.async_session() as session:
+            broadcasts = await get_broadcasts_by_status(session, BroadcastStatus.RUNNING)
+        for broadcast in broadcasts:
+            self.start(broadcast.id)
+        return len(broadcasts)
+
+    async def shutdown(self) -> None:
+        """Let running broadcasts finish their current recipient, then stop them"""
+        tasks = list(self._tasks.values())
+        self._stopping.update(self._tasks)
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run(self, bot: Bot, broadcast_id: int) -> None:
+        run_id = None
+        try:
+            # Committing after each recipient hands the connection back to the pool between sends
+            async with db.async_session() as session:
+                broadcast = await claim_broadcast(session, broadcast_id)
+                if broadcast is None:
+                    return
+
+                run_id = broadcast.run_id
+                logger.info(f"Broadcast #{broadcast_id} sending to '{broadcast.segment}' after student {broadcast.last_student_id}")
+                last_student_id = broadcast.last_student_id
+                while True:
+                    recipients = await get_recipients_batch(session, broadcast.segment, last_student_id, self.batch_size)
+                    if not recipients:
+                        break
+
+                    for student_id, user_id in recipients:
+                        if broadcast_id in self._stopping or not await claim_recipient(session, broadcast_id, run_id, student_id):
+                            logger.info(f"Broadcast #{broadcast_id} stopped after student {last_student_id}")
+                            return
+
+                        outcome = await self._deliver(bot, broadcast, user_id)
+                        if outcome == "blocked":
+                            await mark_student_blocked(session, user_id)
+                        await record_delivery(session, broadcast_id, outcome)
+                        last_student_id = student_id
+
+                broadcast = await set_broadcast_status(session, broadcast_id, BroadcastStatus.COMPLETED, run_id=run_id)
+                if broadcast is not None:
+                    logger.info(f"Broadcast #{broadcast_id} completed")
+                    await self._report(bot, session, broadcast)
+        except Exception as e:
+            logger.exception(f"Broadcast #{broadcast_id} failed, pausing it: {e}")
+            await self._pause_failed(broadcast_id, run_id)
+        finally:
+            self._stopping.discard(broadcast_id)
+
+    async def _pause_failed(self, broadcast_id: int, run_id: Optional[int]) -> None:
+        """Pause a broadcast whose runner failed, so the admin can resume it from the broadcast menu"""
+        try:
+            async with db.async_session() as session:
+                await set_broadcast_status(session, broadcast_id, BroadcastStatus.PAUSED, run_id=run_id)
+        except Exception as e:
+            # Left RUNNING, resumed on the next start
+            logger.error(f"Could not pause broadcast #{broadcast_id}: {e}")
+
+    async def _deliver(self, bot: Bot, broadcast: Broadcast, user_id: int) -> str:
+        """Copy the broadcast message to one student; returns "sent", "blocked" or "failed" """
+        while True:
+            await self._wait_for_chat(user_id)
+            await self.bucket.acquire()
+            try:
+                await bot.copy_message(
+                    chat_id=user_id,
+                    from_chat_id=broadcast.from_chat_id,
+                    message_id=broadcast.message_id
+                )
+                return "sent"
+            except TelegramRetryAfter as e:
+                # Flood control applies to the whole bot, so every broadcast waits
+                logger.warning(f"Broadcast #{broadcast.id} hit flood control, waiting {e.retry_after}s")
+                self.bucket.pause(e.retry_after)
+            except TelegramForbiddenError:
+                return "blocked"
+            except TelegramAPIError as e:
+                logger.warning(f"Broadcast #{broadcast.id} could not send to {user_id}: {e}")
+                return "failed"
+
+    async def _wait_for_chat(self, chat_id: int) -> None:
+        """Wait until the chat may get another message"""
+        if self.chats is None:
+            return
+        while not self.chats.try_acquire(chat_id):
+            await asyncio.sleep(1 / self.chats.rate)
+
+    async def _report(self, bot: Bot, session, broadcast: Broadcast) -> None:
+        """Send the final report to the admin who started the broadcast"""
+        profile = await get_user_profile(session, broadcast.created_by)
+        language = profile.language if profile else DEFAULT_LANGUAGE
+        await self._wait_for_chat(broadcast.created_by)
+        try:
+            await bot.send_message(
+                broadcast.created_by,
+                f"{get_text('admin.broadcast_finished', language)}\n\n{format_broadcast_progress(broadcast, language)}"
+            )
+        except TelegramAPIError as e:
+            logger.warning(f"Could not report broadcast #{broadcast.id} to {broadcast.created_by}: {e}")
+
+
+broadcaster = Broadcaster(
+    rate=settings.BROADCAST_RATE,
+    batch_size=settings.BROADCAST_BATCH_SIZE,
+    chat_interval=settings.BROADCAST_CHAT_INTERVAL
+)
+
+
+@on_invalidate("broadcast")
+async def _broadcast_command(command) -> None:
+    """start() or stop() called in a worker that does not send broadcasts"""
+    if broadcaster.bot is None:
+        return
+    action, broadcast_id = command
+    if action == "start":
+        broadcaster.start(broadcast_id)
+    else:
+        broadcaster.stop(broadcast_id)
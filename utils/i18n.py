@@ -1,33 +1,167 @@
 from pathlib import Path
+import asyncio
 import json
-from typing import Literal, Dict, Set
+from string import Formatter
+from typing import Any, Callable, Literal, Dict, List, Optional, Set, Tuple
+from logging_config import logger
 
 LanguageCode = Literal["ru", "uz"]
 DEFAULT_LANGUAGE: LanguageCode = "ru"
+# Looked up in this order when a language has no text for a key
+LANGUAGES: Tuple[LanguageCode, ...] = ("ru", "uz")
 
-_translations: Dict[str, Dict[str, Dict[str, str]]] = {}
+# Translation keys of the reply keyboard buttons
+BUTTON_KEYS = (
+    "buttons.courses",
+    "buttons.about_us",
+    "buttons.settings",
+    "buttons.contact_teacher",
+    "settings.language",
+    "course.add",
+    "course_type.add",
+    "course_type.edit",
+    "admin.course_management",
+    "admin.admin_management",
+    "admin.broadcast",
+    "student.management"
+)
+
+# (language, dotted key) -> text, with fallbacks already applied
+_texts: Dict[Tuple[str, str], str] = {}
+# Button label in any language -> its key in BUTTON_KEYS
+_button_index: Dict[str, str] = {}
+# Keys already reported as missing
+_missing_keys: Set[str] = set()
+# Called after every (re)load, e.g. to drop caches built from translations
+_reload_listeners: List[Callable[[], None]] = []
+# Modification times of the locale files the current table was built from
+_mtimes: Dict[Path, Optional[int]] = {}
+
+def _flatten(tree: Dict[str, Any], prefix: str = "") -> Dict[str, str]:
+    """Turn nested sections into dotted keys"""
+    flat = {}
+    for name, value in tree.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{prefix}{name}."))
+        else:
+            flat[f"{prefix}{name}"] = value
+    return flat
+
+def _placeholders(text: str) -> Set[str]:
+    """Names of the {fields} in a format string"""
+    return {field for _, field, _, _ in Formatter().parse(text) if field is not None}
+
+def compile_translations(locales: Dict[str, Dict[str, Any]]) -> Dict[Tuple[str, str], str]:
+    """Build the flat (language, key) table, resolving fallbacks (uz -> ru -> key) up front"""
+    flat = {lang: _flatten(locales.get(lang, {})) for lang in LANGUAGES}
+    keys = set().union(*flat.values())
+    texts = {}
+    for key in keys:
+        for lang in LANGUAGES:
+            text = flat[lang].get(key)
+            if text is None:
+                text = flat[DEFAULT_LANGUAGE].get(key)
+                if text is None:
+                    text = next(t[key] for t in flat.values() if key in t)
+                logger.warning(f"Translation {key!r} is missing in {lang!r}, using {text!r}")
+            elif lang != DEFAULT_LANGUAGE and key in flat[DEFAULT_LANGUAGE]:
+                # Catch a .format() KeyError now instead of in a handler
+                if _placeholders(text) != _placeholders(flat[DEFAULT_LANGUAGE][key]):
+                    logger.warning(f"Translation {key!r} in {lang!r} has different placeholders than in {DEFAULT_LANGUAGE!r}")
+            texts[(lang, key)] = text
+    return texts
+
+def _locale_mtimes() -> Dict[Path, Optional[int]]:
+    mtimes = {}
+    for lang_code in LANGUAGES:
+        lang_file = Path("locales") / lang_code / "translations.json"
+        try:
+            mtimes[lang_file] = lang_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            mtimes[lang_file] = None
+    return mtimes
 
 def load_translations():
-    locales_dir = Path("locales")
-    for lang_code in ["ru", "uz"]:
-        lang_file = locales_dir / lang_code / "translations.json"
-        if lang_file.exists():
+    # Taken before reading, so a file written meanwhile is picked up by the next check
+    mtimes = _locale_mtimes()
+    locales = {}
+    for lang_file, mtime in mtimes.items():
+        if mtime is not None:
             with open(lang_file, "r", encoding="utf-8") as f:
-                _translations[lang_code] = json.load(f)
+                locales[lang_file.parent.name] = json.load(f)
+    
+    # Swap in one assignment so lookups never see a half-built table
+    global _texts
+    _texts = compile_translations(locales)
+    _mtimes.clear()
+    _mtimes.update(mtimes)
+    _missing_keys.clear()
+    build_button_index()
+    
+    for listener in _reload_listeners:
+        try:
+            listener()
+        except Exception as e:
+            logger.exception(f"Translations reload listener {listener!r} failed: {e}")
+
+def add_reload_listener(listener: Callable[[], None]):
+    """Call `listener` every time translations are (re)loaded"""
+    _reload_listeners.append(listener)
 
-def get_text(key: str, lang: LanguageCode = DEFAULT_LANGUAGE) -> str:
+async def watch_translations(interval: float):
+    """Reload translations whenever a locale file changes; a broken file keeps the previous texts"""
+    while True:
+        await asyncio.sleep(interval)
+        mtimes = _locale_mtimes()
+        if mtimes == _mtimes:
+            continue
+        try:
+            load_translations()
+            logger.info("Translations reloaded")
+        except (OSError, ValueError) as e:
+            # Wait for the next change instead of retrying the broken file
+            _mtimes.clear()
+            _mtimes.update(mtimes)
+            logger.error(f"Could not reload translations, keeping the previous ones: {e}")
+
+def build_button_index():
+    """Map every localized button label to its key, so one lookup resolves a pressed button"""
+    index = {}
+    for key in BUTTON_KEYS:
+        for label in get_all_translations_for_key(key):
+            if label == key:
+                continue  # Not translated
+            if index.get(label, key) != key:
+                logger.warning(f"Button label {label!r} is used by both {index[label]} and {key}")
+                continue
+            index[label] = key
+    # Swap in one assignment so lookups never see a half-built index
+    global _button_index
+    _button_index = index
+
+def get_button_key(text: Optional[str]) -> Optional[str]:
+    """Key of the reply button with this label, or None if the text is not a button"""
+    if not text:
+        return None
+    return _button_index.get(text)
+
+def get_text(key: str, lang: Optional[LanguageCode] = DEFAULT_LANGUAGE) -> str:
     """
     Get translated text for the given key in the specified language.
-    Falls back to the key itself if translation is not found.
+    Unknown languages (or None) use the default one. Falls back to the key
+    itself if translation is not found.
     """
-    try:
-        keys = key.split('.')
-        value = _translations[lang]
-        for k in keys:
-            value = value[k]
-        return value
-    except (KeyError, TypeError):
-        return key
+    text = _texts.get((lang, key))
+    if text is not None:
+        return text
+    if lang not in LANGUAGES:
+        text = _texts.get((DEFAULT_LANGUAGE, key))
+        if text is not None:
+            return text
+    if key not in _missing_keys:
+        _missing_keys.add(key)
+        logger.warning(f"Translation {key!r} not found")
+    return key
 
 def get_all_translations_for_key(key: str) -> Set[str]:
     """
@@ -35,11 +169,8 @@ def get_all_translations_for_key(key: str) -> Set[str]:
     Useful for button text matching.
     """
     translations = set()
-    for lang in ["ru", "uz"]:
-        try:
-            translations.add(get_text(key, lang))
-        except (KeyError, TypeError):
-            continue
+    for lang in LANGUAGES:
+        translations.add(get_text(key, lang))
     return translations
 
 # Initialize translations
@@ -0,0 +1,45 @@
+"""Cache invalidation between worker processes.
+
+With WORKERS > 1 (see cluster.py) every worker keeps its own catalog and
+user caches. Code that changes cached data calls publish(); the receiver
+forwards the message to the other workers, which run the handler registered
+for its kind with on_invalidate(). In a single process publish() does nothing.
+The same channel hands broadcast start/stop to worker 0, see utils/broadcast.py.
+"""
+from typing import Any, Awaitable, Callable, Dict, Optional
+from logging_config import logger
+
+# Sends (kind, key) to the other workers; set only in worker processes
+_publisher: Optional[Callable[[str, Any], None]] = None
+# Kind -> coroutine applying a change made by another worker
+_handlers: Dict[str, Callable[[Any], Awaitable[None]]] = {}
+
+
+def set_publisher(publisher: Optional[Callable[[str, Any], None]]) -> None:
+    global _publisher
+    _publisher = publisher
+
+
+def publish(kind: str, key: Any = None) -> None:
+    """Tell the other workers that the cached `kind` data (for `key`) changed"""
+    if _publisher is not None:
+        _publisher(kind, key)
+
+
+def on_invalidate(kind: str):
+    """Register the coroutine that applies a `kind` change made by another worker"""
+    def decorator(handler: Callable[[Any], Awaitable[None]]):
+        _handlers[kind] = handler
+        return handler
+    return decorator
+
+
+async def apply(kind: str, key: Any = None) -> None:
+    handler = _handlers.get(kind)
+    if handler is None:
+        logger.warning(f"No invalidation handler for {kind!r}")
+        return
+    try:
+        await handler(key)
+    except Exception as e:
+        logger.exception(f"Applying {kind!r} invalidation for {key!r} failed: {e}")
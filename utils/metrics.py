@@ -0,0 +1,218 @@
+"""In-process metrics served in the Prometheus text format.
+
+MetricsMiddleware times every handled update. SQL statements are counted
+through SQLAlchemy engine events into a per-update context variable, so
+concurrent updates do not mix their numbers.
+"""
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from aiohttp import web
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from database.cache import TTLCache
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50)
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Labels, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(value)
+
+
+class Counter:
+    metric_type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values: Dict[Labels, float] = defaultdict(float)
+
+    def inc(self, labels: Labels = (), amount: float = 1) -> None:
+        self.values[labels] += amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+        for labels, value in self.values.items():
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_number(value)}")
+        return lines
+
+
+class Gauge(Counter):
+    metric_type = "gauge"
+
+    def dec(self, labels: Labels = (), amount: float = 1) -> None:
+        self.values[labels] -= amount
+
+    def set(self, value: float, labels: Labels = ()) -> None:
+        self.values[labels] = value
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [count per bucket (last one is +Inf), sum]
+        self.values: Dict[Labels, list] = {}
+
+    def observe(self, labels: Labels, value: float) -> None:
+        entry = self.values.get(labels)
+        if entry is None:
+            entry = self.values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        entry[0][bisect_left(self.buckets, value)] += 1
+        entry[1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total) in self.values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="' + _format_number(bound) + '"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_number(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: List[Counter | Gauge | Histogram] = []
+        # Called on every scrape for values that live elsewhere, e.g. cache stats
+        self.collectors: List[Callable[[], List[str]]] = []
+
+    def counter(self, *args, **kwargs) -> Counter:
+        metric = Counter(*args, **kwargs)
+        self.metrics.append(metric)
+        return metric
+
+    def gauge(self, *args, **kwargs) -> Gauge:
+        metric = Gauge(*args, **kwargs)
+        self.metrics.append(metric)
+        return metric
+
+    def histogram(self, *args, **kwargs) -> Histogram:
+        metric = Histogram(*args, **kwargs)
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        for collector in self.collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+HANDLER_LABELS = ("event", "router", "handler")
+handler_duration = registry.histogram("bot_handler_duration_seconds", "Time spent handling an update", HANDLER_LABELS)
+handler_errors = registry.counter("bot_handler_errors_total", "Updates whose handler raised", HANDLER_LABELS)
+handler_statements = registry.histogram("bot_handler_db_statements", "SQL statements executed per update", HANDLER_LABELS, STATEMENT_BUCKETS)
+handler_db_duration = registry.histogram("bot_handler_db_duration_seconds", "Time spent in SQL statements per update", HANDLER_LABELS)
+db_statements = registry.counter("bot_db_statements_total", "SQL statements executed, including outside of handlers")
+db_duration = registry.counter("bot_db_duration_seconds_total", "Time spent in SQL statements, including outside of handlers")
+updates_waiting = registry.gauge("bot_updates_waiting", "Updates queued behind an earlier update of the same user or the concurrency limit")
+updates_running = registry.gauge("bot_updates_running", "Updates being processed")
+users_active = registry.gauge("bot_users_active", "Users with an update running or queued")
+update_wait = registry.histogram("bot_update_wait_seconds", "Time an update waited before being processed")
+updates_throttled = registry.counter("bot_updates_throttled_total", "Callback queries rejected by the per-user rate limits", ("action",))
+
+
+@dataclass(slots=True)
+class QueryStats:
+    statements: int = 0
+    seconds: float = 0.0
+
+
+# Stats of the update being handled in the current task
+query_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Count and time every SQL statement executed through `engine`"""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._metrics_started = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._metrics_started
+        db_statements.inc()
+        db_duration.inc(amount=elapsed)
+        stats = query_stats.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.seconds += elapsed
+
+
+# Name -> cache whose stats() are exposed
+_caches: Dict[str, TTLCache] = {}
+# stats() key -> (metric name, type, help)
+_CACHE_METRICS = {
+    "size": ("bot_cache_size", "gauge", "Entries in the cache"),
+    "maxsize": ("bot_cache_maxsize", "gauge", "Capacity of the cache"),
+    "hits": ("bot_cache_hits_total", "counter", "Cache lookups that found an entry"),
+    "misses": ("bot_cache_misses_total", "counter", "Cache lookups that found nothing"),
+    "evictions": ("bot_cache_evictions_total", "counter", "Entries dropped to stay within maxsize"),
+    "expirations": ("bot_cache_expirations_total", "counter", "Entries dropped because their TTL passed")
+}
+
+
+def _collect_caches() -> List[str]:
+    stats = {name: cache.stats() for name, cache in _caches.items()}
+    lines = []
+    for key, (metric, metric_type, documentation) in _CACHE_METRICS.items():
+        lines.append(f"# HELP {metric} {documentation}")
+        lines.append(f"# TYPE {metric} {metric_type}")
+        for name, values in stats.items():
+            lines.append(f'{metric}{{cache="{_escape(name)}"}} {values[key]}')
+    return lines
+
+
+registry.collectors.append(_collect_caches)
+
+
+def register_cache(name: str, cache: TTLCache) -> None:
+    """Expose the stats() of a cache on every scrape"""
+    _caches[name] = cache
+
+
+async def metrics_handler(request: web.Request) -> web.Response:
+    return web.Response(text=registry.render(), content_type="text/plain", charset="utf-8", headers={"X-Content-Type-Options": "nosniff"})
+
+
+async def start_metrics_server(host: str, port: int) -> web.AppRunner:
+    """Serve GET /metrics; keep it on a local address, it is not authenticated"""
+    app = web.Application()
+    app.router.add_get("/metrics", metrics_handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host=host, port=port).start()
+    return runner
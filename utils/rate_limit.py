@@ -0,0 +1,103 @@
+import asyncio
+import time
+from typing import Dict, Hashable, Tuple
+
+
+class TokenBucket:
+    """Async token bucket: allows `rate` acquisitions per second with bursts up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        # Set by pause(); nobody acquires before this moment
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self, tokens: float = 1) -> None:
+        """Wait until `tokens` are available and take them"""
+        # The lock keeps waiters in FIFO order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+    def try_acquire(self, tokens: float = 1) -> bool:
+        """Take `tokens` if they are available right now, without waiting"""
+        now = time.monotonic()
+        if now < self._paused_until:
+            return False
+        self._refill(now)
+        if self._tokens >= tokens:
+            self._tokens -= tokens
+            return True
+        return False
+
+    def pause(self, seconds: float) -> None:
+        """Stop handing out tokens for `seconds`, e.g. after Telegram answers with RetryAfter"""
+        now = time.monotonic()
+        self._paused_until = max(self._paused_until, now + seconds)
+        # Start from an empty bucket so the pause is not followed by a burst
+        self._tokens = 0
+        self._updated_at = self._paused_until
+
+
+class RateLimiter:
+    """
+    Non-blocking token buckets for many keys (e.g. user ids) in one dict.
+    A key costs one (tokens, updated_at) tuple; buckets that have refilled
+    completely are dropped every `sweep_interval` seconds.
+    """
+
+    __slots__ = ("rate", "capacity", "sweep_interval", "_buckets", "_next_sweep")
+
+    def __init__(self, rate: float, capacity: float | None = None, sweep_interval: float = 60):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self.sweep_interval = sweep_interval
+        # Key -> (tokens left, time they were counted); a missing key has a full bucket
+        self._buckets: Dict[Hashable, Tuple[float, float]] = {}
+        self._next_sweep = time.monotonic() + sweep_interval
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def try_acquire(self, key: Hashable, tokens: float = 1) -> bool:
+        """Take `tokens` from the bucket of `key` if they are available right now"""
+        now = time.monotonic()
+        if now >= self._next_sweep:
+            self.sweep(now)
+
+        state = self._buckets.get(key)
+        if state is None:
+            available = self.capacity
+        else:
+            available = min(self.capacity, state[0] + (now - state[1]) * self.rate)
+        if available < tokens:
+            return False
+        self._buckets[key] = (available - tokens, now)
+        return True
+
+    def sweep(self, now: float | None = None) -> None:
+        """Forget keys whose bucket is full again; they behave the same as unknown keys"""
+        if now is None:
+            now = time.monotonic()
+        capacity, rate = self.capacity, self.rate
+        self._buckets = {
+            key: state for key, state in self._buckets.items()
+            if state[0] + (now - state[1]) * rate < capacity
+        }
+        self._next_sweep = now + self.sweep_interval